@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Mesafe Hesaplama Benchmark Takımı
+Skaler çekirdekleri, vektörel toplu hesaplamayı, MCP tool işleyicisini,
+MCP sunucusunun soğuk başlangıcını ve FastAPI uç noktalarını ölçer; sonuçları
+JSON'a yazar ve kayıtlı bir temel ölçümle (baseline) karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench.py                      # ölç ve yazdır
+    python benchmarks/bench.py --output out.json    # sonuçları kaydet
+    python benchmarks/bench.py --save-baseline      # benchmarks/baseline.json'u güncelle
+    python benchmarks/bench.py --compare            # baseline ile karşılaştır (gerileme varsa çıkış kodu 1)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+# Sunucu modülleri bir üst dizinde
+MCP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_DIR))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+SEED = 20250101
+
+# İstanbul ve yakın çevresi
+REFERENCE = (41.0082, 28.9784)
+
+# Vincenty'nin yakınsamayıp iteration_limit'e ulaştığı neredeyse karşıt noktalar
+ANTIPODAL_PAIRS = [
+    (0.0, 0.0, 0.5, 179.5),
+    (0.0, 0.0, 0.2, 179.9),
+    (10.0, 0.0, -10.0, 179.8),
+    (41.0, 29.0, -41.0, -150.7),
+]
+
+
+def random_points(n: int, seed: int = SEED) -> tuple[np.ndarray, np.ndarray]:
+    """Küre üzerinde düzgün dağılımlı, tekrarlanabilir rastgele noktalar"""
+    rng = np.random.default_rng(seed)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lons = rng.uniform(-180, 180, n)
+    return lats, lons
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> float:
+    """
+    Fonksiyonun tek çağrı süresinin medyanını saniye cinsinden döndürür.
+    Kısa süren fonksiyonlar her ölçümde min_time dolana kadar tekrarlanır.
+    """
+    func()  # ısınma
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples)
+
+
+def throughput(value: float) -> dict:
+    return {"value": value, "unit": "ops/s", "better": "higher"}
+
+
+def latency(value: float) -> dict:
+    return {"value": value, "unit": "s", "better": "lower"}
+
+
+def bench_scalar(results: dict, quick: bool) -> None:
+    """Skaler haversine_distance / vincenty_distance çağrı hızı"""
+    from dist import haversine_distance, vincenty_distance
+
+    n = 2_000 if quick else 20_000
+    lats, lons = random_points(n)
+    pairs = list(zip(lats.tolist(), lons.tolist()))
+    ref_lat, ref_lon = REFERENCE
+
+    for name, func in (("haversine", haversine_distance), ("vincenty", vincenty_distance)):
+        elapsed = measure(lambda: [func(ref_lat, ref_lon, lat, lon) for lat, lon in pairs], repeat=3)
+        results[f"scalar.{name}"] = throughput(n / elapsed)
+
+    # En kötü durum: iterasyon sınırına ulaşıp Haversine'e düşen çiftler
+    elapsed = measure(lambda: [vincenty_distance(*pair) for pair in ANTIPODAL_PAIRS])
+    results["scalar.vincenty.antipodal"] = throughput(len(ANTIPODAL_PAIRS) / elapsed)
+
+
+def bench_kernels(results: dict, sizes: list[int]) -> None:
+    """Vektörel çekirdeklerle referans noktadan n hedefe toplu hesaplama"""
+    from distvec import distance_array
+
+    ref_lat, ref_lon = REFERENCE
+    for n in sizes:
+        lats, lons = random_points(n)
+        for method in ("haversine", "vincenty"):
+            elapsed = measure(lambda: distance_array(ref_lat, ref_lon, lats, lons, method),
+                              repeat=3 if n >= 1_000_000 else 5)
+            results[f"batch.kernel.{method}.{n}"] = throughput(n / elapsed)
+
+
+def bench_auto(results: dict, sizes: list[int]) -> None:
+    """
+    Karışık iş yükünde "auto" yöntemi: hedeflerin çoğu referansa yakın (şehir içi),
+    bir kısmı uzak. Vincenty ile aynı hata sınırında (1 m) ne kadar hızlı olduğunu ölçer.
+    """
+    from distvec import auto_distance_array
+
+    ref_lat, ref_lon = REFERENCE
+    rng = np.random.default_rng(SEED)
+    for n in sizes:
+        far_lats, far_lons = random_points(n // 10)
+        lats = np.concatenate([ref_lat + rng.uniform(-0.3, 0.3, n - far_lats.size), far_lats])
+        lons = np.concatenate([ref_lon + rng.uniform(-0.3, 0.3, n - far_lons.size), far_lons])
+        elapsed = measure(lambda: auto_distance_array(ref_lat, ref_lon, lats, lons, 1.0),
+                          repeat=3 if n >= 1_000_000 else 5)
+        results[f"batch.kernel.auto.mixed.{n}"] = throughput(n / elapsed)
+
+
+# Derlenmiş çekirdeklerin NumPy/saf Python sürümlerinden en fazla sapması (km)
+JIT_TOLERANCE_KM = 1e-9
+
+
+def bench_jit(results: dict, sizes: list[int]) -> None:
+    """
+    numba arka ucu (distjit): önce NumPy çekirdekleri ve saf Python skaler
+    fonksiyonlarla sayısal eşdeğerliği doğrular (aynı/karşıt noktalar, kutuplar
+    dahil), sonra hızı ölçer. numba yüklü değilse atlanır.
+    """
+    import distvec
+    from dist import haversine_distance, vincenty_distance
+
+    previous = distvec.kernel_backend()
+    if distvec.use_kernel_backend("numba") != "numba":
+        print("numba yüklü değil; derlenmiş çekirdek ölçümleri atlandı")
+        return
+
+    try:
+        lats1, lons1 = random_points(20_000, SEED + 1)
+        lats2, lons2 = random_points(20_000, SEED + 2)
+        special = [(0.0, 0.0, 0.0, 0.0), (90.0, 0.0, -90.0, 0.0), (0.0, -179.9, 0.0, 179.9)] + ANTIPODAL_PAIRS
+        lats1[:len(special)], lons1[:len(special)], lats2[:len(special)], lons2[:len(special)] = zip(*special)
+        pairs = list(zip(lats1.tolist(), lons1.tolist(), lats2.tolist(), lons2.tolist()))
+
+        for method, python_func in (("haversine", haversine_distance), ("vincenty", vincenty_distance)):
+            jit_values = distvec.distance_array(lats1, lons1, lats2, lons2, method)
+            jit_scalar = distvec.scalar_kernel(method)
+            scalar_diff = max(abs(jit_scalar(*pair) - python_func(*pair)) for pair in pairs)
+            distvec.use_kernel_backend("numpy")
+            array_diff = float(np.abs(jit_values - distvec.distance_array(lats1, lons1, lats2, lons2, method)).max())
+            distvec.use_kernel_backend("numba")
+            if max(array_diff, scalar_diff) > JIT_TOLERANCE_KM:
+                raise AssertionError(f"numba {method} sapması {max(array_diff, scalar_diff):.3g} km")
+
+            elapsed = measure(lambda: [jit_scalar(*pair) for pair in pairs], repeat=3)
+            results[f"scalar.numba.{method}"] = throughput(len(pairs) / elapsed)
+
+        ref_lat, ref_lon = REFERENCE
+        for n in sizes:
+            lats, lons = random_points(n)
+            for method in ("haversine", "vincenty"):
+                elapsed = measure(lambda: distvec.distance_array(ref_lat, ref_lon, lats, lons, method),
+                                  repeat=3 if n >= 1_000_000 else 5)
+                results[f"batch.kernel.numba.{method}.{n}"] = throughput(n / elapsed)
+    finally:
+        distvec.use_kernel_backend(previous)
+
+
+def bench_mcp(results: dict, sizes: list[int]) -> None:
+    """dist.py batch_distance_calculation tool işleyicisi (JSON çıktısı dahil)"""
+    import dist
+
+    ref_lat, ref_lon = REFERENCE
+    for n in sizes:
+        lats, lons = random_points(n)
+        arguments = {
+            "reference_point": {"lat": ref_lat, "lon": ref_lon},
+            "target_points": [{"lat": lat, "lon": lon} for lat, lon in zip(lats.tolist(), lons.tolist())],
+            "method": "haversine"
+        }
+        elapsed = measure(
+            lambda: asyncio.run(dist.handle_call_tool("batch_distance_calculation", arguments)),
+            repeat=3, min_time=0
+        )
+        results[f"batch.mcp.haversine.{n}"] = latency(elapsed)
+
+
+def bench_http(results: dict, sizes: list[int], quick: bool) -> None:
+    """FastAPI uygulaması için süreç içi test istemcisiyle uçtan uca gecikme"""
+    from fastapi.testclient import TestClient
+    import distser
+
+    ref_lat, ref_lon = REFERENCE
+    with TestClient(distser.app) as client:
+        # Tekil istek gecikmesi (önbellek devre dışı bırakılarak)
+        distser.distance_cache.maxsize = 0
+        lats, lons = random_points(200 if quick else 2_000)
+        samples = []
+        for lat, lon in zip(lats.tolist(), lons.tolist()):
+            start = time.perf_counter()
+            client.get("/distance", params={"lat1": ref_lat, "lon1": ref_lon, "lat2": lat, "lon2": lon})
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        results["http.distance.p50"] = latency(samples[len(samples) // 2])
+        results["http.distance.p95"] = latency(samples[int(len(samples) * 0.95)])
+
+        for n in sizes:
+            lats, lons = random_points(n)
+            body = {
+                "reference_point": {"lat": ref_lat, "lon": ref_lon},
+                "target_points": [{"lat": lat, "lon": lon} for lat, lon in zip(lats.tolist(), lons.tolist())],
+                "method": "haversine"
+            }
+            elapsed = measure(lambda: client.post("/batch-distance", json=body), repeat=3, min_time=0)
+            results[f"http.batch_distance.{n}"] = latency(elapsed)
+            # Yalnızca indeks/mesafe dizileri, gzip ile
+            compact = {**body, "format": "compact"}
+            elapsed = measure(lambda: client.post("/batch-distance", json=compact, headers={"Accept-Encoding": "gzip"}),
+                              repeat=3, min_time=0)
+            results[f"http.batch_distance.compact.{n}"] = latency(elapsed)
+
+
+def bench_startup(results: dict, quick: bool) -> None:
+    """dist.py stdio sürecinin başlatılmasından ilk tools/list yanıtına kadar geçen süre"""
+    import startup
+
+    measured = startup.run(runs=3 if quick else 10)
+    results["startup.list_tools"] = latency(measured["list_tools"])
+    results["startup.overhead"] = latency(measured["overhead"])
+
+
+def run_suite(quick: bool = False) -> dict:
+    """Tüm benchmarkları çalıştırır ve sonuç belgesini döndürür"""
+    results: dict = {}
+    kernel_sizes = [1_000, 100_000] if quick else [1_000, 100_000, 1_000_000]
+    server_sizes = [1_000] if quick else [1_000, 100_000]
+
+    bench_scalar(results, quick)
+    bench_kernels(results, kernel_sizes)
+    bench_auto(results, kernel_sizes)
+    bench_jit(results, kernel_sizes)
+    bench_mcp(results, server_sizes)
+    bench_http(results, server_sizes, quick)
+    bench_startup(results, quick)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick
+        },
+        "results": results
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Mevcut sonuçları baseline ile karşılaştırır.
+
+    Returns:
+        Eşikten fazla gerileyen ölçümlerin açıklamaları
+    """
+    regressions = []
+    for name, entry in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["value"]:
+            continue
+        ratio = entry["value"] / base["value"]
+        # ratio > 1: daha yüksek değer; 'lower' ölçümlerde bu bir gerilemedir
+        change = ratio - 1 if entry["better"] == "higher" else 1 - ratio
+        marker = ""
+        if change < -threshold:
+            regressions.append(f"{name}: {base['value']:.6g} -> {entry['value']:.6g} {entry['unit']}")
+            marker = "  <-- GERİLEME"
+        print(f"  {name:40s} {change:+7.1%}{marker}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mesafe hesaplama benchmark takımı")
+    parser.add_argument("--quick", action="store_true", help="Küçük boyutlarla hızlı çalıştır")
+    parser.add_argument("--output", type=Path, help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON dosyası")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları baseline olarak kaydet")
+    parser.add_argument("--compare", action="store_true", help="Baseline ile karşılaştır")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="İzin verilen en fazla göreli gerileme (varsayılan 0.25)")
+    args = parser.parse_args()
+
+    report = run_suite(quick=args.quick)
+
+    for name, entry in report["results"].items():
+        print(f"{name:40s} {entry['value']:>14.6g} {entry['unit']}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline kaydedildi: {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"Baseline bulunamadı: {args.baseline}")
+            return 2
+        print(f"\nBaseline karşılaştırması (eşik {args.threshold:.0%}):")
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print("\nGerileyen ölçümler:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
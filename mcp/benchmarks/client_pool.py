@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Kalıcı İstemci Benchmarkı
+Aynı tool çağrılarını üç şekilde yapar ve çağrı/saniye ile gecikmeyi karşılaştırır:
+
+- per-call: her çağrıda yeni bağlantı + initialize (eski main.call_tool davranışı)
+- pooled: tek PooledMCPClient oturumu üzerinden ardışık çağrılar
+- pooled-concurrent: aynı oturum üzerinden --concurrency kadar paralel çağrı
+
+Varsayılan olarak dist.py streamable-http sunucusu başlatılır; --transport stdio
+ile her per-call bağlantısı yeni bir süreç başlatır.
+
+Kullanım:
+    python benchmarks/client_pool.py
+    python benchmarks/client_pool.py --calls 500 --concurrency 32
+    python benchmarks/client_pool.py --transport stdio --per-call-calls 10
+    python benchmarks/client_pool.py --url http://host:8001/mcp
+"""
+
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_DIR))
+
+from distclient import PooledMCPClient, SessionClient  # noqa: E402
+from mcp_load import SERVER, free_port, wait_for_port  # noqa: E402
+
+
+DEFAULT_CALLS = 200
+DEFAULT_PER_CALL_CALLS = 50
+DEFAULT_CONCURRENCY = 16
+
+
+def make_calls(n: int, seed: int = 0) -> list[dict]:
+    """İstanbul çevresinde rastgele calculate_distance argümanları"""
+    rng = random.Random(seed)
+    return [{
+        "lat1": 41.0 + rng.uniform(-1, 1), "lon1": 29.0 + rng.uniform(-1, 1),
+        "lat2": 41.0 + rng.uniform(-1, 1), "lon2": 29.0 + rng.uniform(-1, 1),
+        "method": "vincenty"
+    } for _ in range(n)]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)]
+    }
+
+
+async def per_call(factory, calls: list[dict]) -> dict:
+    """Her çağrı için yeni oturum açar"""
+    latencies = []
+    start = time.perf_counter()
+    for arguments in calls:
+        call_start = time.perf_counter()
+        async with factory() as client:
+            await client.call_tool("calculate_distance", arguments)
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def pooled(factory, calls: list[dict], concurrency: int) -> dict:
+    """Tek kalıcı oturum; concurrency > 1 ise çağrılar aynı oturumda paralel gider"""
+    async with PooledMCPClient(factory, max_concurrency=concurrency) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client.call_tool("calculate_distance", arguments) for arguments in calls))
+        elapsed = time.perf_counter() - start
+        stats = client.stats()
+    return {
+        "calls": stats["calls"],
+        "throughput": stats["calls"] / elapsed,
+        "p50": stats["latency_ms"]["p50"] / 1000,
+        "p95": stats["latency_ms"]["p95"] / 1000
+    }
+
+
+async def run(factory, calls: int, per_call_calls: int, concurrency: int) -> dict:
+    return {
+        "per-call": await per_call(factory, make_calls(per_call_calls)),
+        "pooled": await pooled(factory, make_calls(calls), 1),
+        "pooled-concurrent": await pooled(factory, make_calls(calls), concurrency)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Kalıcı MCP istemcisi benchmarkı")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS,
+                        help="Kalıcı oturum ölçümlerinde çağrı sayısı")
+    parser.add_argument("--per-call-calls", type=int, default=DEFAULT_PER_CALL_CALLS,
+                        help="Çağrı başına bağlanma ölçümünde çağrı sayısı")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Paralel ölçümde aynı oturumdaki eşzamanlı çağrı sayısı")
+    parser.add_argument("--transport", choices=("streamable-http", "stdio"), default="streamable-http")
+    parser.add_argument("--url", help="Çalışan bir streamable-http sunucusunun adresi")
+    args = parser.parse_args()
+
+    server = None
+    if args.transport == "stdio":
+        factory = SessionClient.stdio
+    else:
+        url = args.url
+        if url is None:
+            port = free_port()
+            server = subprocess.Popen([sys.executable, str(SERVER), "--transport", "streamable-http",
+                                       "--port", str(port)], cwd=str(MCP_DIR))
+            wait_for_port("127.0.0.1", port)
+            url = f"http://127.0.0.1:{port}/mcp"
+        factory = lambda: SessionClient.http(url)  # noqa: E731
+
+    try:
+        results = asyncio.run(run(factory, args.calls, args.per_call_calls, args.concurrency))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print(f"\n{'mod':>18} {'çağrı':>6} {'çağrı/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'hız':>7}")
+    base = results["per-call"]["throughput"]
+    for name, result in results.items():
+        print(f"{name:>18} {result['calls']:>6} {result['throughput']:>9.1f} {result['p50'] * 1000:>8.2f} "
+              f"{result['p95'] * 1000:>8.2f} {result['throughput'] / base:>6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
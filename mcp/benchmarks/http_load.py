@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+REST Sunucusu Yük Testi
+distser.py'yi geliştirme modunda (tek süreç, reload, asyncio + h11) ve
+production modunda (çok worker, uvloop + httptools) ayrı süreçler olarak
+başlatır; her biri için aynı süre boyunca keep-alive bağlantılarla yük
+üretip istek/saniye ve p50/p99 gecikmeyi karşılaştırır.
+
+İş yükü: rastgele koordinatlarla GET /distance (önbelleğe takılmaz) ve
+--batch-ratio oranında 100 hedefli POST /batch-distance.
+
+Kullanım:
+    python benchmarks/http_load.py
+    python benchmarks/http_load.py --duration 10 --concurrency 64
+    python benchmarks/http_load.py --modes production --workers 4
+    python benchmarks/http_load.py --client-processes 4   # yük üreticisini çekirdeklere dağıt
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from mcp_load import free_port, wait_for_port
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+SERVER = MCP_DIR / "distser.py"
+
+DEFAULT_DURATION = 5.0
+DEFAULT_CONCURRENCY = 32
+DEFAULT_BATCH_RATIO = 0.1
+BATCH_TARGETS = 100
+WARMUP = 0.5
+
+
+def random_request(rng: random.Random, batch_ratio: float) -> tuple[str, str, dict]:
+    """İstanbul çevresinde rastgele bir istek: (yöntem, yol, parametreler veya gövde)"""
+    def point() -> dict:
+        return {"lat": 41.0 + rng.uniform(-1, 1), "lon": 29.0 + rng.uniform(-1, 1)}
+
+    if rng.random() < batch_ratio:
+        return "POST", "/batch-distance", {
+            "reference_point": point(),
+            "target_points": [point() for _ in range(BATCH_TARGETS)],
+            "format": "compact"
+        }
+    p1, p2 = point(), point()
+    return "GET", "/distance", {"lat1": p1["lat"], "lon1": p1["lon"], "lat2": p2["lat"], "lon2": p2["lon"]}
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                   host: str, method: str, path: str, payload: dict) -> int:
+    """
+    Keep-alive bağlantı üzerinden tek bir HTTP/1.1 isteği; durum kodunu döndürür.
+    Tek çekirdekte yük üreticisinin maliyeti sunucuyu gölgelemesin diye httpx
+    yerine doğrudan akış üzerinde yazılmıştır.
+    """
+    if method == "GET":
+        target = f"{path}?{urlencode(payload)}"
+        body = b""
+    else:
+        target = path
+        body = json.dumps(payload).encode()
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: {host}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _drive(host: str, port: int, concurrency: int, duration: float, batch_ratio: float, seed: int) -> dict:
+    latencies = []
+    errors = 0
+    warmup_end = time.monotonic() + WARMUP
+    end = warmup_end + duration
+
+    async def worker(index: int):
+        nonlocal errors
+        rng = random.Random(seed * 1000 + index)
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while True:
+                method, path, payload = random_request(rng, batch_ratio)
+                start = time.monotonic()
+                if start >= end:
+                    return
+                try:
+                    ok = await _request(reader, writer, host, method, path, payload) == 200
+                except (OSError, asyncio.IncompleteReadError):
+                    ok = False
+                    writer.close()
+                    reader, writer = await asyncio.open_connection(host, port)
+                if start >= warmup_end:
+                    if ok:
+                        latencies.append(time.monotonic() - start)
+                    else:
+                        errors += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return {"latencies": latencies, "errors": errors}
+
+
+def _drive_process(args) -> dict:
+    return asyncio.run(_drive(*args))
+
+
+def run_load(host: str, port: int, concurrency: int, duration: float, batch_ratio: float, client_processes: int) -> dict:
+    """Yükü bir veya daha fazla istemci sürecinden üretir ve sonuçları birleştirir"""
+    if client_processes <= 1:
+        parts = [asyncio.run(_drive(host, port, concurrency, duration, batch_ratio, 0))]
+    else:
+        per_process = max(1, concurrency // client_processes)
+        jobs = [(host, port, per_process, duration, batch_ratio, seed) for seed in range(client_processes)]
+        with multiprocessing.Pool(client_processes) as pool:
+            parts = pool.map(_drive_process, jobs)
+
+    latencies = sorted(latency for part in parts for latency in part["latencies"])
+    if not latencies:
+        raise RuntimeError("Hiç başarılı istek yok")
+    return {
+        "requests": len(latencies),
+        "errors": sum(part["errors"] for part in parts),
+        "throughput": len(latencies) / duration,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    }
+
+
+def start_server(mode: str, port: int, workers: int | None) -> subprocess.Popen:
+    command = [sys.executable, str(SERVER), "--mode", mode, "--host", "127.0.0.1", "--port", str(port)]
+    if mode == "production" and workers:
+        command += ["--workers", str(workers)]
+    server = subprocess.Popen(command, cwd=str(MCP_DIR), stdout=subprocess.DEVNULL)
+    wait_for_port("127.0.0.1", port)
+    # Tüm worker'lar hazır olana kadar bekle
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                if response.status == 200:
+                    break
+        except (OSError, URLError):
+            pass
+        time.sleep(0.1)
+    time.sleep(1.0)
+    return server
+
+
+def stop_server(server: subprocess.Popen) -> float:
+    """SIGTERM gönderir ve kapanış süresini döndürür"""
+    start = time.monotonic()
+    server.terminate()
+    try:
+        server.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+    return time.monotonic() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="distser.py geliştirme ve production modu yük testi")
+    parser.add_argument("--modes", default="dev,production", help="Virgülle ayrılmış modlar")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Mod başına ölçüm süresi (s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Eşzamanlı keep-alive bağlantı sayısı")
+    parser.add_argument("--batch-ratio", type=float, default=DEFAULT_BATCH_RATIO,
+                        help="POST /batch-distance isteklerinin oranı")
+    parser.add_argument("--workers", type=int, help="production modunda worker sayısı (varsayılan çekirdek sayısı)")
+    parser.add_argument("--client-processes", type=int, default=1, help="Yük üreten süreç sayısı")
+    args = parser.parse_args()
+
+    print(f"çekirdek: {os.cpu_count()}, eşzamanlılık: {args.concurrency}, süre: {args.duration:.0f} s")
+    results = {}
+    for mode in args.modes.split(","):
+        port = free_port()
+        server = start_server(mode, port, args.workers)
+        try:
+            results[mode] = run_load("127.0.0.1", port, args.concurrency, args.duration,
+                                     args.batch_ratio, args.client_processes)
+        finally:
+            results.setdefault(mode, {})["shutdown"] = stop_server(server)
+
+    print(f"\n{'mod':>12} {'istek':>7} {'hata':>5} {'istek/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'kapanış s':>10} {'hız':>6}")
+    base = next(iter(results.values())).get("throughput")
+    for mode, result in results.items():
+        if "throughput" not in result:
+            continue
+        print(f"{mode:>12} {result['requests']:>7} {result['errors']:>5} {result['throughput']:>9.1f} "
+              f"{result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f} {result['shutdown']:>10.2f} "
+              f"{result['throughput'] / base:>5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
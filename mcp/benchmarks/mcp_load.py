@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+MCP Ağ Taşıması Yük Testi
+dist.py'yi tek bir streamable-http (veya sse) süreci olarak başlatır ve artan
+sayıda eşzamanlı MCP oturumuyla tool çağrısı yapar. Her eşzamanlılık seviyesi
+için toplam çağrı/saniye, gecikme yüzdelikleri ve oturum kurulum süresini
+raporlar; böylece tek sürecin oturum sayısıyla nasıl ölçeklendiği görülür.
+
+Kullanım:
+    python benchmarks/mcp_load.py                           # 1, 4, 16, 64 oturum
+    python benchmarks/mcp_load.py --sessions 1,8,32 --duration 10
+    python benchmarks/mcp_load.py --transport sse
+    python benchmarks/mcp_load.py --url http://host:8001/mcp   # çalışan sunucuya bağlan
+    python benchmarks/mcp_load.py --client-processes 4      # yük üreticisini çekirdeklere dağıt
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+SERVER = MCP_DIR / "dist.py"
+
+DEFAULT_SESSIONS = "1,4,16,64"
+DEFAULT_DURATION = 5.0
+# Çağrıların bu oranı 100 hedefli batch_distance_calculation, kalanı calculate_distance
+DEFAULT_BATCH_RATIO = 0.2
+BATCH_TARGETS = 100
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Sunucu {timeout:.0f} s içinde {host}:{port} adresinde dinlemeye başlamadı")
+
+
+def random_call(rng: random.Random, batch_ratio: float) -> tuple[str, dict]:
+    """İstanbul çevresinde rastgele koordinatlarla bir tool çağrısı üretir"""
+    def point() -> dict:
+        return {"lat": 41.0 + rng.uniform(-1, 1), "lon": 29.0 + rng.uniform(-1, 1)}
+
+    if rng.random() < batch_ratio:
+        return "batch_distance_calculation", {
+            "reference_point": point(),
+            "target_points": [point() for _ in range(BATCH_TARGETS)]
+        }
+    p1, p2 = point(), point()
+    return "calculate_distance", {
+        "lat1": p1["lat"], "lon1": p1["lon"], "lat2": p2["lat"], "lon2": p2["lon"],
+        "method": "vincenty"
+    }
+
+
+def _client_transport(url: str, transport: str):
+    if transport == "sse":
+        from mcp.client.sse import sse_client
+        return sse_client(url)
+    try:
+        from mcp.client.streamable_http import streamable_http_client
+    except ImportError:  # eski mcp sürümleri
+        from mcp.client.streamable_http import streamablehttp_client as streamable_http_client
+    return streamable_http_client(url)
+
+
+async def run_session(url: str, transport: str, ready: asyncio.Barrier, go: asyncio.Event,
+                      window: list, seed: int, batch_ratio: float) -> dict:
+    """
+    Bir MCP oturumu açar, tüm oturumlar hazır olunca ölçüm penceresi boyunca
+    ardışık tool çağrıları yapar
+    """
+    from mcp import ClientSession
+
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    errors = 0
+    start = time.perf_counter()
+    async with _client_transport(url, transport) as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            setup = time.perf_counter() - start
+            await ready.wait()
+            await go.wait()
+            while time.perf_counter() < window[1]:
+                name, arguments = random_call(rng, batch_ratio)
+                call_start = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                latencies.append(time.perf_counter() - call_start)
+                errors += bool(result.isError)
+    return {"setup": setup, "latencies": latencies, "errors": errors}
+
+
+async def run_sessions(url: str, transport: str, sessions: int, duration: float,
+                       batch_ratio: float, seed: int) -> tuple[list[dict], float]:
+    """
+    Oturumları açar; ölçüm penceresi son oturum da hazır olduğunda başlar, böylece
+    oturum kurulum süresi çağrı/saniye hesabına karışmaz.
+
+    Returns:
+        (oturum sonuçları, ölçüm penceresi (saniye))
+    """
+    window = [0.0, 0.0]
+
+    def start_window():
+        window[0] = time.perf_counter()
+        window[1] = window[0] + duration
+
+    ready = asyncio.Barrier(sessions + 1)
+    go = asyncio.Event()
+    tasks = [asyncio.ensure_future(run_session(url, transport, ready, go, window, seed + i, batch_ratio))
+             for i in range(sessions)]
+    await ready.wait()
+    start_window()
+    go.set()
+    results = await asyncio.gather(*tasks)
+    return results, time.perf_counter() - window[0]
+
+
+def _worker(args: tuple) -> tuple[list[dict], float]:
+    return asyncio.run(run_sessions(*args))
+
+
+def run_level(url: str, transport: str, sessions: int, duration: float,
+              batch_ratio: float, client_processes: int) -> dict:
+    """Bir eşzamanlılık seviyesini çalıştırır ve özet istatistikleri döndürür"""
+    processes = max(1, min(client_processes, sessions))
+    shares = [sessions // processes + (i < sessions % processes) for i in range(processes)]
+    jobs = [(url, transport, share, duration, batch_ratio, 1000 * i) for i, share in enumerate(shares)]
+
+    if processes == 1:
+        parts = [_worker(jobs[0])]
+    else:
+        with multiprocessing.get_context("spawn").Pool(processes) as pool:
+            parts = pool.map(_worker, jobs)
+    results = [r for part, _ in parts for r in part]
+    elapsed = max(window for _, window in parts)
+
+    latencies = sorted(l for r in results for l in r["latencies"])
+    setups = [r["setup"] for r in results]
+    return {
+        "sessions": sessions,
+        "calls": len(latencies),
+        "errors": sum(r["errors"] for r in results),
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] if latencies else float("nan"),
+        "p95": latencies[int(len(latencies) * 0.95)] if latencies else float("nan"),
+        "setup_p50": statistics.median(setups)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="dist.py ağ taşıması yük testi")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS,
+                        help="Virgülle ayrılmış eşzamanlı oturum sayıları")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="Her seviyenin süresi (saniye)")
+    parser.add_argument("--transport", choices=("streamable-http", "sse"), default="streamable-http")
+    parser.add_argument("--url", help="Çalışan bir sunucunun adresi (verilmezse dist.py başlatılır)")
+    parser.add_argument("--batch-ratio", type=float, default=DEFAULT_BATCH_RATIO,
+                        help="Toplu hesaplama çağrılarının oranı")
+    parser.add_argument("--client-processes", type=int, default=1,
+                        help="Yük üreten istemci süreç sayısı")
+    parser.add_argument("--json-response", action="store_true",
+                        help="Başlatılan sunucuda Streamable HTTP yanıtlarını düz JSON yap")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, str(SERVER), "--transport", args.transport, "--port", str(port)]
+            + (["--json-response"] if args.json_response else []),
+            cwd=str(MCP_DIR)
+        )
+        wait_for_port("127.0.0.1", port)
+        url = f"http://127.0.0.1:{port}" + ("/sse" if args.transport == "sse" else "/mcp")
+
+    try:
+        print(f"{url} ({args.transport}), seviye başına {args.duration:.0f} s\n")
+        print(f"{'oturum':>7} {'çağrı':>8} {'hata':>5} {'çağrı/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'kurulum ms':>11} {'ölçek':>6}")
+        single = None
+        for sessions in (int(x) for x in args.sessions.split(",")):
+            level = run_level(url, args.transport, sessions, args.duration,
+                              args.batch_ratio, args.client_processes)
+            single = single or level["throughput"]
+            print(f"{level['sessions']:>7} {level['calls']:>8} {level['errors']:>5} "
+                  f"{level['throughput']:>9.1f} {level['p50'] * 1000:>8.2f} {level['p95'] * 1000:>8.2f} "
+                  f"{level['setup_p50'] * 1000:>11.1f} {level['throughput'] / single:>5.2f}x")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Yakınlık Eşleştirmesi Ölçeklenme Testi
+distindex.proximity_pairs'in nokta sayısıyla nasıl büyüdüğünü ölçer. Noktalar
+sabit yoğunlukta (varsayılan 50 nokta/km²) rastgele dağıtılır; alan nokta
+sayısıyla büyüdüğünden doğrusal bir algoritmada nokta başına süre sabit kalır.
+Küçük boyutlarda sonuç tüm çiftleri tarayan kaba kuvvet yöntemiyle doğrulanır
+ve iki yöntemin süreleri karşılaştırılır.
+
+Kullanım:
+    python benchmarks/proximity.py
+    python benchmarks/proximity.py --sizes 10000,100000,1000000 --threshold-m 100
+    python benchmarks/proximity.py --method vincenty --brute-max 5000
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Sunucu modülleri bir üst dizinde
+MCP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MCP_DIR))
+
+from distindex import proximity_pairs  # noqa: E402
+from distvec import distance_array  # noqa: E402
+
+DEFAULT_SIZES = "10000,100000,1000000"
+DEFAULT_THRESHOLD_M = 100.0
+DEFAULT_DENSITY = 50.0
+DEFAULT_BRUTE_MAX = 10_000
+BRUTE_ROWS = 256
+SEED = 20250101
+
+# Alanın köşesi (İstanbul)
+ORIGIN = (41.0, 28.9)
+
+
+def random_points(n: int, density: float, seed: int = SEED) -> tuple[np.ndarray, np.ndarray]:
+    """density nokta/km² yoğunlukta, kare bir alana düzgün dağılmış noktalar"""
+    rng = np.random.default_rng(seed)
+    side_km = math.sqrt(n / density)
+    lats = ORIGIN[0] + rng.uniform(0, side_km / 111.2, n)
+    lons = ORIGIN[1] + rng.uniform(0, side_km / (111.2 * math.cos(math.radians(ORIGIN[0]))), n)
+    return lats, lons
+
+
+def brute_force_pairs(lats: np.ndarray, lons: np.ndarray, threshold_km: float, method: str) -> set:
+    """Tüm çiftleri satır blokları halinde tarayarak eşik altındaki çiftleri bulur"""
+    pairs = set()
+    for start in range(0, lats.size, BRUTE_ROWS):
+        rows = np.arange(start, min(start + BRUTE_ROWS, lats.size))
+        distances = distance_array(lats[rows, None], lons[rows, None], lats[None, :], lons[None, :], method)
+        i, j = np.nonzero(distances <= threshold_km)
+        i = rows[i]
+        upper = i < j
+        pairs.update(zip(i[upper].tolist(), j[upper].tolist()))
+    return pairs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="proximity_pairs ölçeklenme testi")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Virgülle ayrılmış nokta sayıları")
+    parser.add_argument("--threshold-m", type=float, default=DEFAULT_THRESHOLD_M, help="Eşik mesafesi (metre)")
+    parser.add_argument("--density", type=float, default=DEFAULT_DENSITY, help="Nokta yoğunluğu (nokta/km²)")
+    parser.add_argument("--method", choices=["haversine", "vincenty"], default="haversine")
+    parser.add_argument("--brute-max", type=int, default=DEFAULT_BRUTE_MAX,
+                        help="Kaba kuvvetle doğrulanacak en büyük nokta sayısı")
+    args = parser.parse_args()
+
+    threshold_km = args.threshold_m / 1000
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"eşik: {args.threshold_m:g} m, yoğunluk: {args.density:g} nokta/km², yöntem: {args.method}")
+    print(f"\n{'nokta':>9} {'süre s':>8} {'µs/nokta':>9} {'çift':>9} {'karşılaştırma':>14} "
+          f"{'kaba kuvvet s':>14} {'doğru':>6}")
+
+    failed = False
+    for n in sizes:
+        lats, lons = random_points(n, args.density)
+        start = time.perf_counter()
+        first, second, _, stats = proximity_pairs(lats, lons, threshold_km, args.method)
+        elapsed = time.perf_counter() - start
+
+        brute_time = correct = "-"
+        if n <= args.brute_max:
+            start = time.perf_counter()
+            expected = brute_force_pairs(lats, lons, threshold_km, args.method)
+            brute_time = f"{time.perf_counter() - start:.2f}"
+            correct = set(zip(first.tolist(), second.tolist())) == expected
+            failed |= not correct
+
+        print(f"{n:>9} {elapsed:>8.3f} {elapsed / n * 1e6:>9.2f} {first.size:>9} "
+              f"{stats['compared_pairs']:>14} {brute_time:>14} {str(correct):>6}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
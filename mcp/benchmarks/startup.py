@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+MCP Sunucusu Soğuk Başlangıç Benchmarkı
+dist.py'yi her turda yeni bir stdio süreci olarak başlatır ve süreç
+oluşturulmasından initialize ile ilk tools/list yanıtına kadar geçen süreyi
+ölçer. Ayrıca yalnızca MCP SDK'sının içe aktarılma süresini ölçerek dist.py'nin
+kendi başlangıç yükünü ayırır.
+
+Kullanım:
+    python benchmarks/startup.py                    # 10 tur ölç ve yazdır
+    python benchmarks/startup.py --runs 30
+    python benchmarks/startup.py --max-overhead-ms 50   # hedef aşılırsa çıkış kodu 1
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+MCP_DIR = Path(__file__).resolve().parent.parent
+SERVER = MCP_DIR / "dist.py"
+
+DEFAULT_RUNS = 10
+# dist.py'nin MCP SDK içe aktarımı dışındaki başlangıç yükü için hedef (ms)
+DEFAULT_MAX_OVERHEAD_MS = 50.0
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+def _request(request_id: int, method: str, params: dict | None = None) -> bytes:
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return (json.dumps(message) + "\n").encode()
+
+
+def _read_response(stream, request_id: int) -> dict:
+    """Verilen id'ye sahip JSON-RPC yanıtını okur (bildirimleri atlar)"""
+    while True:
+        line = stream.readline()
+        if not line:
+            raise RuntimeError("Sunucu yanıt vermeden kapandı")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"Sunucu hatası: {message['error']}")
+            return message
+
+
+def measure_startup(server: Path = SERVER) -> dict:
+    """
+    Sunucuyu bir kez başlatıp aşama sürelerini ölçer.
+
+    Returns:
+        {"initialize": s, "list_tools": s} (süreç oluşturulmasından itibaren saniye)
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(server)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        cwd=str(server.parent)
+    )
+    try:
+        # İstemci gibi davran: initialize gönder, yanıtı bekle, sonra tools/list iste
+        process.stdin.write(_request(1, "initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "startup-bench", "version": "1.0.0"}
+        }))
+        process.stdin.flush()
+        _read_response(process.stdout, 1)
+        initialized = time.perf_counter()
+
+        process.stdin.write(b'{"jsonrpc": "2.0", "method": "notifications/initialized"}\n')
+        process.stdin.write(_request(2, "tools/list"))
+        process.stdin.flush()
+        tools = _read_response(process.stdout, 2)["result"]["tools"]
+        listed = time.perf_counter()
+        if not tools:
+            raise RuntimeError("tools/list boş döndü")
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    return {"initialize": initialized - start, "list_tools": listed - start}
+
+
+def measure_import(statement: str, setup: str = "pass") -> float:
+    """
+    Yeni bir yorumlayıcıda setup çalıştırıldıktan sonra verilen içe aktarma
+    ifadesinin süresini ölçer (saniye)
+    """
+    code = f"{setup}; import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=str(MCP_DIR),
+                            capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+
+def run(runs: int = DEFAULT_RUNS) -> dict:
+    """
+    Başlangıç ölçümlerini runs kez tekrarlar ve medyanları döndürür.
+
+    - list_tools: süreç oluşturulmasından ilk tools/list yanıtına kadar
+    - initialize: süreç oluşturulmasından initialize yanıtına kadar
+    - sdk_import: yalnızca MCP SDK'sının (mcp.server.stdio) içe aktarılması
+    - overhead: SDK zaten yüklüyken dist modülünün içe aktarılması, yani
+      dist.py'nin kendi yükü (modüller, tool şemaları)
+    """
+    # İlk tur .pyc dosyalarını üretir; ölçüme katılmaz
+    measure_startup()
+
+    samples = [measure_startup() for _ in range(runs)]
+    sdk = [measure_import("import mcp.server.stdio") for _ in range(runs)]
+    own = [measure_import("import dist", setup="import mcp.server.stdio") for _ in range(runs)]
+
+    return {
+        "list_tools": statistics.median(s["list_tools"] for s in samples),
+        "list_tools_max": max(s["list_tools"] for s in samples),
+        "initialize": statistics.median(s["initialize"] for s in samples),
+        "sdk_import": statistics.median(sdk),
+        "overhead": statistics.median(own)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="dist.py soğuk başlangıç benchmarkı")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Tur sayısı")
+    parser.add_argument("--max-overhead-ms", type=float, default=DEFAULT_MAX_OVERHEAD_MS,
+                        help="dist.py'nin SDK dışı başlangıç yükü için hedef (ms)")
+    args = parser.parse_args()
+
+    result = run(args.runs)
+    for name, value in result.items():
+        print(f"{name:16s} {value * 1000:8.1f} ms")
+
+    if result["overhead"] * 1000 > args.max_overhead_ms:
+        print(f"\nHedef aşıldı: dist.py başlangıç yükü {result['overhead'] * 1000:.1f} ms "
+              f"> {args.max_overhead_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,39 @@ Kuş Uçumu Mesafe Hesaplama MCP Server
 İki koordinat noktası arasındaki en kısa mesafeyi hesaplar.
 """
 
+import argparse
 import asyncio
-import json
+import contextlib
 import math
-from typing import Any, Sequence
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+import jsonschema
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 from pydantic import AnyUrl
 import mcp.server.stdio
+from distconst import (
+    AUTO_METHODS,
+    DEFAULT_MATRIX_MEMORY_MB,
+    DEFAULT_MAX_ERROR_M,
+    DEFAULT_MAX_PAIRS,
+    DEFAULT_ROUTE_TIME_LIMIT_S,
+    DENSE_MATRIX_MAX_CELLS,
+    MAX_ROUTE_STOPS,
+    MAX_ROUTE_TIME_LIMIT_S,
+    MAX_STORED_NAME_BYTES,
+)
+from distcache import cache_from_env
+import distjson
+
+# NumPy ve ona bağlı modüller (distvec, distindex, distexec) süreç başlangıcını
+# yavaşlatmasın diye ilk tool çağrısında yüklenir; bkz. handle_call_tool
+if TYPE_CHECKING:
+    from distexec import DistanceExecutor
+    from distfence import GeofenceRegistry
+    from distsets import PointSetRegistry
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -141,99 +165,779 @@ def vincenty_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
     return s / 1000  # metreyi kilometreye çevir
 
 
+def validate_max_error(max_error_m: Any) -> None:
+    """'auto' yöntemi için hata bütçesini doğrula"""
+    if isinstance(max_error_m, bool) or not isinstance(max_error_m, (int, float)) or not max_error_m > 0:
+        raise ValueError("max_error_m pozitif bir sayı olmalı (metre)")
+
+
 # MCP Server
-server = Server("distance-calculator")
+SERVER_NAME = "distance-calculator"
+SERVER_VERSION = "1.0.0"
 
+# Ağ taşıması varsayılanları (DIST_MCP_* ortam değişkenleriyle değiştirilebilir)
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8001
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """Mevcut tool'ları listele"""
-    return [
-        types.Tool(
-            name="calculate_distance",
-            description="İki koordinat noktası arasındaki kuş uçumu mesafesini hesaplar",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "lat1": {
-                        "type": "number",
-                        "description": "İlk nokta enlem (-90 ile 90 arası)"
-                    },
-                    "lon1": {
-                        "type": "number", 
-                        "description": "İlk nokta boylam (-180 ile 180 arası)"
-                    },
-                    "lat2": {
-                        "type": "number",
-                        "description": "İkinci nokta enlem (-90 ile 90 arası)"
+server = Server(SERVER_NAME, version=SERVER_VERSION)
+
+# REST worker'larıyla paylaşılan, diskte bellek eşlemeli nokta kümeleri (DIST_POINT_SETS_DIR);
+# ilk ihtiyaçta get_point_sets ile açılır
+point_sets: Optional["PointSetRegistry"] = None
+
+# REST worker'larıyla paylaşılan coğrafi çitler (DIST_GEOFENCES_DIR); ilk ihtiyaçta get_geofences ile açılır
+geofences: Optional["GeofenceRegistry"] = None
+
+
+def import_dir_from_env() -> Optional[Path]:
+    """
+    Tool'ların `path` ile okuyabileceği sunucu tarafı dizin (DIST_IMPORT_DIR).
+    Tanımlı değilse dosya yolları hiç kabul edilmez.
+    """
+    root = os.environ.get("DIST_IMPORT_DIR")
+    return Path(root).resolve() if root else None
+
+
+# Ağ taşımasında istemciler sunucudaki rastgele dosyaları okutamasın diye `path`
+# argümanları yalnızca bu dizinin altındaki dosyalara çözülür
+IMPORT_DIR = import_dir_from_env()
+
+
+def resolve_import_path(path: Any) -> Path:
+    """
+    Tool'a verilen dosya yolunu IMPORT_DIR altında çözer (göreli yollar dizine göredir,
+    sembolik bağlar çözüldükten sonra denetlenir). Dizin dışındaki ve var olmayan
+    dosyalar aynı hatayı verir.
+
+    Raises:
+        ValueError: Dosya yolları kapalıysa veya dosya dizinde değilse
+    """
+    if IMPORT_DIR is None:
+        raise ValueError("Dosya yolları kapalı; sunucuda DIST_IMPORT_DIR ile içe aktarma dizini tanımlanmalı")
+    if not isinstance(path, str) or not path:
+        raise ValueError("path boş olmayan bir metin olmalı")
+    resolved = (IMPORT_DIR / path).resolve()
+    if not resolved.is_relative_to(IMPORT_DIR) or not resolved.is_file():
+        raise ValueError(f"Dosya içe aktarma dizininde bulunamadı: {path}")
+    return resolved
+
+
+# Tool çıktılarının JSON girintisi; varsayılan kompakt (DIST_MCP_JSON_INDENT)
+JSON_INDENT = distjson.indent_from_env()
+
+# calculate_distance sonuçları için LRU önbellek (DIST_CACHE_SIZE / DIST_CACHE_PRECISION)
+distance_cache = cache_from_env()
+
+# CPU yoğun işleri olay döngüsü dışına taşıyan yürütücü (DIST_EXEC_* ortam değişkenleri);
+# ilk ihtiyaçta get_executor ile oluşturulur
+executor: Optional["DistanceExecutor"] = None
+
+
+def get_executor() -> "DistanceExecutor":
+    """Yürütücüyü ilk çağrıda oluşturur (distexec NumPy'yi yükler)"""
+    global executor
+    if executor is None:
+        from distexec import executor_from_env
+        executor = executor_from_env()
+    return executor
+
+
+def get_point_sets() -> "PointSetRegistry":
+    """Nokta kümesi deposunu ilk çağrıda açar (distsets NumPy'yi yükler)"""
+    global point_sets
+    if point_sets is None:
+        from distsets import registry_from_env
+        point_sets = registry_from_env()
+    return point_sets
+
+
+def get_geofences() -> "GeofenceRegistry":
+    """Çit deposunu ilk çağrıda açar (distfence NumPy'yi yükler)"""
+    global geofences
+    if geofences is None:
+        from distfence import geofences_from_env
+        geofences = geofences_from_env()
+    return geofences
+
+
+# Tool tanımları statiktir; her list_tools isteğinde yeniden kurulmaması için bir kez oluşturulur
+TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="calculate_distance",
+        description="İki koordinat noktası arasındaki kuş uçumu mesafesini hesaplar",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "lat1": {
+                    "type": "number",
+                    "minimum": -90,
+                    "maximum": 90,
+                    "description": "İlk nokta enlem (-90 ile 90 arası)"
+                },
+                "lon1": {
+                    "type": "number",
+                    "minimum": -180,
+                    "maximum": 180,
+                    "description": "İlk nokta boylam (-180 ile 180 arası)"
+                },
+                "lat2": {
+                    "type": "number",
+                    "minimum": -90,
+                    "maximum": 90,
+                    "description": "İkinci nokta enlem (-90 ile 90 arası)"
+                },
+                "lon2": {
+                    "type": "number",
+                    "minimum": -180,
+                    "maximum": 180,
+                    "description": "İkinci nokta boylam (-180 ile 180 arası)"
+                },
+                "method": {
+                    "type": "string",
+                    "description": "Hesaplama yöntemi: 'haversine' (hızlı), 'vincenty' (hassas) veya 'auto' (max_error_m bütçesini karşılayan en ucuz yöntem)",
+                    "enum": ["haversine", "vincenty", "auto"],
+                    "default": "haversine"
+                },
+                "max_error_m": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "'auto' yönteminde izin verilen en fazla hata (metre)",
+                    "default": DEFAULT_MAX_ERROR_M
+                },
+                "unit": {
+                    "type": "string",
+                    "description": "Sonuç birimi",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                }
+            },
+            "required": ["lat1", "lon1", "lat2", "lon2"]
+        }
+    ),
+    types.Tool(
+        name="batch_distance_calculation",
+        description=(
+            "Bir referans noktadan birden fazla noktaya mesafe hesaplar; sonuçlar referansa uzaklığa göre "
+            "sıralıdır, ziyaret sırası değildir (sıra için optimize_route)"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "reference_point": {
+                    "type": "object",
+                    "properties": {
+                        "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                        "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                        "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
                     },
-                    "lon2": {
-                        "type": "number",
-                        "description": "İkinci nokta boylam (-180 ile 180 arası)"
+                    "required": ["lat", "lon"]
+                },
+                "target_points": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
+                    }
+                },
+                "target_set_id": {
+                    "type": "string",
+                    "description": "target_points yerine kullanılacak, register_point_set ile kaydedilmiş küme adı"
+                },
+                "method": {
+                    "type": "string",
+                    "description": "'auto' her hedef için max_error_m bütçesini karşılayan en ucuz yöntemi seçer",
+                    "enum": ["haversine", "vincenty", "auto"],
+                    "default": "haversine"
+                },
+                "max_error_m": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "'auto' yönteminde izin verilen en fazla hata (metre)",
+                    "default": DEFAULT_MAX_ERROR_M
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                },
+                "format": {
+                    "type": "string",
+                    "description": "'compact': hedef adları ve koordinatları olmadan, mesafeye göre sıralı giriş indeksleri (indices) ve mesafeler (distances) dizileri",
+                    "enum": ["full", "compact"],
+                    "default": "full"
+                }
+            },
+            "required": ["reference_point"]
+        }
+    ),
+    types.Tool(
+        name="calculate_distances_bulk",
+        description=(
+            "Birbirinden bağımsız birçok nokta çifti arasındaki mesafeleri tek çağrıda hesaplar; "
+            "sonuçlar giriş sırasıyla kompakt JSON dizisi olarak döner"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pairs": {
+                    "type": "array",
+                    "description": "[lat1, lon1, lat2, lon2] dizilerinden oluşan çift listesi",
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "number"},
+                        "minItems": 4,
+                        "maxItems": 4
                     },
-                    "method": {
-                        "type": "string",
-                        "description": "Hesaplama yöntemi: 'haversine' (hızlı) veya 'vincenty' (hassas)",
-                        "enum": ["haversine", "vincenty"],
-                        "default": "haversine"
+                    "minItems": 1
+                },
+                "method": {
+                    "type": "string",
+                    "description": "'auto' her çift için max_error_m bütçesini karşılayan en ucuz yöntemi seçer",
+                    "enum": ["haversine", "vincenty", "auto"],
+                    "default": "haversine"
+                },
+                "max_error_m": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "'auto' yönteminde izin verilen en fazla hata (metre)",
+                    "default": DEFAULT_MAX_ERROR_M
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                }
+            },
+            "required": ["pairs"]
+        }
+    ),
+    types.Tool(
+        name="distance_matrix",
+        description="İki nokta listesi arasındaki N×M mesafe matrisini hesaplar",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "origins": {
+                    "type": "array",
+                    "description": "Başlangıç noktaları (matris satırları)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
+                    }
+                },
+                "destinations": {
+                    "type": "array",
+                    "description": "Varış noktaları (matris sütunları)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
+                    }
+                },
+                "method": {
+                    "type": "string",
+                    "enum": ["haversine", "vincenty"],
+                    "default": "haversine"
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                },
+                "max_distance": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "Verilirse yalnızca bu mesafe (unit cinsinden) içindeki çiftler seyrek liste olarak döner"
+                },
+                "max_memory_mb": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "Karo hesabı için ara bellek sınırı (MB)",
+                    "default": DEFAULT_MATRIX_MEMORY_MB
+                }
+            },
+            "required": ["origins", "destinations"]
+        }
+    ),
+    types.Tool(
+        name="register_point_set",
+        description=(
+            "Bir nokta kümesini (noktalar veya sunucudaki CSV/GeoJSON dosyası) paylaşılan depoya kaydeder; "
+            "küme batch_distance_calculation, points_within_radius ve nearest_points'te adıyla kullanılabilir"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "set_id": {
+                    "type": "string",
+                    "minLength": 1,
+                    "maxLength": MAX_STORED_NAME_BYTES,
+                    "description": "Nokta kümesi adı (aynı adla tekrar kayıt eskisini değiştirir)"
+                },
+                "points": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
+                    }
+                },
+                "path": {
+                    "type": "string",
+                    "description": "points yerine yüklenecek CSV veya GeoJSON dosyası (sunucunun DIST_IMPORT_DIR dizinine göre)"
+                },
+                "format": {
+                    "type": "string",
+                    "description": "Dosya biçimi (varsayılan uzantıdan)",
+                    "enum": ["csv", "geojson"]
+                }
+            },
+            "required": ["set_id"]
+        }
+    ),
+    types.Tool(
+        name="nearest_points",
+        description="Kayıtlı bir nokta kümesinde verilen konuma en yakın k noktayı bulur",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "set_id": {
+                    "type": "string",
+                    "description": "register_point_set ile kaydedilmiş küme adı"
+                },
+                "lat": {
+                    "type": "number",
+                    "minimum": -90,
+                    "maximum": 90,
+                    "description": "Sorgu noktası enlem (-90 ile 90 arası)"
+                },
+                "lon": {
+                    "type": "number",
+                    "minimum": -180,
+                    "maximum": 180,
+                    "description": "Sorgu noktası boylam (-180 ile 180 arası)"
+                },
+                "k": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Döndürülecek nokta sayısı",
+                    "default": 10
+                },
+                "method": {
+                    "type": "string",
+                    "description": "Sıralama yöntemi: 'haversine' (hızlı) veya 'vincenty' (Haversine ile budanıp Vincenty ile inceltilir)",
+                    "enum": ["haversine", "vincenty"],
+                    "default": "haversine"
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                }
+            },
+            "required": ["set_id", "lat", "lon"]
+        }
+    ),
+    types.Tool(
+        name="points_within_radius",
+        description="Merkez noktaya verilen yarıçap içindeki tüm hedef noktaları bulur (sınırlayıcı kutu ön filtresiyle)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "center_point": {
+                    "type": "object",
+                    "properties": {
+                        "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                        "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                        "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
                     },
-                    "unit": {
-                        "type": "string",
-                        "description": "Sonuç birimi",
-                        "enum": ["km", "miles", "nautical_miles"],
-                        "default": "km"
+                    "required": ["lat", "lon"]
+                },
+                "radius": {
+                    "type": "number",
+                    "minimum": 0,
+                    "description": "Yarıçap (unit cinsinden)"
+                },
+                "target_points": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
                     }
                 },
-                "required": ["lat1", "lon1", "lat2", "lon2"]
-            }
+                "target_set_id": {
+                    "type": "string",
+                    "description": "target_points yerine kullanılacak, register_point_set ile kaydedilmiş küme adı"
+                },
+                "method": {
+                    "type": "string",
+                    "enum": ["haversine", "vincenty"],
+                    "default": "haversine"
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                }
+            },
+            "required": ["center_point", "radius"]
+        }
+    ),
+    types.Tool(
+        name="proximity_pairs",
+        description=(
+            "Bir nokta kümesinde birbirine eşik mesafesinden (metre) yakın tüm nokta çiftlerini bulur "
+            "(ör. yakın teslim noktalarını tekilleştirmek için); ızgara ile yalnızca komşu hücreleri karşılaştırır"
         ),
-        types.Tool(
-            name="batch_distance_calculation",
-            description="Bir referans noktadan birden fazla noktaya mesafe hesaplar",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "reference_point": {
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "target_points": {
+                    "type": "array",
+                    "items": {
                         "type": "object",
                         "properties": {
-                            "lat": {"type": "number"},
-                            "lon": {"type": "number"},
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
                             "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
                         },
                         "required": ["lat", "lon"]
+                    }
+                },
+                "target_set_id": {
+                    "type": "string",
+                    "description": "target_points yerine kullanılacak, register_point_set ile kaydedilmiş küme adı"
+                },
+                "threshold_m": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "Eşik mesafesi (metre)"
+                },
+                "method": {
+                    "type": "string",
+                    "description": "Adayları doğrulama yöntemi",
+                    "enum": ["haversine", "vincenty"],
+                    "default": "haversine"
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                },
+                "max_pairs": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "En fazla döndürülecek çift sayısı; aşılırsa truncated true olur",
+                    "default": DEFAULT_MAX_PAIRS
+                }
+            },
+            "required": ["threshold_m"]
+        }
+    ),
+    types.Tool(
+        name="path_length",
+        description=(
+            "Sıralı bir nokta dizisinin (GPS izi, rota) toplam uzunluğunu hesaplar; noktalar doğrudan "
+            "veya sunucudaki GPX/CSV dosyası olarak verilir, dosya parça parça okunur"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "points": {
+                    "type": "array",
+                    "description": "Sıralı [lat, lon] çiftleri veya {lat, lon} nesneleri",
+                    "items": {
+                        "oneOf": [
+                            {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2},
+                            {
+                                "type": "object",
+                                "properties": {
+                                    "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                                    "lon": {"type": "number", "minimum": -180, "maximum": 180}
+                                },
+                                "required": ["lat", "lon"]
+                            }
+                        ]
+                    }
+                },
+                "path": {
+                    "type": "string",
+                    "description": "points yerine okunacak GPX veya CSV dosyası (sunucunun DIST_IMPORT_DIR dizinine göre)"
+                },
+                "format": {
+                    "type": "string",
+                    "description": "Dosya biçimi (varsayılan uzantıdan)",
+                    "enum": ["gpx", "csv"]
+                },
+                "method": {
+                    "type": "string",
+                    "description": "Hesaplama yöntemi (auto: max_error_m bütçesini karşılayan en ucuz yöntem)",
+                    "enum": ["haversine", "vincenty", "auto"],
+                    "default": "haversine"
+                },
+                "max_error_m": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "auto yönteminde izin verilen en fazla hata (metre)",
+                    "default": DEFAULT_MAX_ERROR_M
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                },
+                "include_cumulative": {
+                    "type": "boolean",
+                    "description": "Nokta başına kümülatif mesafeleri döndür (ilk nokta 0)",
+                    "default": True
+                },
+                "include_segments": {
+                    "type": "boolean",
+                    "description": "Ardışık nokta çiftlerinin segment mesafelerini döndür",
+                    "default": False
+                }
+            }
+        }
+    ),
+    types.Tool(
+        name="optimize_route",
+        description=(
+            "Başlangıç noktasından tüm durakları ziyaret eden kısa bir sıra bulur: mesafe matrisi üzerinde "
+            "en yakın komşu rotası, süre bütçesi içinde 2-opt ve Or-opt ile iyileştirilir; sonuç başlangıca "
+            "uzaklığa göre sıralı rotayla karşılaştırılır"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_point": {
+                    "type": "object",
+                    "properties": {
+                        "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                        "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                        "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
                     },
-                    "target_points": {
+                    "required": ["lat", "lon"]
+                },
+                "target_points": {
+                    "type": "array",
+                    "description": f"Ziyaret edilecek duraklar (en fazla {MAX_ROUTE_STOPS})",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
+                    }
+                },
+                "target_set_id": {
+                    "type": "string",
+                    "description": "target_points yerine kullanılacak, register_point_set ile kaydedilmiş küme adı"
+                },
+                "method": {
+                    "type": "string",
+                    "description": "Mesafe matrisi yöntemi",
+                    "enum": ["haversine", "vincenty"],
+                    "default": "haversine"
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                },
+                "return_to_start": {
+                    "type": "boolean",
+                    "description": "Rota başlangıç noktasına dönerek biter",
+                    "default": False
+                },
+                "time_limit_s": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "maximum": MAX_ROUTE_TIME_LIMIT_S,
+                    "description": f"Süre bütçesi (saniye, en fazla {MAX_ROUTE_TIME_LIMIT_S:g}); iyileştirme bütçe dolunca kesilir",
+                    "default": DEFAULT_ROUTE_TIME_LIMIT_S
+                }
+            },
+            "required": ["start_point"]
+        }
+    ),
+    types.Tool(
+        name="register_geofence",
+        description=(
+            "Bir çokgeni (hizmet bölgesi) coğrafi çit olarak kaydeder; çit bir kez hazırlanır ve "
+            "geofence_query'de adıyla kullanılır"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fence_id": {
+                    "type": "string",
+                    "minLength": 1,
+                    "maxLength": MAX_STORED_NAME_BYTES,
+                    "description": "Çit adı (aynı adla tekrar kayıt eskisini değiştirir)"
+                },
+                "polygon": {
+                    "type": "array",
+                    "description": "Dış halka: [lat, lon] köşeleri (kapanış noktası isteğe bağlı)",
+                    "items": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2}
+                },
+                "holes": {
+                    "type": "array",
+                    "description": "Delik halkaları ([lat, lon] köşeleri)",
+                    "items": {
                         "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "lat": {"type": "number"},
-                                "lon": {"type": "number"},
-                                "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
-                            },
-                            "required": ["lat", "lon"]
-                        }
-                    },
-                    "method": {
-                        "type": "string",
-                        "enum": ["haversine", "vincenty"],
-                        "default": "haversine"
-                    },
-                    "unit": {
-                        "type": "string",
-                        "enum": ["km", "miles", "nautical_miles"],
-                        "default": "km"
+                        "items": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2}
+                    }
+                },
+                "geojson": {
+                    "type": "object",
+                    "description": "polygon yerine GeoJSON Polygon/MultiPolygon, Feature veya FeatureCollection"
+                },
+                "path": {
+                    "type": "string",
+                    "description": "polygon yerine yüklenecek GeoJSON dosyası (sunucunun DIST_IMPORT_DIR dizinine göre)"
+                }
+            },
+            "required": ["fence_id"]
+        }
+    ),
+    types.Tool(
+        name="geofence_query",
+        description=(
+            "Noktaların kayıtlı çitlerin içinde olup olmadığını ve çit sınırına büyük daire "
+            "mesafesini hesaplar"
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fence_ids": {
+                    "type": "array",
+                    "description": "register_geofence ile kaydedilmiş çit adları",
+                    "items": {"type": "string"}
+                },
+                "target_points": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "lat": {"type": "number", "minimum": -90, "maximum": 90},
+                            "lon": {"type": "number", "minimum": -180, "maximum": 180},
+                            "name": {"type": "string", "description": "Nokta adı (opsiyonel)"}
+                        },
+                        "required": ["lat", "lon"]
                     }
                 },
-                "required": ["reference_point", "target_points"]
+                "target_set_id": {
+                    "type": "string",
+                    "description": "target_points yerine kullanılacak, register_point_set ile kaydedilmiş küme adı"
+                },
+                "include_distance": {
+                    "type": "boolean",
+                    "description": "Çit sınırına mesafeleri de döndür",
+                    "default": True
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["km", "miles", "nautical_miles"],
+                    "default": "km"
+                }
+            },
+            "required": ["fence_ids"]
+        }
+    ),
+    types.Tool(
+        name="cache_stats",
+        description="calculate_distance önbelleğinin isabet, kaçırma ve çıkarma sayaçlarını döndürür",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "clear": {
+                    "type": "boolean",
+                    "description": "True ise sayaçlar okunduktan sonra önbellek temizlenir",
+                    "default": False
+                }
             }
-        )
-    ]
+        }
+    )
+]
 
 
-@server.call_tool()
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    """Mevcut tool'ları listele"""
+    return TOOLS
+
+
+# Her tool şeması için bir kez kurulan doğrulayıcılar. SDK'nın doğrulaması her çağrıda
+# şemayı yeniden denetleyip doğrulayıcı kurar (100 noktalık bir toplu istekte ~12 ms);
+# önbellekli doğrulayıcı aynı denetimi yalnızca argümanlar üzerinde yapar
+TOOL_VALIDATORS = {
+    tool.name: jsonschema.validators.validator_for(tool.inputSchema)(tool.inputSchema)
+    for tool in TOOLS
+}
+
+
+def validate_arguments(name: str, arguments: dict) -> None:
+    """
+    Argümanları tool'un inputSchema'sına göre doğrular (tür, enum, aralık, zorunlu alanlar).
+
+    Raises:
+        ValueError: Argümanlar şemaya uymuyorsa
+    """
+    validator = TOOL_VALIDATORS.get(name)
+    if validator is None:
+        return
+    error = jsonschema.exceptions.best_match(validator.iter_errors(arguments))
+    if error is not None:
+        location = ".".join(str(part) for part in error.absolute_path)
+        raise ValueError(f"Girdi doğrulama hatası{f' ({location})' if location else ''}: {error.message}")
+
+
+# SDK doğrulaması yerine önbellekli doğrulayıcılar kullanılır (bkz. TOOL_VALIDATORS)
+@server.call_tool(validate_input=False)
 async def handle_call_tool(name: str, arguments: dict | None) -> list[types.TextContent]:
     """Tool çağrılarını işle"""
+    validate_arguments(name, arguments or {})
+    import numpy as np
+    from distindex import SpatialIndex, proximity_pairs
+    from distio import parse_coordinate_pairs
+    from distfence import geojson_rings, polygon_rings
+    from distroute import optimize_route
+    from distpath import parse_point_sequence, path_length, path_length_file
+    from distvec import (
+        auto_distance,
+        auto_method_counts,
+        distance_matrix,
+        points_within_radius,
+        scalar_kernel,
+        sparse_distance_matrix,
+    )
+    executor = get_executor()
     
     def convert_unit(distance_km: float, unit: str) -> tuple[float, str]:
         """Mesafeyi istenen birime çevir"""
@@ -244,6 +948,23 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
         else:  # km
             return distance_km, "km"
     
+    def resolve_targets(arguments: dict):
+        """Hedefleri (satır içi noktalar veya kayıtlı küme) dizilere ve indeksten ada giden fonksiyona çevir"""
+        target_points = arguments.get("target_points")
+        target_set_id = arguments.get("target_set_id")
+        if target_points and target_set_id is not None:
+            raise ValueError("target_points veya target_set_id'den yalnızca biri verilmeli")
+        if target_set_id is not None:
+            point_set = get_point_sets().get(target_set_id)
+            if point_set is None:
+                raise ValueError(f"Kayıtlı nokta kümesi bulunamadı: {target_set_id}")
+            return point_set.lats, point_set.lons, point_set.name
+        if not target_points:
+            raise ValueError("Hedef noktalar (target_points) veya kayıtlı küme (target_set_id) gerekli")
+        lats = np.fromiter((t["lat"] for t in target_points), dtype=np.float64, count=len(target_points))
+        lons = np.fromiter((t["lon"] for t in target_points), dtype=np.float64, count=len(target_points))
+        return lats, lons, lambda i: target_points[i].get("name", f"Nokta {i+1}")
+    
     if name == "calculate_distance":
         if not arguments:
             raise ValueError("Koordinat parametreleri gerekli")
@@ -254,6 +975,7 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
         lat2 = arguments.get("lat2")
         lon2 = arguments.get("lon2")
         method = arguments.get("method", "haversine")
+        max_error_m = arguments.get("max_error_m", DEFAULT_MAX_ERROR_M)
         unit = arguments.get("unit", "km")
         
         # Koordinat doğrulama
@@ -266,11 +988,20 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
         if not (-180 <= lon1 <= 180 and -180 <= lon2 <= 180):
             raise ValueError("Boylam değerleri -180 ile 180 arasında olmalı")
         
-        # Mesafe hesapla
-        if method == "vincenty":
-            distance_km = vincenty_distance(lat1, lon1, lat2, lon2)
+        # auto: bütçeyi karşılayan en ucuz yöntem; düzlem/Haversine yeterliyse mesafe de hesaplanır
+        if method == "auto":
+            validate_max_error(max_error_m)
+            method_used, distance_km = auto_distance(lat1, lon1, lat2, lon2, max_error_m)
         else:
-            distance_km = haversine_distance(lat1, lon1, lat2, lon2)
+            method_used, distance_km = method, None
+        
+        # Mesafe hesapla (önbellek km cinsinden tutar, birim dönüşümü sonra yapılır)
+        if distance_km is None:
+            distance_km = distance_cache.get_or_compute(
+                lat1, lon1, lat2, lon2, method_used,
+                scalar_kernel(method_used)
+                or (vincenty_distance if method_used == "vincenty" else haversine_distance)
+            )
         
         # Birim dönüştür
         distance_converted, unit_name = convert_unit(distance_km, unit)
@@ -284,10 +1015,13 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
                 "point2": {"lat": lat2, "lon": lon2}
             }
         }
+        if method == "auto":
+            result["method_used"] = method_used
+            result["max_error_m"] = max_error_m
         
         return [types.TextContent(
             type="text",
-            text=json.dumps(result, ensure_ascii=False, indent=2)
+            text=distjson.dumps(result, JSON_INDENT)
         )]
     
     elif name == "batch_distance_calculation":
@@ -295,38 +1029,67 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
             raise ValueError("Parametreler gerekli")
         
         reference_point = arguments.get("reference_point")
-        target_points = arguments.get("target_points", [])
         method = arguments.get("method", "haversine")
+        max_error_m = arguments.get("max_error_m", DEFAULT_MAX_ERROR_M)
         unit = arguments.get("unit", "km")
+        output_format = arguments.get("format", "full")
         
-        if not reference_point or not target_points:
-            raise ValueError("Referans nokta ve hedef noktalar gerekli")
+        if not reference_point:
+            raise ValueError("Referans nokta gerekli")
+        if output_format not in ("full", "compact"):
+            raise ValueError("format 'full' veya 'compact' olmalı")
+        if method == "auto":
+            validate_max_error(max_error_m)
         
         ref_lat = reference_point["lat"]
         ref_lon = reference_point["lon"]
         ref_name = reference_point.get("name", f"({ref_lat}, {ref_lon})")
         
+        # Hedef koordinatlarını dizilere al (kayıtlı kümede kopyasız) ve tek seferde hesapla
+        target_lats, target_lons, target_name = resolve_targets(arguments)
+        total = len(target_lats)
+        if method == "auto":
+            distances_km, methods_used = await executor.auto_distance_array(
+                ref_lat, ref_lon, target_lats, target_lons, max_error_m
+            )
+        else:
+            distances_km = await executor.distance_array(ref_lat, ref_lon, target_lats, target_lons, method)
+        
+        # Birim dönüştür
+        distances_converted, unit_name = convert_unit(distances_km, unit)
+        
+        if output_format == "compact":
+            # Nokta başına sözlük kurulmaz; sıralama giriş indeksleriyle ifade edilir
+            rounded = np.round(distances_converted, 3)
+            order = np.argsort(rounded, kind="stable")
+            compact_result = {
+                "unit": unit_name,
+                "method": method,
+                "total_points": total,
+                "indices": order,
+                "distances": rounded[order]
+            }
+            if method == "auto":
+                compact_result["max_error_m"] = max_error_m
+                compact_result["methods"] = [AUTO_METHODS[code] for code in methods_used[order].tolist()]
+                compact_result["method_counts"] = auto_method_counts(methods_used)
+            return [types.TextContent(
+                type="text",
+                text=distjson.dumps(compact_result)
+            )]
+        
         results = []
         
-        for i, target in enumerate(target_points):
-            target_lat = target["lat"]
-            target_lon = target["lon"]
-            target_name = target.get("name", f"Nokta {i+1}")
-            
-            # Mesafe hesapla
-            if method == "vincenty":
-                distance_km = vincenty_distance(ref_lat, ref_lon, target_lat, target_lon)
-            else:
-                distance_km = haversine_distance(ref_lat, ref_lon, target_lat, target_lon)
-            
-            # Birim dönüştür
-            distance_converted, unit_name = convert_unit(distance_km, unit)
-            
+        for i, (lat, lon, distance) in enumerate(zip(target_lats.tolist(), target_lons.tolist(),
+                                                      distances_converted.tolist())):
             results.append({
-                "target_name": target_name,
-                "distance": round(distance_converted, 3),
-                "coordinates": {"lat": target_lat, "lon": target_lon}
+                "target_name": target_name(i),
+                "distance": round(distance, 3),
+                "coordinates": {"lat": lat, "lon": lon}
             })
+        if method == "auto":
+            for result, code in zip(results, methods_used.tolist()):
+                result["method"] = AUTO_METHODS[code]
         
         # Mesafeye göre sırala
         results.sort(key=lambda x: x["distance"])
@@ -341,32 +1104,612 @@ async def handle_call_tool(name: str, arguments: dict | None) -> list[types.Text
             "method": method,
             "total_points": len(results)
         }
+        if method == "auto":
+            batch_result["max_error_m"] = max_error_m
+            batch_result["method_counts"] = auto_method_counts(methods_used)
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(batch_result, JSON_INDENT)
+        )]
+    
+    elif name == "calculate_distances_bulk":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        method = arguments.get("method", "haversine")
+        max_error_m = arguments.get("max_error_m", DEFAULT_MAX_ERROR_M)
+        unit = arguments.get("unit", "km")
+        
+        if method not in ("haversine", "vincenty", "auto"):
+            raise ValueError("method 'haversine', 'vincenty' veya 'auto' olmalı")
+        if method == "auto":
+            validate_max_error(max_error_m)
+        
+        # Tüm çiftler tek seferde dizilere alınır, doğrulanır ve hesaplanır
+        lats1, lons1, lats2, lons2 = parse_coordinate_pairs(arguments.get("pairs"))
+        if method == "auto":
+            distances_km, methods_used = await executor.auto_distance_array(lats1, lons1, lats2, lons2, max_error_m)
+        else:
+            distances_km = await executor.distance_array(lats1, lons1, lats2, lons2, method)
+        
+        distances_converted, unit_name = convert_unit(distances_km, unit)
+        
+        bulk_result = {
+            "unit": unit_name,
+            "method": method,
+            "total_pairs": int(lats1.size),
+            "distances": np.round(distances_converted, 3).tolist()
+        }
+        if method == "auto":
+            bulk_result["max_error_m"] = max_error_m
+            bulk_result["methods"] = [AUTO_METHODS[code] for code in methods_used.tolist()]
+            bulk_result["method_counts"] = auto_method_counts(methods_used)
+        
+        # Çift sayısı yüzlerce olabildiğinden DIST_MCP_JSON_INDENT'ten bağımsız olarak hep kompakt
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(bulk_result)
+        )]
+    
+    elif name == "distance_matrix":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        origins = arguments.get("origins", [])
+        destinations = arguments.get("destinations", [])
+        method = arguments.get("method", "haversine")
+        unit = arguments.get("unit", "km")
+        max_distance = arguments.get("max_distance")
+        max_memory_mb = arguments.get("max_memory_mb", DEFAULT_MATRIX_MEMORY_MB)
+        
+        if not origins or not destinations:
+            raise ValueError("Başlangıç ve varış noktaları gerekli")
+        
+        if max_memory_mb <= 0:
+            raise ValueError("max_memory_mb pozitif olmalı")
+        
+        origin_lats = np.fromiter((p["lat"] for p in origins), dtype=np.float64, count=len(origins))
+        origin_lons = np.fromiter((p["lon"] for p in origins), dtype=np.float64, count=len(origins))
+        dest_lats = np.fromiter((p["lat"] for p in destinations), dtype=np.float64, count=len(destinations))
+        dest_lons = np.fromiter((p["lon"] for p in destinations), dtype=np.float64, count=len(destinations))
+        
+        # Birim çarpanı (km -> istenen birim)
+        unit_factor, unit_name = convert_unit(1.0, unit)
+        
+        matrix_result = {
+            "origins": [p.get("name", f"Nokta {i+1}") for i, p in enumerate(origins)],
+            "destinations": [p.get("name", f"Nokta {i+1}") for i, p in enumerate(destinations)],
+            "unit": unit_name,
+            "method": method,
+            "shape": [len(origins), len(destinations)]
+        }
+        
+        if max_distance is not None:
+            # Seyrek çıktı: yalnızca eşik içindeki çiftler
+            rows, cols, values = await executor.run(
+                executor.work_size(len(origins) * len(destinations), method), sparse_distance_matrix,
+                origin_lats, origin_lons, dest_lats, dest_lons,
+                max_distance / unit_factor, method, max_memory_mb
+            )
+            matrix_result["max_distance"] = max_distance
+            matrix_result["pairs"] = [
+                {"origin": i, "destination": j, "distance": round(d * unit_factor, 3)}
+                for i, j, d in zip(rows.tolist(), cols.tolist(), values.tolist())
+            ]
+            matrix_result["total_pairs"] = len(matrix_result["pairs"])
+        else:
+            if len(origins) * len(destinations) > DENSE_MATRIX_MAX_CELLS:
+                raise ValueError(
+                    f"Yoğun matris en fazla {DENSE_MATRIX_MAX_CELLS} hücre olabilir; "
+                    "daha büyük matrisler için max_distance kullanın"
+                )
+            matrix = await executor.run(
+                executor.work_size(len(origins) * len(destinations), method), distance_matrix,
+                origin_lats, origin_lons, dest_lats, dest_lons,
+                method, max_memory_mb
+            )
+            matrix_result["matrix"] = np.round(matrix * unit_factor, 3).tolist()
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(matrix_result, JSON_INDENT)
+        )]
+    
+    elif name == "register_point_set":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        set_id = arguments.get("set_id")
+        points = arguments.get("points", [])
+        path = arguments.get("path")
+        
+        if not set_id or not (points or path):
+            raise ValueError("Küme adı ve noktalar (points) veya dosya yolu (path) gerekli")
+        if points and path:
+            raise ValueError("points veya path'ten yalnızca biri verilmeli")
+        
+        registry = get_point_sets()
+        if path:
+            path = resolve_import_path(path)
+            point_set = await executor.run(path.stat().st_size // 32, registry.register_file,
+                                           set_id, path, arguments.get("format"))
+        else:
+            lats = np.fromiter((p["lat"] for p in points), dtype=np.float64, count=len(points))
+            lons = np.fromiter((p["lon"] for p in points), dtype=np.float64, count=len(points))
+            names = [p.get("name") for p in points] if any(p.get("name") for p in points) else None
+            point_set = await executor.run(len(points), registry.register, set_id, lats, lons, names)
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps({"set_id": set_id, "total_points": len(point_set)}, JSON_INDENT)
+        )]
+    
+    elif name == "nearest_points":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        set_id = arguments.get("set_id")
+        lat = arguments.get("lat")
+        lon = arguments.get("lon")
+        k = arguments.get("k", 10)
+        method = arguments.get("method", "haversine")
+        unit = arguments.get("unit", "km")
+        
+        point_set = get_point_sets().get(set_id) if isinstance(set_id, str) and set_id else None
+        if point_set is None:
+            raise ValueError(f"Kayıtlı nokta kümesi bulunamadı: {set_id}")
+        
+        if not all(isinstance(x, (int, float)) for x in [lat, lon]):
+            raise ValueError("Koordinatlar sayısal değer olmalı")
+        
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError("Koordinatlar geçerli enlem/boylam aralığında olmalı")
+        
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("k pozitif bir tam sayı olmalı")
+        
+        if point_set.index is None:
+            point_set.index = await executor.run(len(point_set), SpatialIndex, point_set.lats, point_set.lons)
+        indices, distances_km = point_set.index.nearest(lat, lon, k, method)
+        distances_converted, unit_name = convert_unit(distances_km, unit)
+        
+        nearest_result = {
+            "set_id": set_id,
+            "query_point": {"lat": lat, "lon": lon},
+            "neighbors": [
+                {
+                    "index": i,
+                    "target_name": point_set.name(i),
+                    "distance": round(d, 3),
+                    "coordinates": {"lat": float(point_set.lats[i]), "lon": float(point_set.lons[i])}
+                }
+                for i, d in zip(indices.tolist(), distances_converted.tolist())
+            ],
+            "unit": unit_name,
+            "method": method,
+            "k": len(indices)
+        }
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(nearest_result, JSON_INDENT)
+        )]
+    
+    elif name == "points_within_radius":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        center_point = arguments.get("center_point")
+        radius = arguments.get("radius")
+        method = arguments.get("method", "haversine")
+        unit = arguments.get("unit", "km")
+        
+        if not center_point:
+            raise ValueError("Merkez nokta gerekli")
+        
+        if not isinstance(radius, (int, float)) or radius < 0:
+            raise ValueError("Yarıçap sıfır veya pozitif bir sayı olmalı")
+        
+        center_lat = center_point["lat"]
+        center_lon = center_point["lon"]
+        center_name = center_point.get("name", f"({center_lat}, {center_lon})")
+        
+        # Yarıçapı kilometreye çevir, sonuçları istenen birime geri çevir
+        unit_factor, unit_name = convert_unit(1.0, unit)
+        
+        target_lats, target_lons, target_name = resolve_targets(arguments)
+        total = len(target_lats)
+        indices, distances_km, evaluated = await executor.run(
+            executor.work_size(total, method), points_within_radius,
+            center_lat, center_lon, radius / unit_factor, target_lats, target_lons, method
+        )
+        
+        results = []
+        
+        for i, distance in zip(indices.tolist(), (distances_km * unit_factor).tolist()):
+            results.append({
+                "index": i,
+                "target_name": target_name(i),
+                "distance": round(distance, 3),
+                "coordinates": {"lat": float(target_lats[i]), "lon": float(target_lons[i])}
+            })
+        
+        # Mesafeye göre sırala
+        results.sort(key=lambda x: x["distance"])
+        
+        radius_result = {
+            "center_point": {
+                "name": center_name,
+                "coordinates": {"lat": center_lat, "lon": center_lon}
+            },
+            "radius": radius,
+            "points": results,
+            "unit": unit_name,
+            "method": method,
+            "total_points": total,
+            "pruned_points": total - evaluated,
+            "evaluated_points": evaluated,
+            "matched_points": len(results)
+        }
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(radius_result, JSON_INDENT)
+        )]
+    
+    elif name == "proximity_pairs":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        threshold_m = arguments.get("threshold_m")
+        method = arguments.get("method", "haversine")
+        unit = arguments.get("unit", "km")
+        max_pairs = arguments.get("max_pairs", DEFAULT_MAX_PAIRS)
+        
+        if not isinstance(threshold_m, (int, float)) or threshold_m <= 0:
+            raise ValueError("Eşik mesafesi (threshold_m) pozitif bir sayı olmalı")
+        
+        if not isinstance(max_pairs, int) or max_pairs < 1:
+            raise ValueError("max_pairs pozitif bir tam sayı olmalı")
+        
+        lats, lons, point_name = resolve_targets(arguments)
+        first, second, distances_km, stats = await executor.run(
+            executor.work_size(len(lats), method), proximity_pairs,
+            lats, lons, threshold_m / 1000, method, max_pairs
+        )
+        distances_converted, unit_name = convert_unit(distances_km, unit)
+        
+        proximity_result = {
+            "threshold_m": threshold_m,
+            "pairs": [
+                {
+                    "a": {"index": i, "name": point_name(i)},
+                    "b": {"index": j, "name": point_name(j)},
+                    "distance": round(d, 3)
+                }
+                for i, j, d in zip(first.tolist(), second.tolist(), distances_converted.tolist())
+            ],
+            "unit": unit_name,
+            "method": method,
+            "total_points": len(lats),
+            "compared_pairs": stats["compared_pairs"],
+            "matched_pairs": len(first),
+            "truncated": stats["truncated"]
+        }
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(proximity_result, JSON_INDENT)
+        )]
+    
+    elif name == "path_length":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        points = arguments.get("points")
+        path = arguments.get("path")
+        method = arguments.get("method", "haversine")
+        max_error_m = arguments.get("max_error_m", DEFAULT_MAX_ERROR_M)
+        unit = arguments.get("unit", "km")
+        options = {
+            "method": method,
+            "max_error_m": max_error_m,
+            "keep_cumulative": arguments.get("include_cumulative", True),
+            "keep_segments": arguments.get("include_segments", False)
+        }
+        
+        if not (points or path):
+            raise ValueError("Noktalar (points) veya dosya yolu (path) gerekli")
+        if points and path:
+            raise ValueError("points veya path'ten yalnızca biri verilmeli")
+        
+        if path:
+            path = resolve_import_path(path)
+            result = await executor.run(path.stat().st_size // 32, path_length_file,
+                                        path, arguments.get("format"), **options)
+        else:
+            lats, lons = parse_point_sequence(points)
+            result = await executor.run(executor.work_size(len(lats), method), path_length, lats, lons, **options)
+        if not result["points"]:
+            raise ValueError("Dosyada nokta bulunamadı")
+        
+        unit_factor, unit_name = convert_unit(1.0, unit)
+        path_result = {
+            "unit": unit_name,
+            "method": method,
+            "total_points": result["points"],
+            "total_segments": result["segments"],
+            "breaks": result["breaks"],
+            "total_distance": round(result["total_km"] * unit_factor, 3)
+        }
+        if "cumulative_km" in result:
+            path_result["cumulative"] = np.round(result["cumulative_km"] * unit_factor, 3).tolist()
+        if "segments_km" in result:
+            path_result["segments"] = np.round(result["segments_km"] * unit_factor, 3).tolist()
+        if method == "auto":
+            path_result["max_error_m"] = max_error_m
+            path_result["method_counts"] = result["method_counts"]
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(path_result)
+        )]
+    
+    elif name == "optimize_route":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        start_point = arguments.get("start_point")
+        method = arguments.get("method", "haversine")
+        unit = arguments.get("unit", "km")
+        return_to_start = bool(arguments.get("return_to_start", False))
+        time_limit_s = arguments.get("time_limit_s", DEFAULT_ROUTE_TIME_LIMIT_S)
+        
+        if not start_point:
+            raise ValueError("Başlangıç noktası (start_point) gerekli")
+        if method not in ("haversine", "vincenty"):
+            raise ValueError("method 'haversine' veya 'vincenty' olmalı")
+        if not isinstance(time_limit_s, (int, float)) or not 0 < time_limit_s <= MAX_ROUTE_TIME_LIMIT_S:
+            raise ValueError(f"Süre bütçesi (time_limit_s) 0 ile {MAX_ROUTE_TIME_LIMIT_S:g} saniye arasında olmalı")
+        
+        start_lat = start_point["lat"]
+        start_lon = start_point["lon"]
+        lats, lons, stop_name = resolve_targets(arguments)
+        result = await executor.run(executor.work_size(len(lats) ** 2, method), optimize_route,
+                                    start_lat, start_lon, lats, lons, method, return_to_start, time_limit_s)
+        
+        unit_factor, unit_name = convert_unit(1.0, unit)
+        legs = (result["legs_km"] * unit_factor).tolist()
+        cumulative = 0.0
+        route = []
+        for i, leg in zip(result["order"].tolist(), legs):
+            cumulative += leg
+            route.append({
+                "index": i,
+                "name": stop_name(i),
+                "distance": round(leg, 3),
+                "cumulative_distance": round(cumulative, 3)
+            })
+        
+        route_result = {
+            "start_point": {
+                "name": start_point.get("name", f"({start_lat}, {start_lon})"),
+                "coordinates": {"lat": start_lat, "lon": start_lon}
+            },
+            "route": route,
+            "unit": unit_name,
+            "method": method,
+            "total_stops": len(route),
+            "total_distance": round(result["total_km"] * unit_factor, 3),
+            "naive_distance": round(result["naive_km"] * unit_factor, 3),
+            "nearest_neighbor_distance": round(result["nearest_neighbor_km"] * unit_factor, 3),
+            "improvement_pct": result["improvement_pct"],
+            "converged": result["converged"]
+        }
+        if return_to_start:
+            route_result["return_distance"] = round(legs[-1], 3)
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(route_result, JSON_INDENT)
+        )]
+    
+    elif name == "register_geofence":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        fence_id = arguments.get("fence_id")
+        sources = [key for key in ("polygon", "geojson", "path") if arguments.get(key)]
+        
+        if not fence_id or not sources:
+            raise ValueError("Çit adı ve çokgen (polygon), GeoJSON (geojson) veya dosya yolu (path) gerekli")
+        if len(sources) > 1:
+            raise ValueError("polygon, geojson veya path'ten yalnızca biri verilmeli")
+        
+        registry = get_geofences()
+        if arguments.get("path"):
+            path = resolve_import_path(arguments["path"])
+            fence = await executor.run(path.stat().st_size // 32, registry.register_file, fence_id, path)
+        else:
+            if arguments.get("geojson"):
+                rings, source = geojson_rings(arguments["geojson"]), "geojson"
+            else:
+                rings, source = polygon_rings(arguments["polygon"], arguments.get("holes")), "polygon"
+            fence = await executor.run(sum(len(lats) for lats, _ in rings), registry.register,
+                                       fence_id, rings, source)
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(fence.describe(), JSON_INDENT)
+        )]
+    
+    elif name == "geofence_query":
+        if not arguments:
+            raise ValueError("Parametreler gerekli")
+        
+        fence_ids = arguments.get("fence_ids")
+        include_distance = arguments.get("include_distance", True)
+        unit = arguments.get("unit", "km")
+        
+        if not isinstance(fence_ids, list) or not fence_ids:
+            raise ValueError("Çit adları (fence_ids) boş olmayan bir liste olmalı")
+        
+        registry = get_geofences()
+        fences = []
+        for fence_id in fence_ids:
+            fence = registry.get(fence_id)
+            if fence is None:
+                raise ValueError(f"Kayıtlı çit bulunamadı: {fence_id}")
+            fences.append(fence)
+        
+        lats, lons, _ = resolve_targets(arguments)
+        unit_factor, unit_name = convert_unit(1.0, unit)
+        results = []
+        for fence in fences:
+            inside, distances_km = await executor.run(executor.work_size(len(lats)), fence.query,
+                                                      lats, lons, include_distance)
+            result = {"fence_id": fence.fence_id, "inside_count": int(inside.sum()), "inside": inside.tolist()}
+            if distances_km is not None:
+                result["distances"] = np.round(distances_km * unit_factor, 3).tolist()
+            results.append(result)
         
         return [types.TextContent(
             type="text",
-            text=json.dumps(batch_result, ensure_ascii=False, indent=2)
+            text=distjson.dumps({"total_points": len(lats), "unit": unit_name, "fences": results}, JSON_INDENT)
+        )]
+    
+    elif name == "cache_stats":
+        stats = distance_cache.stats()
+        
+        if arguments and arguments.get("clear"):
+            distance_cache.clear()
+        
+        return [types.TextContent(
+            type="text",
+            text=distjson.dumps(stats, JSON_INDENT)
         )]
     
     else:
         raise ValueError(f"Bilinmeyen tool: {name}")
 
 
-async def main():
+def initialization_options() -> InitializationOptions:
+    """Tüm taşımalarda ortak sunucu başlatma seçenekleri"""
+    return InitializationOptions(
+        server_name=SERVER_NAME,
+        server_version=SERVER_VERSION,
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={}
+        )
+    )
+
+
+async def run_stdio():
     # Stdin/stdout üzerinden MCP server çalıştır
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="distance-calculator",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={}
-                )
-            )
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, initialization_options())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def create_http_app(transport: str = "streamable-http", stateless: bool = False,
+                    json_response: bool = False):
+    """
+    Ağ taşıması için ASGI uygulaması oluşturur.
+    
+    Tüm MCP oturumları aynı süreçte çalışır; önbellek, kayıtlı nokta kümeleri ve
+    yürütücü havuzları oturumlar arasında paylaşılır. CPU yoğun işler yürütücü
+    üzerinden iş parçacığı/süreç havuzlarına dağıtıldığından çok çekirdekli
+    makinelerde olay döngüsü bloklanmaz.
+    
+    Args:
+        transport: 'streamable-http' (uç nokta /mcp) veya 'sse' (uç noktalar /sse ve /messages/)
+        stateless: Streamable HTTP'de oturum durumu tutulmaz; her istek bağımsızdır
+        json_response: Streamable HTTP yanıtları SSE akışı yerine düz JSON olarak döner
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+    
+    if transport == "sse":
+        from mcp.server.sse import SseServerTransport
+        
+        sse = SseServerTransport("/messages/")
+        
+        async def handle_sse(request):
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, initialization_options())
+            return Response()
+        
+        routes = [
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message)
+        ]
+        session_manager = None
+    elif transport == "streamable-http":
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+        
+        session_manager = StreamableHTTPSessionManager(
+            app=server, json_response=json_response, stateless=stateless
         )
+        
+        class StreamableHTTPEndpoint:
+            # Starlette düz ASGI uygulamalarını istek/yanıt işleyicisi olarak sarmaz
+            async def __call__(self, scope, receive, send):
+                await session_manager.handle_request(scope, receive, send)
+        
+        routes = [Route("/mcp", endpoint=StreamableHTTPEndpoint())]
+    else:
+        raise ValueError(f"Desteklenmeyen ağ taşıması: {transport}")
+    
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        try:
+            if session_manager is not None:
+                async with session_manager.run():
+                    yield
+            else:
+                yield
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kuş uçumu mesafe hesaplama MCP sunucusu")
+    parser.add_argument("--transport", choices=TRANSPORTS,
+                        default=os.environ.get("DIST_MCP_TRANSPORT", "stdio"),
+                        help="MCP taşıması (varsayılan stdio; DIST_MCP_TRANSPORT)")
+    parser.add_argument("--host", default=os.environ.get("DIST_MCP_HOST", DEFAULT_HOST),
+                        help="Ağ taşımasında dinlenecek adres (DIST_MCP_HOST)")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("DIST_MCP_PORT", DEFAULT_PORT)),
+                        help="Ağ taşımasında dinlenecek port (DIST_MCP_PORT)")
+    parser.add_argument("--stateless", action="store_true",
+                        default=os.environ.get("DIST_MCP_STATELESS", "0").lower() in ("1", "true", "yes"),
+                        help="Streamable HTTP'de oturumsuz mod (DIST_MCP_STATELESS)")
+    parser.add_argument("--json-response", action="store_true",
+                        help="Streamable HTTP yanıtlarını SSE yerine JSON olarak döndür")
+    args = parser.parse_args()
+    
+    if args.transport == "stdio":
+        asyncio.run(run_stdio())
+        return
+    
+    import uvicorn
+    
+    uvicorn.run(
+        create_http_app(args.transport, stateless=args.stateless, json_response=args.json_response),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Mesafe Sonuç Önbelleği
+Sık sorulan koordinat çiftleri için sınırlı boyutlu, süreç içi LRU önbellek.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_PRECISION = 6  # ondalık basamak (~0.1 m)
+
+
+class DistanceCache:
+    """
+    Kuantize edilmiş koordinatlarla anahtarlanan LRU mesafe önbelleği.
+
+    Anahtar (enlem1, boylam1, enlem2, boylam2, yöntem) değerlerinden oluşur ve
+    nokta sırasından bağımsızdır (A-B ile B-A aynı kaydı kullanır). Değerler
+    kilometre cinsinden saklanır; birim dönüşümü önbellekten sonra yapılır.
+    maxsize 0 ise önbellek devre dışıdır.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, precision: int = DEFAULT_CACHE_PRECISION):
+        if maxsize < 0:
+            raise ValueError("Önbellek boyutu negatif olamaz")
+        self.maxsize = maxsize
+        self.precision = precision
+        self._scale = 10 ** precision
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, lat1: float, lon1: float, lat2: float, lon2: float, method: str) -> tuple:
+        """Kuantize edilmiş, nokta sırasından bağımsız önbellek anahtarı"""
+        point1 = (round(lat1 * self._scale), round(lon1 * self._scale))
+        point2 = (round(lat2 * self._scale), round(lon2 * self._scale))
+        if point2 < point1:
+            point1, point2 = point2, point1
+        return point1 + point2 + (method,)
+
+    def lookup(self, lat1: float, lon1: float, lat2: float, lon2: float, method: str) -> Optional[float]:
+        """
+        Önbellekteki mesafeyi döndürür; yoksa None (isabet/kaçırma sayılır).
+
+        Returns:
+            Mesafe (kilometre) veya None
+        """
+        if not self.maxsize:
+            return None
+
+        key = self.key(lat1, lon1, lat2, lon2, method)
+        with self._lock:
+            distance_km = self._entries.get(key)
+            if distance_km is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return distance_km
+
+    def store(self, lat1: float, lon1: float, lat2: float, lon2: float, method: str,
+              distance_km: float) -> None:
+        """Hesaplanan mesafeyi saklar; boyut aşılırsa en eski kayıtları çıkarır"""
+        if not self.maxsize:
+            return
+
+        key = self.key(lat1, lon1, lat2, lon2, method)
+        with self._lock:
+            self._entries[key] = distance_km
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, lat1: float, lon1: float, lat2: float, lon2: float, method: str,
+                       compute: Callable[[float, float, float, float], float]) -> float:
+        """
+        Önbellekteki mesafeyi döndürür; yoksa compute ile hesaplayıp saklar.
+
+        Returns:
+            Mesafe (kilometre)
+        """
+        distance_km = self.lookup(lat1, lon1, lat2, lon2, method)
+        if distance_km is not None:
+            return distance_km
+
+        # Hesaplama kilit dışında yapılır; eşzamanlı aynı istekler en kötü ihtimalle
+        # aynı değeri iki kez yazar
+        distance_km = compute(lat1, lon1, lat2, lon2)
+        self.store(lat1, lon1, lat2, lon2, method, distance_km)
+        return distance_km
+
+    def clear(self) -> None:
+        """Tüm kayıtları ve sayaçları sıfırla"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """İsabet, kaçırma ve çıkarma sayaçlarını döndür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "precision": self.precision,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def cache_from_env() -> DistanceCache:
+    """
+    Ortam değişkenlerinden önbellek oluşturur.
+
+    - DIST_CACHE_SIZE: En fazla kayıt sayısı (0 = devre dışı)
+    - DIST_CACHE_PRECISION: Koordinat kuantizasyonu (ondalık basamak)
+    """
+    return DistanceCache(
+        maxsize=int(os.environ.get("DIST_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        precision=int(os.environ.get("DIST_CACHE_PRECISION", DEFAULT_CACHE_PRECISION))
+    )
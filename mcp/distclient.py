@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Kalıcı MCP İstemcisi
+Tek bir MCP oturumunu açık tutar, eşzamanlı tool çağrılarını bu oturum
+üzerinden paralel gönderir, bağlantı koparsa yeniden bağlanır ve gecikme
+istatistiklerini tutar.
+"""
+
+import asyncio
+import contextlib
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import anyio
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+
+# Bu hatalar oturumun kullanılamaz hale geldiğini gösterir; çağrı yeni bir
+# oturumla tekrarlanır. Tool'un kendi hataları (ValueError vb.) tekrarlanmaz.
+# Zaman aşımı (TimeoutError, OSError alt sınıfı olsa da) yalnızca o çağrının
+# hatasıdır: yavaş bir çağrı için oturumu kapatmak diğer çağrıları da keserdi.
+RECONNECT_ERRORS = (
+    ConnectionError,
+    EOFError,
+    OSError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+# Streamable HTTP sunucusu yeniden başlayıp oturum kimliğini tanımadığında
+# SDK'nın döndürdüğü hata kodu
+SESSION_TERMINATED = 32600
+
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_LATENCY_WINDOW = 10_000
+
+
+def is_disconnect(error: BaseException) -> bool:
+    """Hatanın tool'dan değil, oturumun kopmasından kaynaklanıp kaynaklanmadığı"""
+    if isinstance(error, McpError):
+        return error.error.code in (CONNECTION_CLOSED, SESSION_TERMINATED)
+    if isinstance(error, TimeoutError):
+        return False
+    return isinstance(error, RECONNECT_ERRORS)
+
+
+class SessionClient:
+    """
+    mcp SDK'sının ClientSession'ını fastmcp.Client ile aynı arayüze uyarlar:
+    `async with` ile bağlanır, call_tool(name, arguments) ile çağrı yapar.
+    """
+
+    def __init__(self, transport: Callable[[], Any]):
+        self._transport = transport
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+        self.session = None
+
+    @classmethod
+    def stdio(cls, script: Optional[Path] = None, *args: str) -> "SessionClient":
+        """dist.py'yi (veya verilen betiği) stdio alt süreci olarak başlatan istemci"""
+        from mcp import StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
+        script = script or Path(__file__).resolve().parent / "dist.py"
+        params = StdioServerParameters(command=sys.executable, args=[str(script), *args],
+                                       cwd=str(Path(script).parent))
+        return cls(lambda: stdio_client(params))
+
+    @classmethod
+    def http(cls, url: str) -> "SessionClient":
+        """Streamable HTTP uç noktasına (ör. http://127.0.0.1:8001/mcp) bağlanan istemci"""
+        try:
+            from mcp.client.streamable_http import streamable_http_client
+        except ImportError:  # eski mcp sürümleri
+            from mcp.client.streamable_http import streamablehttp_client as streamable_http_client
+        return cls(lambda: streamable_http_client(url))
+
+    async def __aenter__(self) -> "SessionClient":
+        from mcp import ClientSession
+
+        stack = contextlib.AsyncExitStack()
+        try:
+            streams = await stack.enter_async_context(self._transport())
+            self.session = await stack.enter_async_context(ClientSession(streams[0], streams[1]))
+            await self.session.initialize()
+        except BaseException:
+            await stack.aclose()
+            raise
+        self._stack = stack
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        stack, self._stack, self.session = self._stack, None, None
+        if stack is not None:
+            await stack.aclose()
+
+    async def call_tool(self, name: str, arguments: Optional[dict] = None):
+        return await self.session.call_tool(name, arguments or {})
+
+
+class PooledMCPClient:
+    """
+    Tek bir uzun ömürlü MCP oturumu üzerinden tool çağrısı yapan istemci.
+
+    - Oturum ilk çağrıda açılır ve close() edilene kadar açık kalır; her çağrı
+      bağlantı ve initialize maliyetini ödemez.
+    - Eşzamanlı call_tool çağrıları aynı oturum üzerinden paralel gönderilir
+      (JSON-RPC istek kimlikleriyle eşleşir); max_concurrency sınırı aşılırsa
+      çağrılar sırada bekler.
+    - Oturum koparsa (is_disconnect) tek bir yeniden bağlanma yapılır ve
+      çağrı en fazla retries kez tekrarlanır.
+    - stats() son latency_window çağrının gecikme yüzdeliklerini döndürür.
+
+    client_factory her çağrıldığında bağlanmamış yeni bir istemci döndürmelidir
+    (ör. `lambda: fastmcp.Client(mcp)` veya `lambda: SessionClient.http(url)`).
+    Oturumun bağlam yöneticisi, anyio iptal kapsamları görev değiştiremediği
+    için ayrı bir arka plan görevinde açılıp kapatılır.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any],
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 retries: int = 1,
+                 call_timeout: Optional[float] = None,
+                 latency_window: int = DEFAULT_LATENCY_WINDOW):
+        self.client_factory = client_factory
+        self.max_concurrency = max(1, max_concurrency)
+        self.retries = retries
+        self.call_timeout = call_timeout
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._connect_lock = asyncio.Lock()
+        self._client = None
+        self._owner: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._generation = 0
+        self.calls = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.in_flight = 0
+
+    async def __aenter__(self) -> "PooledMCPClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None and self._owner is not None and not self._owner.done()
+
+    async def connect(self) -> None:
+        """Oturum açık değilse açar"""
+        async with self._connect_lock:
+            if not self.connected:
+                await self._open()
+
+    async def close(self) -> None:
+        """Oturumu kapatır; sonraki çağrı yeniden bağlanır"""
+        async with self._connect_lock:
+            await self._shutdown()
+
+    async def _open(self) -> None:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        closing = asyncio.Event()
+        client = self.client_factory()
+
+        async def own_session():
+            try:
+                async with client:
+                    ready.set_result(None)
+                    await closing.wait()
+            except BaseException as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                elif not isinstance(e, Exception):
+                    raise
+
+        owner = asyncio.create_task(own_session())
+        await ready
+        self._client, self._owner, self._closing = client, owner, closing
+        self._generation += 1
+
+    async def _shutdown(self) -> None:
+        owner, closing = self._owner, self._closing
+        self._client = self._owner = self._closing = None
+        if owner is not None:
+            closing.set()
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(owner, timeout=5)
+
+    async def _session(self) -> tuple[Any, int]:
+        if not self.connected:
+            await self.connect()
+        return self._client, self._generation
+
+    async def _reconnect(self, generation: int) -> None:
+        async with self._connect_lock:
+            # Aynı kopukluğu gören diğer çağrılar zaten yeniden bağlandıysa tekrar etme
+            if generation != self._generation and self.connected:
+                return
+            await self._shutdown()
+            self.reconnects += 1
+            await self._open()
+
+    async def call_tool(self, name: str, arguments: Optional[dict] = None):
+        """
+        Tool'u açık oturum üzerinden çağırır.
+
+        Raises:
+            TimeoutError: Çağrı call_timeout içinde bitmezse; oturum ve diğer
+                çağrılar etkilenmez, çağrı tekrarlanmaz
+            Exception: Yeniden bağlanma denemeleri de başarısız olursa son bağlantı
+                hatası; tool'un veya istemcinin diğer hataları tekrarlanmadan iletilir
+        """
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                attempt = 0
+                while True:
+                    client, generation = await self._session()
+                    start = time.perf_counter()
+                    try:
+                        call = client.call_tool(name, arguments or {})
+                        if self.call_timeout is not None:
+                            result = await asyncio.wait_for(call, self.call_timeout)
+                        else:
+                            result = await call
+                    except Exception as e:
+                        self.errors += 1
+                        if not is_disconnect(e) or attempt >= self.retries:
+                            raise
+                        attempt += 1
+                        await self._reconnect(generation)
+                        continue
+                    finally:
+                        self._latencies.append(time.perf_counter() - start)
+                    self.calls += 1
+                    return result
+            finally:
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """Çağrı, hata ve yeniden bağlanma sayaçları ile gecikme yüzdelikleri (ms)"""
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> float:
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 3)
+
+        return {
+            "connected": self.connected,
+            "calls": self.calls,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "in_flight": self.in_flight,
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 3)
+            } if latencies else None
+        }
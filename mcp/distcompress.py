@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Yanıt Sıkıştırma
+Accept-Encoding başlığına göre büyük yanıtları brotli (brotli paketi yüklüyse)
+veya gzip ile sıkıştıran saf ASGI ara katmanı. Akış yanıtları (NDJSON) parça
+parça sıkıştırılır; küçük yanıtlar ve zaten sıkıştırılmış ya da ham ikili
+içerik olduğu gibi gönderilir.
+"""
+
+import os
+import zlib
+from typing import Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # opsiyonel bağımlılık
+    brotli = None
+
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+# Yalnızca bu türler sıkıştırılır; ham float64 gövdeler neredeyse hiç küçülmez
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def accepted_encodings(header: Optional[str]) -> set[str]:
+    """Accept-Encoding başlığındaki (q=0 olmayan) kodlamalar"""
+    encodings = set()
+    for part in (header or "").split(","):
+        name, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.lower())
+    return encodings
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    İstemcinin kabul ettiği en iyi kodlamayla (br > gzip) yanıtı sıkıştırır.
+
+    Tek parçalı yanıtlar min_size baytın altındaysa sıkıştırılmaz. Akış
+    yanıtlarında her parça sıkıştırılıp hemen gönderilir (sync flush), böylece
+    istemci satırları gecikmeden alır.
+    """
+
+    def __init__(self, app, min_size: int = DEFAULT_MIN_SIZE,
+                 gzip_level: int = DEFAULT_GZIP_LEVEL,
+                 brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+                 compressible_types: Sequence[str] = COMPRESSIBLE_TYPES):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compressible_types = tuple(compressible_types)
+
+    def _choose(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accepted = accepted_encodings(value.decode("latin-1"))
+                if brotli is not None and "br" in accepted:
+                    return "br"
+                if "gzip" in accepted:
+                    return "gzip"
+                return None
+        return None
+
+    def _compressor(self, encoding: str):
+        return _Brotli(self.brotli_quality) if encoding == "br" else _Gzip(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        encoding = self._choose(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = {name.lower(): value for name, value in start_message.get("headers", ())}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if (b"content-encoding" in headers
+                        or not content_type.startswith(self.compressible_types)
+                        or (not more_body and len(body) < self.min_size)):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = self._compressor(encoding)
+                vary = headers.get(b"vary")
+                headers = [(name, value) for name, value in start_message.get("headers", ())
+                           if name.lower() not in (b"content-length", b"vary")]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+                if not more_body:
+                    compressed = compressor.compress(body) + compressor.finish()
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start_message, "headers": headers})
+                    await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                    return
+                await send({**start_message, "headers": headers})
+
+            data = compressor.compress(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def compression_options_from_env() -> dict:
+    """
+    Ortam değişkenlerinden sıkıştırma ayarları.
+
+    - DIST_COMPRESS_MIN_SIZE: Bu boyutun (bayt) altındaki yanıtlar sıkıştırılmaz (0'dan küçükse kapalı)
+    - DIST_COMPRESS_GZIP_LEVEL: gzip seviyesi (1-9)
+    - DIST_COMPRESS_BROTLI_QUALITY: brotli kalitesi (0-11)
+    """
+    return {
+        "min_size": int(os.environ.get("DIST_COMPRESS_MIN_SIZE", DEFAULT_MIN_SIZE)),
+        "gzip_level": int(os.environ.get("DIST_COMPRESS_GZIP_LEVEL", DEFAULT_GZIP_LEVEL)),
+        "brotli_quality": int(os.environ.get("DIST_COMPRESS_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY))
+    }
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Ortak Sabitler
+Tool şemalarında ve istek doğrulamasında kullanılan varsayılanlar. NumPy
+gerektirmez; böylece dist.py ağır modülleri yüklemeden şemaları oluşturabilir.
+"""
+
+
+# "auto" yönteminde varsayılan hata bütçesi (metre)
+DEFAULT_MAX_ERROR_M = 1.0
+
+# distvec.auto_distance_array'in döndürdüğü yöntem indeksleri
+AUTO_METHODS = ("flat", "haversine", "vincenty")
+
+# Matris karo hesabı için varsayılan ara bellek sınırı (MB)
+DEFAULT_MATRIX_MEMORY_MB = 256.0
+
+# Yoğun (dense) çıktıda izin verilen en fazla hücre; daha büyük matrisler için
+# max_distance ile seyrek çıktı kullanılmalı
+DENSE_MATRIX_MAX_CELLS = 1_000_000
+
+# proximity_pairs'te varsayılan en fazla sonuç çifti sayısı
+DEFAULT_MAX_PAIRS = 100_000
+
+# optimize_route: varsayılan ve en fazla süre bütçesi (saniye) ile en fazla durak sayısı.
+# Mesafe matrisi (durak + 2)² hücredir; 5000 durakta ~200 MB
+DEFAULT_ROUTE_TIME_LIMIT_S = 2.0
+MAX_ROUTE_TIME_LIMIT_S = 60.0
+MAX_ROUTE_STOPS = 5000
+
+# Nokta kümesi ve çit adları yüzde kodlanarak (quote) dosya/dizin adı olur; kodlanmış
+# adın en fazla uzunluğu (bayt). Dosya adı sınırı 255 bayttır; kalan pay çit
+# dosyalarının .json ve geçici dosya son ekleri içindir
+MAX_STORED_NAME_BYTES = 200
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Mesafe Hesaplama Yürütücüsü
+CPU yoğun mesafe işlerini asyncio olay döngüsünün dışına taşır: küçük işler
+satır içinde, orta boy işler iş parçacığı havuzunda, büyük toplu işler ise
+çekirdeklere bölünerek süreç havuzunda çalıştırılır.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from distvec import auto_distance_array, distance_array
+
+
+# Eleman başına göreli maliyet; eşikler bu ağırlıkla çarpılmış iş miktarına uygulanır
+# ("auto" için en kötü durumdan ucuz, düzlem ağırlıklı iş yükünden pahalı bir tahmin)
+METHOD_COST = {"flat": 1, "haversine": 1, "auto": 3, "vincenty": 8}
+
+DEFAULT_INLINE_THRESHOLD = 2_000
+DEFAULT_PROCESS_THRESHOLD = 400_000
+DEFAULT_MIN_CHUNK_SIZE = 25_000
+
+
+class DistanceExecutor:
+    """
+    Boyut eşiklerine göre işi satır içi, iş parçacığı veya süreç havuzuna yönlendirir.
+
+    - iş < inline_threshold: olay döngüsünde doğrudan çalışır (havuz yükü yok)
+    - iş < process_threshold: iş parçacığı havuzunda çalışır (NumPy GIL'i bırakır)
+    - diğer durumlar: hedefler parçalara bölünüp süreç havuzuna dağıtılır,
+      sonuçlar giriş sırasıyla birleştirilir
+
+    Havuzlar ilk ihtiyaç anında oluşturulur; process_workers 0 ise süreç havuzu
+    hiç kullanılmaz.
+    """
+
+    def __init__(self,
+                 inline_threshold: int = DEFAULT_INLINE_THRESHOLD,
+                 process_threshold: int = DEFAULT_PROCESS_THRESHOLD,
+                 thread_workers: Optional[int] = None,
+                 process_workers: Optional[int] = None,
+                 min_chunk_size: int = DEFAULT_MIN_CHUNK_SIZE):
+        self.inline_threshold = inline_threshold
+        self.process_threshold = process_threshold
+        self.thread_workers = thread_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.process_workers = (os.cpu_count() or 1) if process_workers is None else process_workers
+        self.min_chunk_size = max(1, min_chunk_size)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _threads(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="distance"
+                )
+            return self._thread_pool
+
+    def _processes(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # fork, çok iş parçacıklı sunucu süreçlerinde güvenli olmadığından spawn
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+
+    def work_size(self, n: int, method: str = "haversine") -> int:
+        """Eleman sayısını yönteme göre ağırlıklandırılmış iş miktarına çevirir"""
+        return n * METHOD_COST.get(method, METHOD_COST["vincenty"])
+
+    async def run(self, work: int, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Genel bir CPU işini boyutuna göre satır içinde veya iş parçacığı havuzunda çalıştırır.
+
+        Args:
+            work: Ağırlıklandırılmış iş miktarı (bkz. work_size)
+            func: Çalıştırılacak fonksiyon
+        """
+        if work < self.inline_threshold:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads(), partial(func, *args, **kwargs))
+
+    def _use_processes(self, n: int, work: int) -> bool:
+        return work >= self.process_threshold and self.process_workers >= 1 and n >= 2 * self.min_chunk_size
+
+    async def _map_chunks(self, func: Callable[..., Any], ref_lat, ref_lon,
+                          lats: np.ndarray, lons: np.ndarray, *args) -> list:
+        """
+        Hedefleri parçalara bölüp süreç havuzunda çalıştırır; sonuçlar giriş sırasıyla döner.
+        Referans koordinatlar da dizi ise (çift çift hesaplama) aynı sınırlarla bölünür.
+        """
+        n = int(np.size(lats))
+        chunks = max(1, min(self.process_workers, n // self.min_chunk_size))
+        bounds = np.linspace(0, n, chunks + 1, dtype=np.int64)
+        loop = asyncio.get_running_loop()
+        pool = self._processes()
+
+        def part(values, start, end):
+            return values[start:end] if np.ndim(values) else values
+
+        return await asyncio.gather(*(
+            loop.run_in_executor(pool, func, part(ref_lat, start, end), part(ref_lon, start, end),
+                                 lats[start:end], lons[start:end], *args)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ))
+
+    async def distance_array(self, ref_lat, ref_lon, lats: np.ndarray, lons: np.ndarray,
+                             method: str = "haversine") -> np.ndarray:
+        """
+        Referans noktadan hedef dizilerine mesafeleri hesaplar (kilometre).
+        ref_lat/ref_lon hedeflerle aynı uzunlukta diziler de olabilir (çift çift hesaplama).
+
+        Büyük dizilerde hedefler çekirdek sayısı kadar parçaya bölünüp süreç
+        havuzunda paralel hesaplanır ve sonuçlar giriş sırasıyla birleştirilir.
+        """
+        n = int(np.size(lats))
+        work = self.work_size(n, method)
+        if not self._use_processes(n, work):
+            return await self.run(work, distance_array, ref_lat, ref_lon, lats, lons, method)
+
+        parts = await self._map_chunks(distance_array, ref_lat, ref_lon, lats, lons, method)
+        return np.concatenate(parts)
+
+    async def auto_distance_array(self, ref_lat, ref_lon, lats: np.ndarray, lons: np.ndarray,
+                                  max_error_m: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        distance_array'in "auto" karşılığı; hata bütçesine göre yöntem seçer.
+
+        Returns:
+            (mesafeler (km), eleman başına distvec.AUTO_METHODS indeksleri)
+        """
+        n = int(np.size(lats))
+        work = self.work_size(n, "auto")
+        if not self._use_processes(n, work):
+            return await self.run(work, auto_distance_array, ref_lat, ref_lon, lats, lons, max_error_m)
+
+        parts = await self._map_chunks(auto_distance_array, ref_lat, ref_lon, lats, lons, max_error_m)
+        return (np.concatenate([distances for distances, _ in parts]),
+                np.concatenate([methods for _, methods in parts]))
+
+    def shutdown(self) -> None:
+        """Havuzları kapat"""
+        with self._lock:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+
+
+def executor_from_env() -> DistanceExecutor:
+    """
+    Ortam değişkenlerinden yürütücü oluşturur.
+
+    - DIST_EXEC_INLINE_THRESHOLD: Bu iş miktarının altı olay döngüsünde çalışır
+    - DIST_EXEC_PROCESS_THRESHOLD: Bu iş miktarından itibaren süreç havuzu kullanılır
+    - DIST_EXEC_THREADS: İş parçacığı havuzu boyutu
+    - DIST_EXEC_PROCESSES: Süreç havuzu boyutu (0 = süreç havuzu kapalı)
+    - DIST_EXEC_MIN_CHUNK: Süreç havuzuna gönderilen en küçük parça boyutu
+    """
+    env = os.environ
+    return DistanceExecutor(
+        inline_threshold=int(env.get("DIST_EXEC_INLINE_THRESHOLD", DEFAULT_INLINE_THRESHOLD)),
+        process_threshold=int(env.get("DIST_EXEC_PROCESS_THRESHOLD", DEFAULT_PROCESS_THRESHOLD)),
+        thread_workers=int(env["DIST_EXEC_THREADS"]) if "DIST_EXEC_THREADS" in env else None,
+        process_workers=int(env["DIST_EXEC_PROCESSES"]) if "DIST_EXEC_PROCESSES" in env else None,
+        min_chunk_size=int(env.get("DIST_EXEC_MIN_CHUNK", DEFAULT_MIN_CHUNK_SIZE))
+    )
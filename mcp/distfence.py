@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Coğrafi Çitler (Geofence)
+Hizmet bölgesi gibi çokgenleri bir kez kaydeder ve her süreçte bir kez
+hazırlanmış yapılara çevirir; ardından büyük nokta gruplarının çokgen içinde
+olup olmadığını ve çokgen sınırına büyük daire mesafesini hesaplar.
+
+Çokgen kenarları büyük daire yaylarıdır; delikler ve çoklu çokgenler çift-tek
+kuralıyla desteklenir, 180. boylamı kesen çokgenler de çalışır. Kutup içeren
+çokgenler desteklenmez.
+
+Hazırlanmış yapı:
+- Sınırlayıcı kutu (yay şişkinlikleri dahil): kutu dışındaki noktalar kenar
+  testine girmez.
+- İçerme için boylam dilimleri: her dilim yalnızca o boylam aralığına uzanan
+  kenarları tutar; nokta yalnızca kendi dilimindeki kenarlarla sayılır.
+- Sınır mesafesi için kenar yayları üzerinde Ball Tree (birim küre): nokta
+  grubu ağaçta birlikte ilerler, alt sınırı en iyi adaydan büyük düğümler budanır.
+
+Depo düzeni (kök: DIST_GEOFENCES_DIR): her çit <çit>.json dosyasıdır ve
+atomik olarak değiştirilir; hazırlanmış yapı süreç içinde önbellekte tutulur.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import quote
+
+import numpy as np
+
+from distconst import MAX_STORED_NAME_BYTES
+from distindex import to_unit_vectors
+from distvec import coordinate_arrays, haversine_array
+
+
+DEFAULT_ROOT = Path(__file__).resolve().parent / "geofences"
+DEFAULT_LEAF_SIZE = 16
+# İçerme indeksindeki en fazla boylam dilimi
+MAX_LON_BINS = 4096
+# Bir vektörel adımda işlenen en fazla nokta
+QUERY_CHUNK = 65_536
+# Yay üzerindeki izdüşüm ve dejenere kenar testleri için sınır
+_EPSILON = 1e-15
+
+
+def _wrap(lons) -> np.ndarray:
+    """Boylam farklarını [-180, 180) aralığına getirir"""
+    return (np.asarray(lons) + 180.0) % 360.0 - 180.0
+
+
+def parse_ring(points) -> tuple[np.ndarray, np.ndarray]:
+    """
+    [[lat, lon], ...] halkasını dizilere çevirir. Kapanış noktası (ilk noktanın
+    tekrarı) varsa atılır; ardışık tekrar eden köşeler birleştirilir.
+
+    Raises:
+        ValueError: Halka 3'ten az farklı köşe içeriyorsa veya koordinatlar geçersizse
+    """
+    try:
+        coords = np.array(points, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Halka [lat, lon] çiftlerinden oluşmalı")
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError("Halka [lat, lon] çiftlerinden oluşmalı")
+    lats, lons = coords[:, 0], coords[:, 1]
+    if not (np.all(np.abs(lats) <= 90) and np.all(np.abs(lons) <= 180)):
+        raise ValueError("Çokgen köşeleri geçerli enlem/boylam aralığında olmalı")
+    keep = np.ones(lats.size, dtype=bool)
+    keep[1:] = (lats[1:] != lats[:-1]) | (lons[1:] != lons[:-1])
+    lats, lons = lats[keep], lons[keep]
+    if lats.size > 1 and lats[0] == lats[-1] and lons[0] == lons[-1]:
+        lats, lons = lats[:-1], lons[:-1]
+    if lats.size < 3:
+        raise ValueError("Her halka en az 3 farklı köşe içermeli")
+    return np.ascontiguousarray(lats), np.ascontiguousarray(lons)
+
+
+def polygon_rings(polygon, holes=None) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Dış halka ve isteğe bağlı delikler ([lat, lon] listeleri) → halka dizileri"""
+    return [parse_ring(ring) for ring in [polygon, *(holes or [])]]
+
+
+def geojson_rings(obj) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    GeoJSON Polygon/MultiPolygon geometrisi, Feature veya FeatureCollection
+    halkalarını ([lon, lat] sırasıyla) halka dizilerine çevirir.
+    """
+    if not isinstance(obj, dict):
+        raise ValueError("GeoJSON bir nesne olmalı")
+    kind = obj.get("type")
+    if kind == "FeatureCollection":
+        rings = [ring for feature in obj.get("features") or [] for ring in geojson_rings(feature)]
+    elif kind == "Feature":
+        rings = geojson_rings(obj.get("geometry") or {})
+    elif kind == "Polygon":
+        rings = [parse_ring([[c[1], c[0]] for c in ring]) for ring in obj.get("coordinates") or []]
+    elif kind == "MultiPolygon":
+        rings = [parse_ring([[c[1], c[0]] for c in ring])
+                 for polygon in obj.get("coordinates") or [] for ring in polygon]
+    else:
+        raise ValueError(f"Desteklenmeyen GeoJSON türü: {kind} (Polygon, MultiPolygon, Feature, FeatureCollection)")
+    if not rings:
+        raise ValueError("GeoJSON çokgen içermiyor")
+    return rings
+
+
+def _closest_on_arcs(points: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                     normals: np.ndarray) -> np.ndarray:
+    """
+    Her noktanın karşılık gelen büyük daire yayı (starts → ends) üzerindeki en
+    yakın noktası (birim vektör). İzdüşüm yayın dışına düşerse en yakın uç alınır.
+    """
+    norm2 = (normals * normals).sum(axis=1)
+    scale = np.divide((points * normals).sum(axis=1), norm2, out=np.zeros(len(points)), where=norm2 > _EPSILON)
+    projected = points - scale[:, None] * normals
+    length = np.sqrt((projected * projected).sum(axis=1))
+    closest = projected / np.maximum(length, _EPSILON)[:, None]
+    within = ((np.cross(starts, closest) * normals).sum(axis=1) >= 0) & \
+             ((np.cross(closest, ends) * normals).sum(axis=1) >= 0) & \
+             (norm2 > _EPSILON) & (length > _EPSILON)
+    to_start = ((points - starts) ** 2).sum(axis=1)
+    to_end = ((points - ends) ** 2).sum(axis=1)
+    endpoint = np.where((to_start <= to_end)[:, None], starts, ends)
+    return np.where(within[:, None], closest, endpoint)
+
+
+def _pair_positions(starts: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Her satır için [start, start + count) aralığını açar: (satır, konum) çiftleri"""
+    owners = np.repeat(np.arange(counts.size), counts)
+    offsets = np.arange(owners.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, starts[owners] + offsets
+
+
+class Geofence:
+    """
+    Bir çitin hazırlanmış hali. rings açık halkalardır (son köşe ilkine bağlanır).
+    contains() ve boundary_distance() nokta dizileri üzerinde vektörel çalışır.
+    """
+
+    def __init__(self, fence_id: str, rings: Sequence[tuple[np.ndarray, np.ndarray]],
+                 source: Optional[str] = None, created: Optional[str] = None,
+                 leaf_size: int = DEFAULT_LEAF_SIZE):
+        if not rings:
+            raise ValueError("Çit en az bir halka içermeli")
+        self.fence_id = fence_id
+        self.rings = [(np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+                      for lats, lons in rings]
+        self.source = source
+        self.created = created
+
+        a_lats = np.concatenate([lats for lats, _ in self.rings])
+        a_lons = np.concatenate([lons for _, lons in self.rings])
+        b_lats = np.concatenate([np.roll(lats, -1) for lats, _ in self.rings])
+        b_lons = np.concatenate([np.roll(lons, -1) for _, lons in self.rings])
+        self._a_lons = a_lons
+        self._dlon = _wrap(b_lons - a_lons)
+        self._starts = to_unit_vectors(a_lats, a_lons)
+        self._ends = to_unit_vectors(b_lats, b_lons)
+        self._normals = np.cross(self._starts, self._ends)
+
+        self._prepare_bounds(a_lats, a_lons)
+        self._prepare_lon_bins()
+        self._prepare_edge_tree(max(1, int(leaf_size)))
+
+    def __len__(self) -> int:
+        """Kenar (köşe) sayısı"""
+        return int(self._dlon.size)
+
+    def _prepare_bounds(self, a_lats: np.ndarray, a_lons: np.ndarray) -> None:
+        """Sınırlayıcı kutu: boylam aralığı çitin ortasına göre, enlem aralığı yay şişkinlikleriyle"""
+        def extents(ref_lon: float) -> tuple[np.ndarray, np.ndarray]:
+            rel = _wrap(a_lons - ref_lon)
+            return np.minimum(rel, rel + self._dlon), np.maximum(rel, rel + self._dlon)
+
+        # Referans boylam önce ilk köşe, sonra çitin boylam aralığının ortası
+        low, high = extents(float(a_lons[0]))
+        self.ref_lon = float(_wrap(a_lons[0] + (low.min() + high.max()) / 2))
+        low, high = extents(self.ref_lon)
+        if high.max() - low.min() >= 360:
+            raise ValueError("Çitin boylam genişliği 360°'den küçük olmalı")
+        self._edge_low, self._edge_high = low, high
+        self.rel_lon_min, self.rel_lon_max = float(low.min()), float(high.max())
+
+        # Büyük daire yayı kuzeye/güneye şişebilir: çemberin en kuzey noktası yay üzerindeyse hesaba kat
+        unit = self._normals / np.maximum(np.linalg.norm(self._normals, axis=1), _EPSILON)[:, None]
+        apex = np.array([0.0, 0.0, 1.0]) - unit[:, 2:3] * unit
+        apex /= np.maximum(np.linalg.norm(apex, axis=1), _EPSILON)[:, None]
+        z = [self._starts[:, 2], self._ends[:, 2]]
+        for sign in (1.0, -1.0):
+            point = sign * apex
+            on_arc = ((np.cross(self._starts, point) * self._normals).sum(axis=1) >= 0) & \
+                     ((np.cross(point, self._ends) * self._normals).sum(axis=1) >= 0)
+            z.append(np.where(on_arc, point[:, 2], self._starts[:, 2]))
+        z = np.concatenate(z)
+        self.lat_min = float(np.degrees(np.arcsin(np.clip(z.min(), -1, 1))))
+        self.lat_max = float(np.degrees(np.arcsin(np.clip(z.max(), -1, 1))))
+
+    def _prepare_lon_bins(self) -> None:
+        """Boylam dilimi → o dilime uzanan kenarlar (CSR dizileri)"""
+        self._bin_count = int(np.clip(len(self), 1, MAX_LON_BINS))
+        width = max(self.rel_lon_max - self.rel_lon_min, 1e-12) / self._bin_count
+        self._bin_width = width
+        first = np.clip(((self._edge_low - self.rel_lon_min) / width).astype(np.int64), 0, self._bin_count - 1)
+        last = np.clip(((self._edge_high - self.rel_lon_min) / width).astype(np.int64), 0, self._bin_count - 1)
+        edges, bins = _pair_positions(first, last - first + 1)
+        order = np.argsort(bins, kind="stable")
+        self._bin_edges = edges[order]
+        self._bin_starts = np.searchsorted(bins[order], np.arange(self._bin_count))
+        self._bin_sizes = np.bincount(bins, minlength=self._bin_count)
+
+    def _prepare_edge_tree(self, leaf_size: int) -> None:
+        """Kenar yayları üzerinde Ball Tree; her yay uç noktalarının kirişini çap alan kürenin içindedir"""
+        centers = (self._starts + self._ends) / 2
+        radii = np.linalg.norm(self._ends - self._starts, axis=1) / 2 + 1e-12
+        order = np.arange(len(self))
+
+        node_starts, node_ends, node_centers, node_radii, children = [], [], [], [], []
+        stack = [(0, len(self), -1, 0)]
+        while stack:
+            start, end, parent, side = stack.pop()
+            node = len(node_starts)
+            if parent >= 0:
+                children[parent][side] = node
+            members = order[start:end]
+            points = centers[members]
+            center = points.mean(axis=0)
+            node_starts.append(start)
+            node_ends.append(end)
+            node_centers.append(center)
+            node_radii.append(float((np.linalg.norm(points - center, axis=1) + radii[members]).max()))
+            children.append([-1, -1])
+            if end - start <= leaf_size:
+                continue
+            axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+            mid = (end - start) // 2
+            order[start:end] = members[np.argpartition(points[:, axis], mid)]
+            stack.append((start + mid, end, node, 1))
+            stack.append((start, start + mid, node, 0))
+
+        # Yaprak testi için kenar başına önceden hesaplanan vektörler (satır düzeninde, ağaç sırasıyla):
+        # A, B, birim normal n, n x A ve B x n. P, A-B yayının izdüşüm aralığındaysa
+        # P·(n x A) >= 0 ve P·(B x n) >= 0 olur; böylece testte çapraz çarpım gerekmez.
+        starts, ends, normals = self._starts[order], self._ends[order], self._normals[order]
+        length = np.linalg.norm(normals, axis=1)
+        valid = length > _EPSILON
+        unit = normals / np.where(valid, length, 1.0)[:, None]
+        self._edge_order = order
+        self._edge_data = np.ascontiguousarray(np.vstack((
+            starts.T, ends.T, unit.T, np.cross(unit, starts).T, np.cross(ends, unit).T, valid[None, :]
+        )))
+        self._node_starts = np.array(node_starts, dtype=np.int64)
+        self._node_sizes = np.array(node_ends, dtype=np.int64) - self._node_starts
+        self._node_centers = np.array(node_centers)
+        self._node_radii = np.array(node_radii)
+        self._children = np.array(children, dtype=np.int64)
+
+    def contains(self, lats, lons) -> np.ndarray:
+        """Noktaların çit içinde olup olmadığı (kuzeye ışın, çift-tek kuralı)"""
+        lats, lons = coordinate_arrays(lats, lons)
+        inside = np.zeros(lats.size, dtype=bool)
+        rel = _wrap(lons - self.ref_lon)
+        candidates = np.nonzero((lats >= self.lat_min) & (lats <= self.lat_max) &
+                                (rel >= self.rel_lon_min) & (rel <= self.rel_lon_max))[0]
+        for chunk in range(0, candidates.size, QUERY_CHUNK):
+            points = candidates[chunk:chunk + QUERY_CHUNK]
+            bins = np.clip(((rel[points] - self.rel_lon_min) / self._bin_width).astype(np.int64),
+                           0, self._bin_count - 1)
+            owners, positions = _pair_positions(self._bin_starts[bins], self._bin_sizes[bins])
+            edges = self._bin_edges[positions]
+            offset = _wrap(lons[points[owners]] - self._a_lons[edges])
+            dlon = self._dlon[edges]
+            spans = ((dlon > 0) & (offset >= 0) & (offset < dlon)) | ((dlon < 0) & (offset >= dlon) & (offset < 0))
+            owners, edges = owners[spans], edges[spans]
+            # Meridyen yarım çemberi kenarın çemberini bir kez keser: nokta güney kutbu
+            # tarafındaysa kesişim noktanın kuzeyindedir
+            vectors = to_unit_vectors(lats[points[owners]], lons[points[owners]])
+            normals = self._normals[edges]
+            north = (vectors * normals).sum(axis=1) * normals[:, 2] < 0
+            crossings = np.bincount(owners[north], minlength=points.size)
+            inside[points] = crossings % 2 == 1
+        return inside
+
+    def _leaf_distances(self, vectors: np.ndarray, points: np.ndarray, leaves: np.ndarray,
+                        best: np.ndarray, best_edge: np.ndarray) -> None:
+        """Yaprak kenarlarına kesin kiriş karelerini hesaplar, daha iyi olanları best/best_edge'e yazar"""
+        owners, positions = _pair_positions(self._node_starts[leaves], self._node_sizes[leaves])
+        owners = points[owners]
+        x, y, z = vectors[:, owners]
+        data = self._edge_data[:, positions]
+        # Uç noktalara kiriş kareleri
+        to_start = (x - data[0]) ** 2 + (y - data[1]) ** 2 + (z - data[2]) ** 2
+        to_end = (x - data[3]) ** 2 + (y - data[4]) ** 2 + (z - data[5]) ** 2
+        # Büyük daireye kiriş karesi: 2 - 2 cos θ = 2 s² / (1 + cos θ), s = sin θ = P·n (sadeleşmesiz)
+        sine = x * data[6] + y * data[7] + z * data[8]
+        across = 2 * sine * sine / (1 + np.sqrt(np.maximum(1 - sine * sine, 0)))
+        within = (x * data[9] + y * data[10] + z * data[11] >= 0) & \
+                 (x * data[12] + y * data[13] + z * data[14] >= 0) & (data[15] > 0)
+        distances = np.where(within, across, np.minimum(to_start, to_end))
+
+        np.minimum.at(best, owners, distances)
+        winners = distances == best[owners]
+        best_edge[owners[winners]] = positions[winners]
+
+    def closest_points(self, lats, lons) -> tuple[np.ndarray, np.ndarray]:
+        """Her noktaya sınır üzerindeki en yakın noktanın (enlem, boylam) dizileri"""
+        lats, lons = coordinate_arrays(lats, lons)
+        closest = np.zeros((lats.size, 3))
+        for chunk in range(0, lats.size, QUERY_CHUNK):
+            part = slice(chunk, chunk + QUERY_CHUNK)
+            vectors = to_unit_vectors(lats[part], lons[part])
+            edges = self._edge_order[self._nearest_edges(np.ascontiguousarray(vectors.T))]
+            closest[part] = _closest_on_arcs(vectors, self._starts[edges], self._ends[edges], self._normals[edges])
+        return (np.degrees(np.arcsin(np.clip(closest[:, 2], -1, 1))),
+                np.degrees(np.arctan2(closest[:, 1], closest[:, 0])))
+
+    def _node_bounds(self, vectors: np.ndarray, points: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Noktalardan düğüm kürelerine en küçük kiriş mesafesi (negatifse nokta küre içinde)"""
+        x, y, z = vectors[:, points]
+        centers = self._node_centers[nodes]
+        return np.sqrt((x - centers[:, 0]) ** 2 + (y - centers[:, 1]) ** 2 + (z - centers[:, 2]) ** 2) - \
+            self._node_radii[nodes]
+
+    def _nearest_edges(self, vectors: np.ndarray) -> np.ndarray:
+        """(3, n) birim vektörler için en yakın kenarın ağaç sırasındaki konumu"""
+        n = vectors.shape[1]
+        best = np.full(n, np.inf)
+        best_edge = np.zeros(n, dtype=np.int64)
+        everyone = np.arange(n)
+
+        # Açgözlü iniş: her nokta alt sınırı küçük olan çocuğa iner; ilk yaprak üst sınırı verir
+        nodes = np.zeros(n, dtype=np.int64)
+        while True:
+            internal = np.nonzero(self._children[nodes, 0] >= 0)[0]
+            if not internal.size:
+                break
+            left, right = self._children[nodes[internal]].T
+            closer = self._node_bounds(vectors, internal, left) <= self._node_bounds(vectors, internal, right)
+            nodes[internal] = np.where(closer, left, right)
+        first_leaf = nodes
+        self._leaf_distances(vectors, everyone, first_leaf, best, best_edge)
+
+        # Budamalı genişlik öncelikli arama: tüm noktalar ağaçta birlikte ilerler
+        points, nodes = everyone, np.zeros(n, dtype=np.int64)
+        while points.size:
+            bound = self._node_bounds(vectors, points, nodes)
+            keep = ((bound <= 0) | (bound * bound <= best[points])) & (nodes != first_leaf[points])
+            points, nodes = points[keep], nodes[keep]
+            leaf = self._children[nodes, 0] < 0
+            if leaf.any():
+                self._leaf_distances(vectors, points[leaf], nodes[leaf], best, best_edge)
+            points, nodes = np.repeat(points[~leaf], 2), self._children[nodes[~leaf]].reshape(-1)
+        return best_edge
+
+    def boundary_distance(self, lats, lons) -> np.ndarray:
+        """Noktaların çit sınırına büyük daire mesafesi (km, Haversine)"""
+        lats, lons = coordinate_arrays(lats, lons)
+        closest_lats, closest_lons = self.closest_points(lats, lons)
+        return haversine_array(lats, lons, closest_lats, closest_lons)
+
+    def query(self, lats, lons, distance: bool = True) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """(içeride mi, sınıra mesafe (km) veya None)"""
+        inside = self.contains(lats, lons)
+        return inside, self.boundary_distance(lats, lons) if distance else None
+
+    def describe(self) -> dict:
+        return {
+            "fence_id": self.fence_id,
+            "rings": len(self.rings),
+            "vertices": len(self),
+            "bbox": {
+                "min_lat": round(self.lat_min, 6),
+                "max_lat": round(self.lat_max, 6),
+                "min_lon": round(float(_wrap(self.ref_lon + self.rel_lon_min)), 6),
+                "max_lon": round(float(_wrap(self.ref_lon + self.rel_lon_max)), 6)
+            },
+            "source": self.source,
+            "created": self.created
+        }
+
+
+class GeofenceRegistry:
+    """
+    Çit deposu. Hazırlanmış çitler süreç içinde önbellekte tutulur; get() her
+    çağrıda dosyayı stat ile denetler, başka bir süreç çiti değiştirmiş veya
+    silmişse yeniden okur ve hazırlar.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = Path(root)
+        self._open: dict[str, tuple[tuple[int, int], Geofence]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, fence_id: str) -> Path:
+        if not isinstance(fence_id, str) or not fence_id:
+            raise ValueError("Çit adı boş olmayan bir metin olmalı")
+        name = quote(fence_id, safe="")
+        if name.startswith("."):
+            name = "%2E" + name[1:]
+        if len(name) > MAX_STORED_NAME_BYTES:
+            raise ValueError(f"Çit adı çok uzun (kodlanmış hali en fazla {MAX_STORED_NAME_BYTES} bayt)")
+        return self.root / f"{name}.json"
+
+    def register(self, fence_id: str, rings: Sequence[tuple[np.ndarray, np.ndarray]],
+                 source: Optional[str] = None) -> Geofence:
+        """
+        Çiti diske yazar (aynı adla tekrar kayıt eskisini değiştirir) ve hazırlanmış halini döndürür.
+
+        Raises:
+            ValueError: Halkalar geçersizse
+        """
+        path = self._path(fence_id)
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        # Yazmadan önce hazırlayarak geçersiz çokgenlerin depoya girmesini engelle
+        fence = Geofence(fence_id, rings, source, created)
+        document = {
+            "fence_id": fence_id,
+            "rings": [np.column_stack((lats, lons)).tolist() for lats, lons in fence.rings],
+            "source": source,
+            "created": created
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.{time.time_ns():x}-{os.getpid()}.tmp")
+        try:
+            with open(staging, "w", encoding="utf-8") as f:
+                json.dump(document, f, ensure_ascii=False)
+            os.replace(staging, path)
+        except BaseException:
+            staging.unlink(missing_ok=True)
+            raise
+        stat = os.stat(path)
+        with self._lock:
+            self._open[fence_id] = ((stat.st_ino, stat.st_mtime_ns), fence)
+        return fence
+
+    def register_file(self, fence_id: str, path) -> Geofence:
+        """Sunucu tarafındaki bir GeoJSON dosyasını çit olarak yükler"""
+        path = Path(path)
+        try:
+            document = json.loads(path.read_bytes())
+        except ValueError as e:
+            raise ValueError(f"GeoJSON çözülemedi: {e}")
+        return self.register(fence_id, geojson_rings(document), source=str(path))
+
+    def get(self, fence_id: str) -> Optional[Geofence]:
+        """Hazırlanmış çit; kayıtlı değilse None"""
+        path = self._path(fence_id)
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_ino, stat.st_mtime_ns)
+            cached = self._open.get(fence_id)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            with open(path, encoding="utf-8") as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self._open.pop(fence_id, None)
+            return None
+        rings = [parse_ring(ring) for ring in document["rings"]]
+        fence = Geofence(fence_id, rings, document.get("source"), document.get("created"))
+        with self._lock:
+            self._open[fence_id] = (stamp, fence)
+        return fence
+
+    def list(self) -> list[Geofence]:
+        """Kayıtlı tüm çitler (ada göre sıralı)"""
+        if not self.root.is_dir():
+            return []
+        fences = []
+        for path in self.root.glob("*.json"):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    fence_id = json.load(f)["fence_id"]
+            except (OSError, ValueError, KeyError):
+                continue
+            fence = self.get(fence_id)
+            if fence is not None:
+                fences.append(fence)
+        return sorted(fences, key=lambda fence: fence.fence_id)
+
+    def delete(self, fence_id: str) -> bool:
+        """Çiti siler; kayıtlı değilse False"""
+        try:
+            os.remove(self._path(fence_id))
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self._open.pop(fence_id, None)
+        return True
+
+
+def geofences_from_env() -> GeofenceRegistry:
+    """
+    Ortam değişkenlerinden çit deposu.
+
+    - DIST_GEOFENCES_DIR: Çitlerin saklandığı dizin (varsayılan mcp/geofences)
+    """
+    return GeofenceRegistry(os.environ.get("DIST_GEOFENCES_DIR", DEFAULT_ROOT))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Coğrafi çitleri yönet")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="GeoJSON dosyasını çit olarak yükle")
+    load.add_argument("fence_id")
+    load.add_argument("path")
+    commands.add_parser("list", help="Kayıtlı çitleri listele")
+    delete = commands.add_parser("delete", help="Çiti sil")
+    delete.add_argument("fence_id")
+    args = parser.parse_args()
+
+    registry = geofences_from_env()
+    if args.command == "load":
+        start = time.perf_counter()
+        fence = registry.register_file(args.fence_id, args.path)
+        print(f"{fence.fence_id}: {len(fence)} köşe yüklendi ({time.perf_counter() - start:.2f} s)")
+    elif args.command == "list":
+        for fence in registry.list():
+            print(json.dumps(fence.describe(), ensure_ascii=False))
+    elif args.command == "delete":
+        if not registry.delete(args.fence_id):
+            raise SystemExit(f"Kayıtlı çit bulunamadı: {args.fence_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Mekansal İndeks (Ball Tree)
+Kayıtlı bir nokta kümesi üzerinde en yakın k komşu ve yarıçap sorgularını
+tüm noktaları taramadan yanıtlar. proximity_pairs aynı birim küre vektörleri
+üzerinde ızgara ile bir kümenin eşik altındaki tüm nokta çiftlerini bulur.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Optional
+
+import numpy as np
+
+from distvec import (
+    EARTH_RADIUS_KM,
+    VINCENTY_HAVERSINE_MIN_RATIO,
+    coordinate_arrays,
+    distance_array,
+    haversine_array,
+    vincenty_array,
+)
+
+
+DEFAULT_LEAF_SIZE = 64
+
+# proximity_pairs: bir vektörel adımda karşılaştırılan en fazla nokta çifti
+DEFAULT_PAIR_CHUNK = 1 << 21
+# Eksen başına en fazla hücre; üç eksenin hücre numarası tek bir int64 anahtara sığar
+GRID_CELLS_PER_AXIS = 1 << 21
+# Yarım komşuluk: her komşu hücre çifti yalnızca bir kez ziyaret edilir
+NEIGHBOR_OFFSETS = [offset for offset in itertools.product((-1, 0, 1), repeat=3) if offset > (0, 0, 0)]
+
+
+def to_unit_vectors(lats, lons) -> np.ndarray:
+    """Enlem/boylam dizilerini birim küre üzerindeki (x, y, z) vektörlerine çevirir"""
+    lat_rad = np.radians(lats)
+    lon_rad = np.radians(lons)
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack((cos_lat * np.cos(lon_rad),
+                            cos_lat * np.sin(lon_rad),
+                            np.sin(lat_rad)))
+
+
+def chord_to_km(chord) -> np.ndarray:
+    """Birim küredeki kiriş uzunluğunu büyük daire mesafesine (km) çevirir"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(np.asarray(chord) / 2, 1.0))
+
+
+def km_to_chord(distance_km: float) -> float:
+    """Büyük daire mesafesini (km) birim küredeki kiriş uzunluğuna çevirir"""
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle / 2)
+
+
+class SpatialIndex:
+    """
+    Birim küre vektörleri üzerinde kurulan Ball Tree.
+
+    Düğümler düz NumPy dizilerinde tutulur; her düğüm noktaların yeniden
+    sıralanmış dizideki [start, end) aralığını, merkezini ve yarıçapını saklar.
+    Kiriş mesafesi büyük daire mesafesiyle monoton olduğundan budama Haversine
+    ile birebir tutarlıdır.
+    """
+
+    def __init__(self, lats, lons, leaf_size: int = DEFAULT_LEAF_SIZE):
+        self.lats, self.lons = coordinate_arrays(lats, lons)
+        if self.lats.ndim != 1 or not self.lats.size:
+            raise ValueError("İndeks için en az bir nokta gerekli")
+        self.leaf_size = max(1, int(leaf_size))
+
+        vectors = to_unit_vectors(self.lats, self.lons)
+        self._order = np.arange(self.lats.size)
+
+        starts, ends, centers, radii, children = [], [], [], [], []
+        stack = [(0, self.lats.size, -1, 0)]
+        while stack:
+            start, end, parent, side = stack.pop()
+            node = len(starts)
+            if parent >= 0:
+                children[parent][side] = node
+
+            members = self._order[start:end]
+            points = vectors[members]
+            center = points.mean(axis=0)
+            radius = float(np.sqrt(((points - center) ** 2).sum(axis=1).max()))
+
+            starts.append(start)
+            ends.append(end)
+            centers.append(center)
+            radii.append(radius)
+            children.append([-1, -1])
+
+            if end - start <= self.leaf_size:
+                continue
+
+            # En geniş yayılıma sahip eksende medyandan böl
+            axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+            mid = (end - start) // 2
+            split = np.argpartition(points[:, axis], mid)
+            self._order[start:end] = members[split]
+
+            stack.append((start + mid, end, node, 1))
+            stack.append((start, start + mid, node, 0))
+
+        self._vectors = vectors[self._order]
+        self._starts = np.array(starts, dtype=np.int64)
+        self._ends = np.array(ends, dtype=np.int64)
+        self._centers = np.array(centers)
+        self._radii = np.array(radii)
+        self._children = np.array(children, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self.lats.size)
+
+    def _lower_bound(self, query: np.ndarray, node: int) -> float:
+        """Sorgu noktasından düğüm küresine olan en küçük kiriş mesafesi"""
+        center_dist = math.sqrt(float(((self._centers[node] - query) ** 2).sum()))
+        return max(0.0, center_dist - self._radii[node])
+
+    def query(self, lat: float, lon: float, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        En yakın k noktayı Haversine mesafesine göre bulur.
+
+        Returns:
+            (nokta indeksleri, mesafeler (km)) - artan mesafeye göre sıralı
+        """
+        k = min(int(k), len(self))
+        if k < 1:
+            raise ValueError("k en az 1 olmalı")
+
+        query = to_unit_vectors(lat, lon)[0]
+        best_dist = np.empty(0)
+        best_pos = np.empty(0, dtype=np.int64)
+        worst = math.inf
+
+        # En iyi-önce arama: düğümler alt sınır kiriş mesafesine göre işlenir
+        heap = [(self._lower_bound(query, 0), 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound > worst:
+                break
+
+            left, right = self._children[node]
+            if left < 0:
+                start, end = self._starts[node], self._ends[node]
+                dist = np.sqrt(((self._vectors[start:end] - query) ** 2).sum(axis=1))
+                best_dist = np.concatenate((best_dist, dist))
+                best_pos = np.concatenate((best_pos, np.arange(start, end)))
+                if best_dist.size > k:
+                    keep = np.argpartition(best_dist, k - 1)[:k]
+                    best_dist, best_pos = best_dist[keep], best_pos[keep]
+                if best_dist.size == k:
+                    worst = float(best_dist.max())
+                continue
+
+            for child in (left, right):
+                child_bound = self._lower_bound(query, child)
+                if child_bound <= worst:
+                    heapq.heappush(heap, (child_bound, child))
+
+        indices = self._order[best_pos]
+        distances = haversine_array(lat, lon, self.lats[indices], self.lons[indices])
+        ranking = np.argsort(distances, kind="stable")
+        return indices[ranking], distances[ranking]
+
+    def query_radius(self, lat: float, lon: float, radius_km: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        radius_km içindeki tüm noktaları Haversine mesafesine göre bulur.
+
+        Returns:
+            (nokta indeksleri, mesafeler (km)) - artan mesafeye göre sıralı
+        """
+        query = to_unit_vectors(lat, lon)[0]
+        # Sınırdaki noktalar kayan nokta hatasıyla kaybolmasın diye küçük pay bırakılır;
+        # fazladan gelen adaylar aşağıdaki kesin Haversine filtresiyle elenir
+        chord = km_to_chord(radius_km) * (1 + 1e-9)
+
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._lower_bound(query, node) > chord:
+                continue
+
+            start, end = self._starts[node], self._ends[node]
+            left, right = self._children[node]
+            center_dist = math.sqrt(float(((self._centers[node] - query) ** 2).sum()))
+            if center_dist + self._radii[node] <= chord:
+                # Düğüm tamamen yarıçap içinde
+                found.append(np.arange(start, end))
+            elif left < 0:
+                dist = np.sqrt(((self._vectors[start:end] - query) ** 2).sum(axis=1))
+                found.append(start + np.nonzero(dist <= chord)[0])
+            else:
+                stack.extend((left, right))
+
+        positions = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+        indices = self._order[positions]
+        distances = haversine_array(lat, lon, self.lats[indices], self.lons[indices])
+
+        # Kiriş yuvarlama hatalarına karşı kesin Haversine ile son filtre
+        inside = distances <= radius_km
+        indices, distances = indices[inside], distances[inside]
+        ranking = np.argsort(distances, kind="stable")
+        return indices[ranking], distances[ranking]
+
+    def nearest(self, lat: float, lon: float, k: int,
+                method: str = "haversine") -> tuple[np.ndarray, np.ndarray]:
+        """
+        En yakın k noktayı seçilen yönteme göre döndürür.
+
+        Vincenty için önce Haversine ile k aday bulunur; bu adayların en büyük
+        Vincenty mesafesinden türetilen güvenli bir yarıçap içindeki tüm noktalar
+        Vincenty ile yeniden hesaplanıp sıralanır.
+        """
+        indices, distances = self.query(lat, lon, k)
+        if method != "vincenty":
+            return indices, distances
+
+        upper = float(vincenty_array(lat, lon, self.lats[indices], self.lons[indices]).max())
+        candidates, _ = self.query_radius(lat, lon, upper / VINCENTY_HAVERSINE_MIN_RATIO)
+        refined = vincenty_array(lat, lon, self.lats[candidates], self.lons[candidates])
+        ranking = np.argsort(refined, kind="stable")[:len(indices)]
+        return candidates[ranking], refined[ranking]
+
+
+def _cell_pair_blocks(starts: np.ndarray, counts: np.ndarray, first: np.ndarray, second: np.ndarray,
+                      chunk_size: int):
+    """
+    Hücre çiftlerini en fazla ~chunk_size nokta çifti içeren bloklara böler.
+    Tek başına chunk_size'ı aşan çiftlerde ilk hücrenin satırları dilimlenir.
+
+    Yields:
+        (ilk hücre başlangıçları, satır sayıları, ikinci hücre başlangıçları, nokta sayıları, aynı hücre mi)
+    """
+    a_start, a_count, same = starts[first], counts[first], first == second
+    large = a_count * counts[second] > chunk_size
+    if large.any():
+        split_start, split_count, split_second, split_same = [], [], [], []
+        for a, b in zip(first[large].tolist(), second[large].tolist()):
+            rows = max(1, chunk_size // int(counts[b]))
+            for offset in range(0, int(counts[a]), rows):
+                split_start.append(int(starts[a]) + offset)
+                split_count.append(min(rows, int(counts[a]) - offset))
+                split_second.append(b)
+                split_same.append(a == b)
+        a_start = np.concatenate((a_start[~large], np.array(split_start, dtype=np.int64)))
+        a_count = np.concatenate((a_count[~large], np.array(split_count, dtype=np.int64)))
+        same = np.concatenate((same[~large], np.array(split_same, dtype=bool)))
+        second = np.concatenate((second[~large], np.array(split_second, dtype=np.int64)))
+    b_start, b_count = starts[second], counts[second]
+
+    sizes = a_count * b_count
+    boundaries = np.searchsorted(np.cumsum(sizes), np.arange(chunk_size, int(sizes.sum()), chunk_size))
+    edges = np.unique(np.concatenate(([0], boundaries + 1, [sizes.size])))
+    for lo, hi in zip(edges[:-1].tolist(), edges[1:].tolist()):
+        yield a_start[lo:hi], a_count[lo:hi], b_start[lo:hi], b_count[lo:hi], same[lo:hi]
+
+
+def proximity_pairs(lats, lons, threshold_km: float, method: str = "haversine",
+                    max_pairs: Optional[int] = None,
+                    chunk_size: int = DEFAULT_PAIR_CHUNK) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+    """
+    Bir nokta kümesinde birbirine threshold_km veya daha yakın tüm nokta çiftlerini bulur.
+
+    Noktalar birim küre vektörlerine çevrilip kenarı eşik kirişi kadar olan
+    3 boyutlu bir ızgaraya yerleştirilir; yalnızca aynı ve komşu hücrelerdeki
+    noktalar karşılaştırılır. Kiriş testini geçen adaylar seçilen yöntemle
+    (haversine/vincenty) kesin olarak doğrulanır. Yoğunluk sabitken iş nokta
+    sayısıyla doğrusal büyür.
+
+    Args:
+        max_pairs: Bu sayıya ulaşılınca arama durur; istatistiklerde truncated True olur
+            ve daha fazla çift bulunabilir
+
+    Returns:
+        (ilk indeksler, ikinci indeksler (ilk < ikinci), mesafeler (km), istatistikler);
+        çiftler (ilk, ikinci) sırasına göre sıralı
+    """
+    lats, lons = coordinate_arrays(lats, lons)
+    if not threshold_km > 0:
+        raise ValueError("Eşik mesafesi pozitif olmalı")
+    if max_pairs is not None and max_pairs < 1:
+        raise ValueError("max_pairs en az 1 olmalı")
+
+    # Vincenty, Haversine'den en fazla %1 kısa olabilir; aday yarıçapı buna göre genişletilir
+    search_km = threshold_km / VINCENTY_HAVERSINE_MIN_RATIO if method == "vincenty" else threshold_km
+    chord = km_to_chord(search_km) * (1 + 1e-9)
+
+    vectors = to_unit_vectors(lats, lons)
+    cell = max(chord, 2.0 / (GRID_CELLS_PER_AXIS - 3))
+    # Hücre numaraları 1'den başlar; komşu ofsetleri (-1/+1) taşmadan anahtara eklenebilir
+    coords = np.floor((vectors + 1.0) / cell).astype(np.int64) + 1
+    size = int(coords.max(initial=0)) + 2
+    keys = (coords[:, 0] * size + coords[:, 1]) * size + coords[:, 2]
+
+    order = np.argsort(keys, kind="stable")
+    cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    x, y, z = (np.ascontiguousarray(vectors[order, axis]) for axis in range(3))
+    sorted_lats, sorted_lons = lats[order], lons[order]
+
+    first_cells = [np.arange(cell_keys.size)]
+    second_cells = [np.arange(cell_keys.size)]
+    for dx, dy, dz in NEIGHBOR_OFFSETS:
+        neighbor = cell_keys + (dx * size + dy) * size + dz
+        pos = np.minimum(np.searchsorted(cell_keys, neighbor), max(cell_keys.size - 1, 0))
+        found = np.nonzero(cell_keys[pos] == neighbor)[0] if cell_keys.size else pos
+        first_cells.append(found)
+        second_cells.append(pos[found])
+    first = np.concatenate(first_cells)
+    second = np.concatenate(second_cells)
+
+    found_first, found_second, found_distances = [], [], []
+    compared = candidates = matched = 0
+    truncated = False
+    for a_start, a_count, b_start, b_count, same in _cell_pair_blocks(starts, counts, first, second, chunk_size):
+        sizes = a_count * b_count
+        total = int(sizes.sum())
+        if not total:
+            continue
+        block = np.repeat(np.arange(sizes.size), sizes)
+        local = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        columns = b_count[block]
+        i = a_start[block] + local // columns
+        j = b_start[block] + local % columns
+        # Aynı hücrede her çift bir kez ve kendisiyle eşleşmeden
+        keep = ~same[block] | (i < j)
+        i, j = i[keep], j[keep]
+        compared += i.size
+
+        d2 = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 + (z[i] - z[j]) ** 2
+        close = d2 <= chord * chord
+        i, j = i[close], j[close]
+        candidates += i.size
+        if not i.size:
+            continue
+
+        distances = distance_array(sorted_lats[i], sorted_lons[i], sorted_lats[j], sorted_lons[j], method)
+        inside = distances <= threshold_km
+        i, j, distances = order[i[inside]], order[j[inside]], distances[inside]
+        found_first.append(np.minimum(i, j))
+        found_second.append(np.maximum(i, j))
+        found_distances.append(distances)
+        matched += distances.size
+        if max_pairs is not None and matched >= max_pairs:
+            truncated = True
+            break
+
+    if found_first:
+        first_idx = np.concatenate(found_first)
+        second_idx = np.concatenate(found_second)
+        distances = np.concatenate(found_distances)
+    else:
+        first_idx = second_idx = np.empty(0, dtype=np.int64)
+        distances = np.empty(0)
+    ranking = np.lexsort((second_idx, first_idx))
+    if max_pairs is not None:
+        ranking = ranking[:max_pairs]
+    stats = {
+        "cells": int(cell_keys.size),
+        "compared_pairs": compared,
+        "candidate_pairs": candidates,
+        "truncated": truncated
+    }
+    return first_idx[ranking], second_idx[ranking], distances[ranking], stats
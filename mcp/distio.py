@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Toplu Koordinat Girdi Biçimleri
+Sütunsal JSON, ham float64, .npy ve Arrow IPC gövdelerini kopyalamadan
+NumPy dizilerine çevirir ve dizi bazında doğrular.
+"""
+
+import io
+from typing import Optional
+
+import numpy as np
+
+
+# Desteklenen ikili içerik türleri
+RAW_CONTENT_TYPE = "application/octet-stream"
+NPY_CONTENT_TYPE = "application/x-npy"
+ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_CONTENT_TYPE = "application/vnd.apache.arrow.file"
+
+
+def validate_coordinate_arrays(lats: np.ndarray, lons: np.ndarray) -> None:
+    """
+    Enlem/boylam dizilerini model başına değil, tüm dizi üzerinde doğrular.
+
+    Raises:
+        ValueError: Uzunluklar farklıysa veya geçersiz/aralık dışı değer varsa
+    """
+    if lats.ndim != 1 or lats.shape != lons.shape:
+        raise ValueError("Enlem ve boylam dizileri aynı uzunlukta tek boyutlu olmalı")
+
+    invalid = ~(np.isfinite(lats) & np.isfinite(lons) &
+                (np.abs(lats) <= 90) & (np.abs(lons) <= 180))
+    if invalid.any():
+        first = int(np.argmax(invalid))
+        raise ValueError(
+            f"{int(invalid.sum())} geçersiz koordinat var (ilk indeks {first}: "
+            f"lat={lats[first]}, lon={lons[first]}); enlem -90..90, boylam -180..180 olmalı"
+        )
+
+
+def parse_coordinate_pairs(pairs) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    [[lat1, lon1, lat2, lon2], ...] biçimindeki çift listesini dört diziye
+    ayırır ve tüm diziler üzerinde tek seferde doğrular.
+
+    Raises:
+        ValueError: Liste boşsa, bir çift dört sayı değilse veya koordinat geçersizse
+    """
+    try:
+        coords = np.array(pairs, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Her çift [lat1, lon1, lat2, lon2] biçiminde dört sayı olmalı")
+    if coords.ndim != 2 or coords.shape[1] != 4 or not coords.shape[0]:
+        raise ValueError("pairs boş olmayan bir [lat1, lon1, lat2, lon2] listesi olmalı")
+
+    validate_coordinate_arrays(coords[:, 0], coords[:, 1])
+    validate_coordinate_arrays(coords[:, 2], coords[:, 3])
+    return (np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1]),
+            np.ascontiguousarray(coords[:, 2]), np.ascontiguousarray(coords[:, 3]))
+
+
+def split_coordinate_matrix(coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (N, 2) [lat, lon] veya (2, N) [lats; lons] biçimindeki matrisi iki diziye ayırır.
+    (2, N) biçiminde satırlar bitişik olduğundan kopya oluşmaz. Belirsiz olan
+    2×2 matris (N, 2) olarak yorumlanır.
+    """
+    if coords.ndim != 2 or 2 not in coords.shape:
+        raise ValueError("Koordinat matrisi (N, 2) veya (2, N) boyutunda olmalı")
+    if coords.shape[0] == 2 and coords.shape[1] != 2:
+        return coords[0], coords[1]
+    return coords[:, 0], coords[:, 1]
+
+
+def parse_raw_coordinates(body: bytes, layout: str = "interleaved") -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ham little-endian float64 gövdesini diziye çevirir (kopyasız görünüm).
+
+    Args:
+        body: İstek gövdesi
+        layout: 'interleaved' (lat0, lon0, lat1, lon1, ...) veya
+                'planar' (tüm enlemler, ardından tüm boylamlar)
+    """
+    if len(body) % 16:
+        raise ValueError("Gövde uzunluğu 16 baytın (iki float64) katı olmalı")
+
+    values = np.frombuffer(body, dtype="<f8")
+    if layout == "planar":
+        half = values.size // 2
+        return values[:half], values[half:]
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def parse_npy(body: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    .npy gövdesini başlığı okuyup veri alanı üzerinde kopyasız görünüm olarak açar.
+    Dizi (N, 2) veya (2, N) boyutunda olmalıdır.
+    """
+    buffer = io.BytesIO(body)
+    version = np.lib.format.read_magic(buffer)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(buffer)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(buffer)
+
+    if dtype.hasobject:
+        raise ValueError("Nesne içeren .npy dizileri desteklenmiyor")
+
+    count = int(np.prod(shape))
+    coords = np.frombuffer(body, dtype=dtype, count=count, offset=buffer.tell())
+    coords = coords.reshape(shape, order="F" if fortran_order else "C")
+    return split_coordinate_matrix(coords.astype(np.float64, copy=False))
+
+
+def parse_arrow(body: bytes, file_format: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Arrow IPC (stream veya file) gövdesinden 'lat' ve 'lon' sütunlarını okur.
+    pyarrow isteğe bağlı bir bağımlılıktır; yüklü değilse ImportError yükselir.
+    """
+    import pyarrow as pa
+
+    reader = pa.ipc.open_file(body) if file_format else pa.ipc.open_stream(body)
+    table = reader.read_all()
+    if "lat" not in table.column_names or "lon" not in table.column_names:
+        raise ValueError("Arrow tablosunda 'lat' ve 'lon' sütunları olmalı")
+
+    lats = table.column("lat").combine_chunks().to_numpy(zero_copy_only=False)
+    lons = table.column("lon").combine_chunks().to_numpy(zero_copy_only=False)
+    return lats.astype(np.float64, copy=False), lons.astype(np.float64, copy=False)
+
+
+def parse_binary_coordinates(body: bytes, content_type: Optional[str],
+                             layout: str = "interleaved") -> tuple[np.ndarray, np.ndarray]:
+    """
+    İçerik türüne göre ikili koordinat gövdesini çözer.
+
+    Raises:
+        ValueError: Gövde çözülemezse
+        LookupError: İçerik türü desteklenmiyorsa
+    """
+    content_type = (content_type or RAW_CONTENT_TYPE).split(";")[0].strip().lower()
+    if content_type == RAW_CONTENT_TYPE:
+        return parse_raw_coordinates(body, layout)
+    if content_type == NPY_CONTENT_TYPE:
+        return parse_npy(body)
+    if content_type in (ARROW_STREAM_CONTENT_TYPE, ARROW_FILE_CONTENT_TYPE):
+        return parse_arrow(body, file_format=content_type == ARROW_FILE_CONTENT_TYPE)
+    raise LookupError(f"Desteklenmeyen içerik türü: {content_type}")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Derlenmiş Mesafe Çekirdekleri (Numba)
+Haversine ve Vincenty'nin skaler ve paralel döngülü derlenmiş sürümleri.
+Vincenty döngüsü her eleman için ayrı çalıştığından yakınsamış elemanlar
+sonraki iterasyonlara katılmaz ve maske/dizi kopyası maliyeti oluşmaz.
+
+numba yüklü değilse AVAILABLE False olur ve distvec NumPy/saf Python
+sürümlerini kullanmaya devam eder. Çekirdekler açık imzalarla ve cache=True
+ile derlenir: ilk derleme __pycache__ altına yazılır, sonraki süreçler
+derlenmiş kodu diskten yükler. Modül yalnızca numba arka ucu seçildiğinde
+(distvec.use_kernel_backend) içe aktarılır; MCP sunucusunun başlangıcını etkilemez.
+"""
+
+import math
+from functools import partial
+
+import numpy as np
+
+import distvec
+from distvec import EARTH_RADIUS_KM, VINCENTY_ITERATION_LIMIT, VINCENTY_TOLERANCE, WGS84_A, WGS84_B, WGS84_F
+
+try:
+    import numba
+except ImportError:  # opsiyonel bağımlılık
+    numba = None
+
+AVAILABLE = numba is not None
+
+
+if AVAILABLE:
+    # fastmath kapalı: sonuçlar NumPy/saf Python sürümleriyle bit düzeyinde aynı işlemleri izler.
+    # error_model="numpy": sıfıra bölme istisna yerine inf/nan üretir (NumPy ile aynı)
+    _scalar = partial(numba.njit, cache=True, nogil=True, error_model="numpy")
+    _parallel = partial(numba.njit, cache=True, nogil=True, parallel=True, error_model="numpy")
+    # Girdi dizileri her zaman salt okunur görünüm olarak verilir (bkz. _flat_arguments),
+    # böylece tek bir imza hem yazılabilir hem np.frombuffer kaynaklı dizileri kapsar
+    _coords = numba.types.Array(numba.float64, 1, "C", readonly=True)
+
+    @_scalar("float64(float64, float64, float64, float64)")
+    def haversine_kernel(lat1, lon1, lat2, lon2):
+        lat1_rad = math.radians(lat1)
+        lon1_rad = math.radians(lon1)
+        lat2_rad = math.radians(lat2)
+        lon2_rad = math.radians(lon2)
+
+        dlat = lat2_rad - lat1_rad
+        dlon = lon2_rad - lon1_rad
+
+        a = (math.sin(dlat / 2) ** 2 +
+             math.cos(lat1_rad) * math.cos(lat2_rad) *
+             math.sin(dlon / 2) ** 2)
+
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        return EARTH_RADIUS_KM * c
+
+    @_scalar("Tuple((float64, int64))(float64, float64, float64, float64, int64)")
+    def vincenty_kernel(lat1, lon1, lat2, lon2, iteration_limit):
+        """
+        Returns:
+            (mesafe (km), iterasyon sayısı); aynı noktalar için (0, 0),
+            yakınsamayanlar için (Haversine, iteration_limit)
+        """
+        a = WGS84_A
+        f = WGS84_F
+        b = WGS84_B
+
+        lon_diff = math.radians(lon2 - lon1)
+        U1 = math.atan((1 - f) * math.tan(math.radians(lat1)))
+        U2 = math.atan((1 - f) * math.tan(math.radians(lat2)))
+
+        sin_U1 = math.sin(U1)
+        cos_U1 = math.cos(U1)
+        sin_U2 = math.sin(U2)
+        cos_U2 = math.cos(U2)
+
+        lambda_val = lon_diff
+        lambda_prev = 2 * math.pi
+        iteration = 0
+        sin_sigma = 0.0
+        cos_sigma = 0.0
+        sigma = 0.0
+        cos2_alpha = 0.0
+        cos_2sigma_m = 0.0
+
+        while abs(lambda_val - lambda_prev) > VINCENTY_TOLERANCE and iteration < iteration_limit:
+            sin_lambda = math.sin(lambda_val)
+            cos_lambda = math.cos(lambda_val)
+
+            sin_sigma = math.sqrt(
+                (cos_U2 * sin_lambda) ** 2 +
+                (cos_U1 * sin_U2 - sin_U1 * cos_U2 * cos_lambda) ** 2
+            )
+            if sin_sigma == 0:
+                return 0.0, 0  # Aynı nokta
+
+            cos_sigma = sin_U1 * sin_U2 + cos_U1 * cos_U2 * cos_lambda
+            sigma = math.atan2(sin_sigma, cos_sigma)
+
+            sin_alpha = cos_U1 * cos_U2 * sin_lambda / sin_sigma
+            cos2_alpha = 1 - sin_alpha ** 2
+
+            if cos2_alpha == 0:
+                cos_2sigma_m = 0.0
+            else:
+                cos_2sigma_m = cos_sigma - 2 * sin_U1 * sin_U2 / cos2_alpha
+
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+
+            lambda_prev = lambda_val
+            lambda_val = (lon_diff + (1 - C) * f * sin_alpha *
+                          (sigma + C * sin_sigma *
+                           (cos_2sigma_m + C * cos_sigma *
+                            (-1 + 2 * cos_2sigma_m ** 2))))
+            iteration += 1
+
+        if iteration >= iteration_limit:
+            # Yakınsama sağlanamazsa Haversine kullan
+            return haversine_kernel(lat1, lon1, lat2, lon2), iteration
+
+        u2 = cos2_alpha * (a ** 2 - b ** 2) / (b ** 2)
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+
+        delta_sigma = (B * sin_sigma *
+                       (cos_2sigma_m + B / 4 *
+                        (cos_sigma * (-1 + 2 * cos_2sigma_m ** 2) -
+                         B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) *
+                         (-3 + 4 * cos_2sigma_m ** 2))))
+
+        return b * A * (sigma - delta_sigma) / 1000, iteration
+
+    # Diziler ya n ya da 1 elemanlıdır (skaler referans nokta kopyalanmadan yayınlanır)
+    @_parallel(numba.void(_coords, _coords, _coords, _coords, numba.float64[::1]))
+    def _haversine_loop(lat1, lon1, lat2, lon2, out):
+        step1 = 1 if lat1.size > 1 else 0
+        step2 = 1 if lat2.size > 1 else 0
+        for i in numba.prange(out.size):
+            j = i * step1
+            k = i * step2
+            out[i] = haversine_kernel(lat1[j], lon1[j], lat2[k], lon2[k])
+
+    @_parallel(numba.void(_coords, _coords, _coords, _coords, numba.int64, numba.float64[::1], numba.int64[::1]))
+    def _vincenty_loop(lat1, lon1, lat2, lon2, iteration_limit, out, iterations):
+        step1 = 1 if lat1.size > 1 else 0
+        step2 = 1 if lat2.size > 1 else 0
+        for i in numba.prange(out.size):
+            j = i * step1
+            k = i * step2
+            out[i], iterations[i] = vincenty_kernel(lat1[j], lon1[j], lat2[k], lon2[k], iteration_limit)
+
+
+def _flat_arguments(lat1, lon1, lat2, lon2) -> tuple[tuple, list[np.ndarray]]:
+    """
+    Argümanları derlenmiş döngülerin beklediği biçime getirir: her nokta çifti
+    (lat1/lon1 ve lat2/lon2) ya tek elemanlı ya da sonuç boyutunda bitişik
+    float64 dizisi olur. Çok boyutlu yayınlamada (matris karoları) tam boyuta açılır.
+    Diziler salt okunur görünüm olarak döner (derlenmiş imzalar bunu bekler).
+    """
+    arrays = [np.asarray(x, dtype=np.float64) for x in (lat1, lon1, lat2, lon2)]
+    shape = np.broadcast_shapes(*(x.shape for x in arrays))
+    size = math.prod(shape)
+    flat = []
+    for first, second in ((arrays[0], arrays[1]), (arrays[2], arrays[3])):
+        if first.size == 1 and second.size == 1:
+            flat += [first.reshape(1), second.reshape(1)]
+        else:
+            flat += [np.ascontiguousarray(np.broadcast_to(x, shape)).reshape(size) for x in (first, second)]
+    views = []
+    for x in flat:
+        view = x.view()
+        view.flags.writeable = False
+        views.append(view)
+    return shape, views
+
+
+def haversine_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """distvec.haversine_array'in derlenmiş karşılığı (kilometre)"""
+    shape, args = _flat_arguments(lat1, lon1, lat2, lon2)
+    out = np.empty(math.prod(shape))
+    _haversine_loop(*args, out)
+    return out.reshape(shape)
+
+
+def vincenty_array(lat1, lon1, lat2, lon2,
+                   iteration_limit: int = VINCENTY_ITERATION_LIMIT) -> tuple[np.ndarray, np.ndarray]:
+    """
+    distvec.vincenty_array'in derlenmiş karşılığı.
+
+    Returns:
+        (mesafeler (km), eleman başına iterasyon sayıları; aynı noktalar için 0)
+    """
+    shape, args = _flat_arguments(lat1, lon1, lat2, lon2)
+    out = np.empty(math.prod(shape))
+    iterations = np.empty(out.size, dtype=np.int64)
+    _vincenty_loop(*args, iteration_limit, out, iterations)
+    return out.reshape(shape), iterations
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Skaler Haversine (kilometre)"""
+    return haversine_kernel(lat1, lon1, lat2, lon2)
+
+
+def vincenty_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Skaler Vincenty (kilometre); iterasyon sayısı distvec.vincenty_scalar_observer'a bildirilir"""
+    distance, iterations = vincenty_kernel(lat1, lon1, lat2, lon2, VINCENTY_ITERATION_LIMIT)
+    observer = distvec.vincenty_scalar_observer
+    if observer is not None and iterations:
+        observer(iterations, iterations >= VINCENTY_ITERATION_LIMIT)
+    return distance
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Hızlı JSON Serileştirme
+Yüklüyse orjson'u, değilse standart json modülünü kullanır. Çıktı varsayılan
+olarak girintisiz ve boşluksuzdur; NumPy dizileri ve skalerleri doğrudan
+serileştirilebilir (orjson'da kopyasız, json'da tolist() ile). NaN ve sonsuz
+değerler her iki yolda da null yazılır (geçersiz JSON olan NaN/Infinity yerine).
+"""
+
+import json
+import math
+import os
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # opsiyonel bağımlılık
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """NumPy dizileri ve skalerleri için json yedeği"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"{type(obj).__name__} JSON'a çevrilemez")
+
+
+def _finite(obj: Any) -> Any:
+    """NaN/sonsuz float'ları None ile değiştirilmiş kopya (orjson'un null davranışı)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if hasattr(obj, "tolist"):
+        return _finite(obj.tolist())
+    return obj
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj: Any, indent: Optional[int] = None) -> bytes:
+        """Nesneyi UTF-8 JSON baytlarına çevirir"""
+        options = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=_default, option=options)
+
+    def dumps(obj: Any, indent: Optional[int] = None) -> str:
+        """Nesneyi JSON metnine çevirir"""
+        return dumps_bytes(obj, indent).decode()
+else:
+    def _dumps(obj: Any, indent: Optional[int]) -> str:
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=indent, default=_default, allow_nan=False)
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default, allow_nan=False)
+
+    def dumps(obj: Any, indent: Optional[int] = None) -> str:
+        """Nesneyi JSON metnine çevirir"""
+        try:
+            return _dumps(obj, indent)
+        except ValueError:
+            # Sonlu olmayan değer var: yalnızca bu durumda nesne ağacı kopyalanır
+            return _dumps(_finite(obj), indent)
+
+    def dumps_bytes(obj: Any, indent: Optional[int] = None) -> bytes:
+        """Nesneyi UTF-8 JSON baytlarına çevirir"""
+        return dumps(obj, indent).encode()
+
+
+def indent_from_env() -> Optional[int]:
+    """
+    MCP tool çıktılarının girintisi (DIST_MCP_JSON_INDENT).
+    Varsayılan 0: girintisiz kompakt çıktı; hata ayıklarken 2 verilebilir.
+    """
+    return int(os.environ.get("DIST_MCP_JSON_INDENT", 0)) or None
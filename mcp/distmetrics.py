@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Prometheus Uyumlu Metrikler
+Harici bağımlılık olmadan sayaç ve histogram tutar, metin biçiminde (text
+exposition format 0.0.4) dışa aktarır ve istek süresini ölçen ASGI ara
+katmanını sağlar.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 50, 99, 100)
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Yalnızca artan sayaç (etiket değerlerine göre ayrı seriler)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Sabit kovalı histogram; tekil ve dizi gözlemlerini destekler"""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        # etiketler -> [kova sayaçları (+Inf dahil), toplam, adet]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, labelvalues: tuple) -> list:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        return series
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._get(labelvalues)
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def observe_many(self, values: np.ndarray, *labelvalues: str) -> None:
+        """Bir dizi gözlemi tek seferde kovalara ekler"""
+        if not values.size:
+            return
+        counts = np.bincount(np.searchsorted(self.buckets, values, side="left"),
+                             minlength=len(self.buckets) + 1)
+        total = float(values.sum())
+        with self._lock:
+            series = self._get(labelvalues)
+            for i, count in enumerate(counts.tolist()):
+                series[0][i] += count
+            series[1] += total
+            series[2] += int(values.size)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, (counts, total, count) in self._series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, labelvalues, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, labelvalues)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Metrikleri kayıt sırasıyla dışa aktarır"""
+
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "dist_http_requests_total", "HTTP istek sayısı", ("route", "method", "status")))
+REQUEST_LATENCY = registry.register(Histogram(
+    "dist_http_request_duration_seconds", "Rota bazında istek süresi", LATENCY_BUCKETS, ("route",)))
+PHASE_LATENCY = registry.register(Histogram(
+    "dist_request_phase_duration_seconds",
+    "İstek aşamalarının süresi (validation, compute, serialization)", LATENCY_BUCKETS, ("route", "phase")))
+BATCH_SIZE = registry.register(Histogram(
+    "dist_batch_size_points", "İstek başına işlenen nokta sayısı", BATCH_SIZE_BUCKETS, ("route",)))
+POINTS_PROCESSED = registry.register(Counter(
+    "dist_points_processed_total", "Hesaplanan mesafe sayısı (rate() ile nokta/saniye)", ("method",)))
+VINCENTY_ITERATIONS = registry.register(Histogram(
+    "dist_vincenty_iterations", "Vincenty iterasyon sayısı dağılımı", ITERATION_BUCKETS))
+VINCENTY_FALLBACKS = registry.register(Counter(
+    "dist_vincenty_fallbacks_total", "Yakınsamayıp Haversine'e düşen Vincenty hesapları"))
+
+
+def observe_vincenty(iterations: np.ndarray, fallbacks: int) -> None:
+    """Vektörel Vincenty çekirdeğinin iterasyon sayılarını kaydeder"""
+    VINCENTY_ITERATIONS.observe_many(iterations)
+    if fallbacks:
+        VINCENTY_FALLBACKS.inc(fallbacks)
+
+
+def observe_vincenty_scalar(iterations: int, fell_back: bool) -> None:
+    """Derlenmiş skaler Vincenty çağrısının iterasyon sayısını kaydeder"""
+    VINCENTY_ITERATIONS.observe(iterations)
+    if fell_back:
+        VINCENTY_FALLBACKS.inc()
+
+
+def record_batch(route: str, points: int, method: str) -> None:
+    """Bir isteğin nokta sayısını ve işlenen mesafeleri kaydeder"""
+    BATCH_SIZE.observe(points, route)
+    POINTS_PROCESSED.inc(points, method)
+
+
+class RequestTimer:
+    """
+    Bir isteğin aşama sürelerini tutar.
+
+    mark(phase) son işaretten bu yana geçen süreyi o aşamaya yazar. Ara katman
+    isteği başlatır; işleyici gövdeye girdiğinde 'validation', hesap bitince
+    'compute' işaretler; yanıt başlığı gönderilirken kalan süre 'serialization'
+    olarak kaydedilir.
+    """
+
+    __slots__ = ("start", "last", "phases")
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("dist_request_timer", default=None)
+
+
+def mark_phase(phase: str) -> None:
+    """Geçerli isteğin zamanlayıcısına aşama işareti koyar (ara katman yoksa etkisiz)"""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.mark(phase)
+
+
+class MetricsMiddleware:
+    """
+    Rota bazında istek sayısı, gecikme ve aşama sürelerini kaydeden saf ASGI
+    ara katmanı. Rota etiketi URL yerine rota şablonudur (ör. /point-sets/{set_id}),
+    böylece seri sayısı sınırlı kalır.
+    """
+
+    def __init__(self, app, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = set(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                timer.mark("serialization")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timer.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUESTS.inc(1, route_path, scope["method"], str(status[0]))
+            REQUEST_LATENCY.observe(time.perf_counter() - timer.start, route_path)
+            for phase, elapsed in timer.phases.items():
+                PHASE_LATENCY.observe(elapsed, route_path, phase)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Yol Uzunluğu
+Sıralı bir koordinat dizisinin (GPS izi, araç rotası) ardışık nokta çiftleri
+arasındaki mesafeleri parça parça vektörel olarak hesaplar. Noktalar
+PathAccumulator'a istenen boyutta parçalarla verilebilir; hesap için bellekte
+en fazla chunk_size nokta tutulur. GPX ve CSV gövdeleri de akış halinde
+(tüm dosya belleğe alınmadan) çözülür.
+"""
+
+import codecs
+import csv
+import xml.parsers.expat as expat
+from typing import Optional
+
+import numpy as np
+
+from distconst import DEFAULT_MAX_ERROR_M
+from distio import validate_coordinate_arrays
+from distsets import csv_columns, csv_dialect
+from distvec import AUTO_METHODS, auto_distance_array, distance_array
+
+
+DEFAULT_CHUNK_SIZE = 65_536
+PATH_FILE_FORMATS = ("gpx", "csv")
+# GPX'te iz (trkpt) ve rota (rtept) noktaları okunur; yeni bir trkseg/trk/rte yolu böler
+GPX_POINT_TAGS = ("trkpt", "rtept")
+GPX_SEGMENT_TAGS = ("trkseg", "trk", "rte")
+
+
+class PathAccumulator:
+    """
+    Yol uzunluğunu artımlı hesaplar.
+
+    add() ile gelen noktalar chunk_size dolana kadar biriktirilir, ardından
+    önceki parçanın son noktası başa eklenerek tek vektörel geçişte segment
+    mesafeleri hesaplanır. Toplam her zaman tutulur; kümülatif ve segment
+    mesafeleri yalnızca istenirse saklanır. breaks ile işaretlenen nokta yeni bir
+    parçayı (ör. GPX trkseg) başlatır: önceki noktayla arasındaki segment 0 sayılır.
+    """
+
+    def __init__(self, method: str = "haversine", max_error_m: float = DEFAULT_MAX_ERROR_M,
+                 keep_cumulative: bool = True, keep_segments: bool = False,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.method = method
+        self.max_error_m = max_error_m
+        self.keep_cumulative = keep_cumulative
+        self.keep_segments = keep_segments
+        self.chunk_size = max(1, chunk_size)
+        self.points = 0
+        self.breaks = 0
+        self.total_km = 0.0
+        self._last: Optional[tuple[float, float]] = None
+        self._pending: list[tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]] = []
+        self._pending_size = 0
+        self._cumulative: list[np.ndarray] = []
+        self._segments: list[np.ndarray] = []
+        self._method_counts = np.zeros(len(AUTO_METHODS), dtype=np.int64)
+
+    def add(self, lats, lons, breaks=None) -> None:
+        """
+        Sıradaki noktaları ekler.
+
+        Raises:
+            ValueError: Koordinatlar geçersizse
+        """
+        lats = np.ascontiguousarray(lats, dtype=np.float64).reshape(-1)
+        lons = np.ascontiguousarray(lons, dtype=np.float64).reshape(-1)
+        validate_coordinate_arrays(lats, lons)
+        if not lats.size:
+            return
+        if breaks is not None:
+            breaks = np.asarray(breaks, dtype=bool).reshape(-1)
+        self._pending.append((lats, lons, breaks))
+        self._pending_size += lats.size
+        if self._pending_size >= self.chunk_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        lats = np.concatenate([part[0] for part in self._pending])
+        lons = np.concatenate([part[1] for part in self._pending])
+        breaks = None
+        if any(part[2] is not None for part in self._pending):
+            breaks = np.concatenate([part[2] if part[2] is not None else np.zeros(part[0].size, dtype=bool)
+                                     for part in self._pending])
+        self._pending = []
+        self._pending_size = 0
+
+        if self._last is None:
+            # İlk nokta: segmenti yok, kümülatif mesafesi 0
+            start_lats, start_lons = lats[:-1], lons[:-1]
+            end_lats, end_lons = lats[1:], lons[1:]
+            segment_breaks = breaks[1:] if breaks is not None else None
+            if self.keep_cumulative:
+                self._cumulative.append(np.zeros(1))
+        else:
+            start_lats = np.concatenate(([self._last[0]], lats[:-1]))
+            start_lons = np.concatenate(([self._last[1]], lons[:-1]))
+            end_lats, end_lons = lats, lons
+            segment_breaks = breaks
+
+        if self.method == "auto":
+            segments, methods = auto_distance_array(start_lats, start_lons, end_lats, end_lons, self.max_error_m)
+        else:
+            segments = distance_array(start_lats, start_lons, end_lats, end_lons, self.method)
+            methods = None
+        if segment_breaks is not None and segment_breaks.any():
+            segments[segment_breaks] = 0.0
+            self.breaks += int(segment_breaks.sum())
+        if methods is not None:
+            kept = methods if segment_breaks is None else methods[~segment_breaks]
+            self._method_counts += np.bincount(kept, minlength=len(AUTO_METHODS))
+
+        # Toplam kümülatif diziyle aynı sırada toplanır; son kümülatif değer toplamla birebir aynıdır
+        cumulative = self.total_km + np.cumsum(segments)
+        if self.keep_cumulative:
+            self._cumulative.append(cumulative)
+        if self.keep_segments:
+            self._segments.append(segments)
+        if cumulative.size:
+            self.total_km = float(cumulative[-1])
+        self.points += lats.size
+        self._last = (float(lats[-1]), float(lons[-1]))
+
+    def finish(self) -> dict:
+        """
+        Kalan noktaları hesaplar ve sonucu kilometre cinsinden döndürür.
+
+        Returns:
+            total_km, points, segments (segment sayısı), breaks; istenirse
+            cumulative_km (nokta başına, ilk nokta 0) ve segments_km dizileri;
+            auto yönteminde method_counts
+        """
+        self._flush()
+        result = {
+            "total_km": self.total_km,
+            "points": self.points,
+            "segments": max(0, self.points - 1 - self.breaks),
+            "breaks": self.breaks
+        }
+        if self.keep_cumulative:
+            result["cumulative_km"] = np.concatenate(self._cumulative) if self._cumulative else np.zeros(0)
+        if self.keep_segments:
+            result["segments_km"] = np.concatenate(self._segments) if self._segments else np.zeros(0)
+        if self.method == "auto":
+            result["method_counts"] = {name: int(count) for name, count in zip(AUTO_METHODS, self._method_counts)}
+        return result
+
+
+def path_length(lats, lons, **options) -> dict:
+    """
+    Bellekteki bir nokta dizisinin yol uzunluğu; dizi chunk_size'lık
+    dilimlerle işlenir. options PathAccumulator'a geçirilir.
+    """
+    accumulator = PathAccumulator(**options)
+    for start in range(0, len(lats), accumulator.chunk_size):
+        accumulator.add(lats[start:start + accumulator.chunk_size], lons[start:start + accumulator.chunk_size])
+    return accumulator.finish()
+
+
+def parse_point_sequence(points) -> tuple[np.ndarray, np.ndarray]:
+    """
+    [lat, lon] dizileri ve {"lat", "lon"} nesnelerinden (karışık olabilir)
+    oluşan listeyi iki diziye çevirir.
+
+    Raises:
+        ValueError: Liste boşsa veya bir eleman [lat, lon] / {lat, lon} değilse
+    """
+    try:
+        if any(isinstance(p, dict) for p in points):
+            points = [(p["lat"], p["lon"]) if isinstance(p, dict) else p for p in points]
+        coords = np.array(points, dtype=np.float64)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Her nokta [lat, lon] veya {lat, lon} biçiminde iki sayı olmalı")
+    if coords.ndim != 2 or coords.shape[1] != 2 or not coords.shape[0]:
+        raise ValueError("points boş olmayan bir [lat, lon] listesi olmalı")
+    return np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1])
+
+
+class GPXStreamParser:
+    """
+    GPX gövdesini expat ile parça parça çözer; feed() o parçada tamamlanan
+    noktaları döndürür. Ağaç kurulmadığından bellek kullanımı dosya boyutundan
+    bağımsızdır.
+    """
+
+    def __init__(self):
+        self._parser = expat.ParserCreate(namespace_separator=" ")
+        self._parser.StartElementHandler = self._start
+        self._lats: list[str] = []
+        self._lons: list[str] = []
+        self._breaks: list[bool] = []
+        self._new_segment = True
+
+    def _start(self, name: str, attrs: dict) -> None:
+        tag = name.rsplit(" ", 1)[-1]
+        if tag in GPX_POINT_TAGS:
+            try:
+                self._lats.append(attrs["lat"])
+                self._lons.append(attrs["lon"])
+            except KeyError:
+                raise ValueError(f"GPX noktasında lat/lon eksik: {attrs}")
+            self._breaks.append(self._new_segment)
+            self._new_segment = False
+        elif tag in GPX_SEGMENT_TAGS:
+            self._new_segment = True
+
+    def _parse(self, data: bytes, final: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        try:
+            self._parser.Parse(data, final)
+            lats = np.array(self._lats).astype(np.float64) if self._lats else np.zeros(0)
+            lons = np.array(self._lons).astype(np.float64) if self._lons else np.zeros(0)
+        except expat.ExpatError as e:
+            raise ValueError(f"GPX çözülemedi: {e}")
+        except ValueError as e:
+            raise ValueError(f"GPX noktasında geçersiz lat/lon: {e}")
+        breaks = np.array(self._breaks, dtype=bool)
+        self._lats, self._lons, self._breaks = [], [], []
+        return lats, lons, breaks
+
+    def feed(self, data: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._parse(data, False)
+
+    def close(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._parse(b"", True)
+
+
+class CSVStreamParser:
+    """
+    CSV gövdesini parça parça çözer; yarım kalan satır bir sonraki parçaya
+    taşınır. Sütunlar distsets.parse_csv ile aynı kurallarla bulunur.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._columns = None
+        self._dialect = None
+        self._line = 0
+
+    def _parse(self, text: str) -> tuple[np.ndarray, np.ndarray, None]:
+        lines = text.splitlines()
+        if self._columns is None:
+            while lines and not lines[0].strip():
+                lines.pop(0)
+                self._line += 1
+            if not lines:
+                return np.zeros(0), np.zeros(0), None
+            self._dialect = csv_dialect(lines[0])
+            lat_col, lon_col, _, has_header = csv_columns(next(csv.reader(lines[:1], self._dialect)))
+            self._columns = (lat_col, lon_col)
+            if has_header:
+                lines.pop(0)
+                self._line += 1
+        lat_col, lon_col = self._columns
+        # Boş satırlar atlanır (loadtxt boş girdide uyarı verir); satır sayacı yine hepsini sayar
+        rows = [line for line in lines if line.strip()]
+        if not rows:
+            self._line += len(lines)
+            return np.zeros(0), np.zeros(0), None
+
+        # Hızlı yol: NumPy'nin C ayrıştırıcısı yalnızca enlem/boylam sütunlarını okur
+        try:
+            coords = np.loadtxt(rows, delimiter=self._dialect.delimiter, quotechar='"',
+                                usecols=(lat_col, lon_col), dtype=np.float64, ndmin=2)
+            self._line += len(lines)
+            return np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1]), None
+        except ValueError:
+            pass  # Hatalı satırı numarasıyla bildirmek için csv modülüyle yeniden oku
+
+        lats, lons = [], []
+        for line in lines:
+            self._line += 1
+            row = next(csv.reader([line], self._dialect), [])
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            try:
+                lats.append(float(row[lat_col]))
+                lons.append(float(row[lon_col]))
+            except (IndexError, ValueError):
+                raise ValueError(f"CSV satırı {self._line} çözülemedi: enlem/boylam sütunu eksik veya sayı değil")
+        return np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64), None
+
+    def feed(self, data: bytes) -> tuple[np.ndarray, np.ndarray, None]:
+        try:
+            self._buffer += self._decoder.decode(data)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"CSV UTF-8 olmalı: {e}")
+        # Sondaki \r, ardından gelecek parçadaki \n ile tek satır sonu olabilir; bir sonraki parçaya bırakılır
+        search = self._buffer[:-1] if self._buffer.endswith("\r") else self._buffer
+        end = max(search.rfind("\n"), search.rfind("\r"))
+        if end < 0:
+            return np.zeros(0), np.zeros(0), None
+        complete, self._buffer = self._buffer[:end + 1], self._buffer[end + 1:]
+        return self._parse(complete)
+
+    def close(self) -> tuple[np.ndarray, np.ndarray, None]:
+        rest, self._buffer = self._buffer + self._decoder.decode(b"", final=True), ""
+        return self._parse(rest)
+
+
+def stream_parser(file_format: str):
+    """Biçime göre akış ayrıştırıcısı (gpx/csv)"""
+    if file_format == "gpx":
+        return GPXStreamParser()
+    if file_format == "csv":
+        return CSVStreamParser()
+    raise ValueError(f"Desteklenmeyen iz dosyası biçimi: {file_format} (gpx veya csv)")
+
+
+def detect_path_format(name: Optional[str]) -> Optional[str]:
+    """Dosya adından veya içerik türünden biçimi çıkarır (gpx/csv)"""
+    name = (name or "").split(";")[0].strip().lower()
+    if name.endswith(("gpx", "gpx+xml", "/xml")):
+        return "gpx"
+    if name.endswith(("csv", ".tsv", "/tab-separated-values")):
+        return "csv"
+    return None
+
+
+def path_length_file(path, file_format: Optional[str] = None, read_size: int = 1 << 20,
+                     **options) -> dict:
+    """
+    Sunucu tarafındaki bir GPX/CSV dosyasının yol uzunluğunu dosyayı parça parça
+    okuyarak hesaplar. options PathAccumulator'a geçirilir.
+    """
+    file_format = file_format or detect_path_format(str(path))
+    if file_format is None:
+        raise ValueError(f"Dosya biçimi anlaşılamadı: {path} (gpx veya csv)")
+    parser = stream_parser(file_format)
+    accumulator = PathAccumulator(**options)
+    with open(path, "rb") as f:
+        while data := f.read(read_size):
+            accumulator.add(*parser.feed(data))
+    accumulator.add(*parser.close())
+    return accumulator.finish()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Rota Sıralama
+Bir başlangıç noktasından çıkıp tüm durakları ziyaret eden kısa bir sıra
+bulur. Mesafe matrisi bir kez (haversine veya vincenty) hesaplanır; en yakın
+komşu ile kurulan başlangıç rotası, süre bütçesi dolana veya yerel en iyiye
+ulaşılana kadar 2-opt ve Or-opt hamleleriyle iyileştirilir.
+
+Rotanın iki ucu sabittir: başta başlangıç noktası, sonda bir bitiş düğümü.
+Açık rotada bitiş düğümü her durağa 0 uzaklıktaki sanal bir düğümdür, böylece
+son durak serbest kalır; dönüşlü rotada bitiş düğümü başlangıç noktasının
+kopyasıdır. Her iki durumda da aynı hamleler uçları değiştirmeden çalışır.
+
+Hamleler bir rota konumu için tüm aday konumları tek vektörel adımda
+değerlendirir (konum başına O(n) NumPy işlemi). Don't-look bitleriyle her
+taramada yalnızca çevresi değişen konumlar yeniden incelenir.
+"""
+
+import time
+
+import numpy as np
+
+from distconst import DEFAULT_MATRIX_MEMORY_MB, DEFAULT_ROUTE_TIME_LIMIT_S, MAX_ROUTE_STOPS, MAX_ROUTE_TIME_LIMIT_S
+from distvec import coordinate_arrays, distance_array, matrix_tile_shape
+
+# Or-opt'ta taşınan en uzun durak dizisi
+OR_OPT_MAX_SEGMENT = 3
+# Bu değerden küçük kazançlar (km) kayan nokta gürültüsü sayılır
+_MIN_GAIN_KM = 1e-9
+
+
+def symmetric_distance_matrix(lats: np.ndarray, lons: np.ndarray, method: str = "haversine",
+                              max_memory_mb: float = DEFAULT_MATRIX_MEMORY_MB) -> np.ndarray:
+    """
+    Noktalar arası simetrik mesafe matrisi (kilometre). Satır blokları yalnızca
+    köşegen ve sağındaki sütunlar için hesaplanır, alt üçgen aynalanır; hesap
+    tam matrisin yaklaşık yarısıdır.
+    """
+    n = lats.size
+    matrix = np.empty((n, n))
+    block = matrix_tile_shape(n, n, method, max_memory_mb)[0]
+    for row in range(0, n, block):
+        end = min(row + block, n)
+        tile = distance_array(lats[row:end, np.newaxis], lons[row:end, np.newaxis],
+                              lats[np.newaxis, row:], lons[np.newaxis, row:], method)
+        matrix[row:end, row:] = tile
+        matrix[row:, row:end] = tile.T
+    return matrix
+
+
+def _route_length(matrix: np.ndarray, tour: np.ndarray) -> float:
+    return float(matrix[tour[:-1], tour[1:]].sum())
+
+
+def _improvement_pct(baseline_km: float, total_km: float) -> float:
+    return round((baseline_km - total_km) / baseline_km * 100, 2) if baseline_km > 0 else 0.0
+
+
+def nearest_neighbor_tour(matrix: np.ndarray) -> np.ndarray:
+    """
+    Başlangıç (0) düğümünden her adımda en yakın ziyaret edilmemiş durağa giden
+    rota. Son düğüm (bitiş) sabittir ve sona eklenir.
+    """
+    end = matrix.shape[0] - 1
+    tour = np.empty(end + 1, dtype=np.int64)
+    tour[0], tour[end] = 0, end
+    visited = np.zeros(end + 1, dtype=bool)
+    visited[0] = visited[end] = True
+    current = 0
+    for position in range(1, end):
+        row = np.where(visited, np.inf, matrix[current])
+        current = int(np.argmin(row))
+        tour[position] = current
+        visited[current] = True
+    return tour
+
+
+def _mark(active: np.ndarray, tour: np.ndarray, positions) -> None:
+    """Değişen kenarların çevresindeki düğümleri yeniden incelenecek olarak işaretler"""
+    for position in positions:
+        active[tour[max(position - OR_OPT_MAX_SEGMENT, 0):position + 2]] = True
+
+
+def _two_opt_pass(matrix: np.ndarray, tour: np.ndarray, edges: np.ndarray,
+                  active: np.ndarray, deadline: float) -> int:
+    """
+    İşaretli her p konumu için (t[p], t[p+1]) kenarını diğer tüm kenarlarla
+    eşleştirir: (t[i], t[i+1]) ve (t[j], t[j+1]) kenarlarını (t[i], t[j]) ve
+    (t[i+1], t[j+1]) ile değiştiren en iyi hamleyi bulur ve t[i+1..j]'yi ters
+    çevirir. Uygulanan hamle sayısını döndürür.
+    """
+    moves = 0
+    last = tour.size - 1
+    for p in range(last):
+        if not active[tour[p]]:
+            continue
+        if time.perf_counter() > deadline:
+            break
+        active[tour[p]] = False
+        a, b = tour[p], tour[p + 1]
+        # kazanç = d(t[i],t[i+1]) + d(t[j],t[j+1]) - d(t[i],t[j]) - d(t[i+1],t[j+1])
+        after = edges[p] + edges[p + 2:] - matrix[a, tour[p + 2:last]] - matrix[b, tour[p + 3:]]
+        before = edges[:max(p - 1, 0)] + edges[p] - matrix[a, tour[:max(p - 1, 0)]] - matrix[b, tour[1:p]]
+        best_after = int(np.argmax(after)) if after.size else 0
+        best_before = int(np.argmax(before)) if before.size else 0
+        gain_after = after[best_after] if after.size else 0.0
+        gain_before = before[best_before] if before.size else 0.0
+        if max(gain_after, gain_before) <= _MIN_GAIN_KM:
+            continue
+        i, j = (p, p + 2 + best_after) if gain_after >= gain_before else (best_before, p)
+        tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1].copy()
+        edges[i + 1:j] = edges[i + 1:j][::-1].copy()
+        edges[i] = matrix[tour[i], tour[i + 1]]
+        edges[j] = matrix[tour[j], tour[j + 1]]
+        _mark(active, tour, (i, j))
+        moves += 1
+    return moves
+
+
+def _or_opt_pass(matrix: np.ndarray, tour: np.ndarray, edges: np.ndarray,
+                 active: np.ndarray, deadline: float) -> int:
+    """
+    İşaretli konumlardan başlayan 1..OR_OPT_MAX_SEGMENT uzunluğundaki durak
+    dizilerini (gerekirse ters çevirerek) rotada daha ucuz bir kenarın arasına
+    taşır. Uygulanan hamle sayısını döndürür.
+    """
+    moves = 0
+    last = tour.size - 1
+    i = 1
+    while i < last:
+        if not active[tour[i]]:
+            i += 1
+            continue
+        if time.perf_counter() > deadline:
+            break
+        best = None
+        for length in range(1, min(OR_OPT_MAX_SEGMENT, last - i) + 1):
+            first, final = tour[i], tour[i + length - 1]
+            removal = edges[i - 1] + edges[i + length - 1] - matrix[tour[i - 1], tour[i + length]]
+            # j. kenar (t[j], t[j+1]) arasına ekleme maliyeti; dizinin kendi kenarları hariç
+            to_first, to_final = matrix[first, tour], matrix[final, tour]
+            forward = to_first[:-1] + to_final[1:] - edges
+            backward = to_final[:-1] + to_first[1:] - edges
+            insertion = np.minimum(forward, backward)
+            insertion[i - 1:i + length] = np.inf
+            j = int(np.argmin(insertion))
+            gain = removal - insertion[j]
+            if gain > _MIN_GAIN_KM and (best is None or gain > best[0]):
+                best = (gain, length, j, backward[j] < forward[j])
+        if best is None:
+            active[tour[i]] = False
+            i += 1
+            continue
+        _, length, j, reverse = best
+        segment = tour[i:i + length][::-1] if reverse else tour[i:i + length]
+        rest = np.concatenate((tour[:i], tour[i + length:]))
+        at = j + 1 if j < i else j + 1 - length
+        tour[:] = np.concatenate((rest[:at], segment, rest[at:]))
+        edges[:] = matrix[tour[:-1], tour[1:]]
+        _mark(active, tour, (i - 1, at - 1, at + length - 1))
+        moves += 1
+    return moves
+
+
+def optimize_route(start_lat: float, start_lon: float, lats, lons,
+                   method: str = "haversine", return_to_start: bool = False,
+                   time_limit_s: float = DEFAULT_ROUTE_TIME_LIMIT_S) -> dict:
+    """
+    Başlangıç noktasından tüm durakları ziyaret eden kısa bir sıra bulur.
+
+    Süre bütçesi matris hesabını da kapsar; en yakın komşu rotası her zaman
+    kurulur, iyileştirme bütçe dolunca kesilir.
+
+    Args:
+        start_lat, start_lon: Başlangıç noktası
+        lats, lons: Durak koordinatları
+        method: haversine veya vincenty
+        return_to_start: True ise rota başlangıç noktasında biter
+        time_limit_s: Süre bütçesi (saniye)
+
+    Returns:
+        order (durak indeksleri, ziyaret sırasıyla), legs_km (her durağa önceki
+        noktadan; dönüşlü rotada son eleman başlangıca dönüş), total_km,
+        nearest_neighbor_km, naive_km (başlangıca uzaklığa göre sıralı rota),
+        improvement_pct / nearest_neighbor_improvement_pct (bu rotalara göre kısalma, %),
+        two_opt_moves, or_opt_moves, passes, converged (yerel en iyiye ulaşıldı mı), elapsed_s
+
+    Raises:
+        ValueError: Durak yoksa, MAX_ROUTE_STOPS'u aşıyorsa veya süre bütçesi geçersizse
+    """
+    started = time.perf_counter()
+    deadline = started + time_limit_s
+    lats, lons = coordinate_arrays(lats, lons)
+    n = lats.size
+    if n == 0:
+        raise ValueError("En az bir durak gerekli")
+    if n > MAX_ROUTE_STOPS:
+        raise ValueError(f"Rota en fazla {MAX_ROUTE_STOPS} durak içerebilir")
+    if not 0 < time_limit_s <= MAX_ROUTE_TIME_LIMIT_S:
+        raise ValueError(f"Süre bütçesi 0 ile {MAX_ROUTE_TIME_LIMIT_S:g} saniye arasında olmalı")
+
+    # Düğümler: 0 başlangıç, 1..n duraklar, n+1 bitiş
+    all_lats = np.concatenate(([start_lat], lats))
+    all_lons = np.concatenate(([start_lon], lons))
+    matrix = np.empty((n + 2, n + 2))
+    matrix[:n + 1, :n + 1] = symmetric_distance_matrix(all_lats, all_lons, method)
+    matrix[:n + 1, n + 1] = matrix[:n + 1, 0] if return_to_start else 0.0
+    matrix[n + 1, :] = matrix[:, n + 1]
+    matrix[n + 1, n + 1] = 0.0
+
+    naive = np.concatenate(([0], 1 + np.argsort(matrix[0, 1:n + 1], kind="stable"), [n + 1]))
+    tour = nearest_neighbor_tour(matrix)
+    nearest_neighbor_km = _route_length(matrix, tour)
+
+    # Don't-look bitleri: yalnızca çevresi değişen düğümler yeniden incelenir
+    edges = matrix[tour[:-1], tour[1:]]
+    two_opt_active = np.ones(n + 2, dtype=bool)
+    or_opt_active = np.ones(n + 2, dtype=bool)
+    two_opt_moves = or_opt_moves = passes = 0
+    converged = full_check = False
+    while time.perf_counter() < deadline:
+        passes += 1
+        moves = _two_opt_pass(matrix, tour, edges, two_opt_active, deadline)
+        two_opt_moves += moves
+        or_opt_active |= two_opt_active
+        if not moves:
+            moves = _or_opt_pass(matrix, tour, edges, or_opt_active, deadline)
+            or_opt_moves += moves
+            two_opt_active |= or_opt_active
+        if moves:
+            full_check = False
+        elif time.perf_counter() >= deadline:
+            break
+        elif full_check:
+            converged = True
+            break
+        else:
+            # Bitler ters çevrilen dizilerin yön değişimini izlemez; bitince tüm
+            # düğümler bir kez daha incelenir, hamle çıkmazsa rota yerel en iyidir
+            two_opt_active[:] = or_opt_active[:] = full_check = True
+
+    legs = matrix[tour[:-1], tour[1:]]
+    if not return_to_start:
+        legs = legs[:-1]
+    total_km = float(legs.sum())
+    naive_km = _route_length(matrix, naive)
+    return {
+        "order": tour[1:-1] - 1,
+        "legs_km": legs,
+        "total_km": total_km,
+        "nearest_neighbor_km": nearest_neighbor_km,
+        "naive_km": naive_km,
+        "improvement_pct": _improvement_pct(naive_km, total_km),
+        "nearest_neighbor_improvement_pct": _improvement_pct(nearest_neighbor_km, total_km),
+        "two_opt_moves": two_opt_moves,
+        "or_opt_moves": or_opt_moves,
+        "passes": passes,
+        "converged": converged,
+        "elapsed_s": time.perf_counter() - started
+    }
@@ -4,14 +4,49 @@ Kuş Uçumu Mesafe Hesaplama Web Server
 FastAPI kullanarak REST API sağlar
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Literal
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, validator
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional, Literal
+import asyncio
+import json
 import math
+import os
+import numpy as np
 import uvicorn
 
+from distvec import (
+    AUTO_METHODS,
+    DEFAULT_MATRIX_MEMORY_MB,
+    DEFAULT_MAX_ERROR_M,
+    auto_distance,
+    auto_distance_array,
+    auto_method_counts,
+    distance_array,
+    distance_matrix,
+    points_within_radius,
+    scalar_kernel,
+    sparse_distance_matrix,
+)
+from distconst import DEFAULT_MAX_PAIRS, DENSE_MATRIX_MAX_CELLS, MAX_STORED_NAME_BYTES
+from distindex import SpatialIndex, proximity_pairs
+from distroute import DEFAULT_ROUTE_TIME_LIMIT_S, MAX_ROUTE_STOPS, MAX_ROUTE_TIME_LIMIT_S, optimize_route
+from distpath import DEFAULT_CHUNK_SIZE, PATH_FILE_FORMATS, PathAccumulator, detect_path_format, parse_point_sequence, path_length, stream_parser
+from distfence import geofences_from_env, geojson_rings, polygon_rings
+from disttrack import TrackingSession, max_tracked_cells_from_env, parse_positions
+from distsets import POINT_FILE_FORMATS, PointSet, detect_format, parse_point_file, registry_from_env
+from distcache import cache_from_env
+from distexec import executor_from_env
+from distcompress import CompressionMiddleware, compression_options_from_env
+from distio import RAW_CONTENT_TYPE, parse_binary_coordinates, parse_coordinate_pairs, validate_coordinate_arrays
+import distjson
+import distmetrics
+import distvec
+from distmetrics import MetricsMiddleware, mark_phase, record_batch
+
 
 # Pydantic modelleri
 class CoordinatePoint(BaseModel):
@@ -25,13 +60,121 @@ class DistanceRequest(BaseModel):
     lon1: float = Field(..., ge=-180, le=180, description="İlk nokta boylam")
     lat2: float = Field(..., ge=-90, le=90, description="İkinci nokta enlem")
     lon2: float = Field(..., ge=-180, le=180, description="İkinci nokta boylam")
-    method: Literal["haversine", "vincenty"] = Field("haversine", description="Hesaplama yöntemi")
+    method: Literal["haversine", "vincenty", "auto"] = Field("haversine", description="Hesaplama yöntemi (auto: hata bütçesini karşılayan en ucuz yöntem)")
+    max_error_m: float = Field(DEFAULT_MAX_ERROR_M, gt=0, description="auto yönteminde izin verilen en fazla hata (metre)")
     unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
 
 
 class BatchDistanceRequest(BaseModel):
     reference_point: CoordinatePoint
-    target_points: List[CoordinatePoint]
+    target_points: Optional[List[CoordinatePoint]] = Field(None, description="Hedef noktalar (target_set_id verilmezse)")
+    target_set_id: Optional[str] = Field(None, description="Hedef olarak kullanılacak kayıtlı nokta kümesi (target_points yerine)")
+    method: Literal["haversine", "vincenty", "auto"] = Field("haversine", description="Hesaplama yöntemi (auto: hata bütçesini karşılayan en ucuz yöntem)")
+    max_error_m: float = Field(DEFAULT_MAX_ERROR_M, gt=0, description="auto yönteminde izin verilen en fazla hata (metre)")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+    stream: bool = Field(False, description="True ise sonuçlar giriş sırasıyla NDJSON akışı olarak döner")
+    format: Literal["full", "compact"] = Field("full", description="compact: yalnızca mesafeye göre sıralı giriş indeksleri ve mesafe dizileri döner")
+
+
+class ColumnarBatchRequest(BaseModel):
+    reference_point: CoordinatePoint
+    lats: List[float] = Field(..., description="Hedef enlemleri (lons ile aynı uzunlukta)")
+    lons: List[float] = Field(..., description="Hedef boylamları (lats ile aynı uzunlukta)")
+    method: Literal["haversine", "vincenty", "auto"] = Field("haversine", description="Hesaplama yöntemi (auto: hata bütçesini karşılayan en ucuz yöntem)")
+    max_error_m: float = Field(DEFAULT_MAX_ERROR_M, gt=0, description="auto yönteminde izin verilen en fazla hata (metre)")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+
+
+class PairDistanceRequest(BaseModel):
+    pairs: List[List[float]] = Field(..., min_length=1, description="[lat1, lon1, lat2, lon2] dizilerinden oluşan çift listesi")
+    method: Literal["haversine", "vincenty", "auto"] = Field("haversine", description="Hesaplama yöntemi (auto: hata bütçesini karşılayan en ucuz yöntem)")
+    max_error_m: float = Field(DEFAULT_MAX_ERROR_M, gt=0, description="auto yönteminde izin verilen en fazla hata (metre)")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+
+
+class ProximityPairsRequest(BaseModel):
+    target_points: Optional[List[CoordinatePoint]] = Field(None, description="Noktalar (target_set_id verilmezse)")
+    target_set_id: Optional[str] = Field(None, description="Kendi içinde eşleştirilecek kayıtlı nokta kümesi (target_points yerine)")
+    threshold_m: float = Field(..., gt=0, description="Eşik mesafesi (metre); bu mesafede veya daha yakın çiftler döner")
+    method: Literal["haversine", "vincenty"] = Field("haversine", description="Adayları doğrulama yöntemi")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+    max_pairs: int = Field(DEFAULT_MAX_PAIRS, ge=1, description="En fazla döndürülecek çift sayısı; aşılırsa truncated true olur")
+    format: Literal["full", "compact"] = Field("full", description="compact: yalnızca indeks ve mesafe dizileri döner")
+
+
+class RouteRequest(BaseModel):
+    start_point: CoordinatePoint
+    target_points: Optional[List[CoordinatePoint]] = Field(None, min_length=1, description="Ziyaret edilecek duraklar (target_set_id verilmezse)")
+    target_set_id: Optional[str] = Field(None, description="Durak olarak kullanılacak kayıtlı nokta kümesi (target_points yerine)")
+    method: Literal["haversine", "vincenty"] = Field("haversine", description="Mesafe matrisi yöntemi")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+    return_to_start: bool = Field(False, description="Rota başlangıç noktasına dönerek biter")
+    time_limit_s: float = Field(DEFAULT_ROUTE_TIME_LIMIT_S, gt=0, le=MAX_ROUTE_TIME_LIMIT_S, description="Süre bütçesi (saniye); iyileştirme bütçe dolunca kesilir")
+    format: Literal["full", "compact"] = Field("full", description="compact: yalnızca sıra (order) ve ayak mesafeleri (legs) dizileri döner")
+
+
+class GeofenceRequest(BaseModel):
+    fence_id: str = Field(..., min_length=1, max_length=MAX_STORED_NAME_BYTES, description="Çit adı (aynı adla tekrar kayıt eskisini değiştirir)")
+    polygon: Optional[List[List[float]]] = Field(None, description="Dış halka: [lat, lon] köşeleri (geojson verilmezse)")
+    holes: List[List[List[float]]] = Field(default_factory=list, description="Delik halkaları ([lat, lon] köşeleri)")
+    geojson: Optional[dict] = Field(None, description="GeoJSON Polygon/MultiPolygon, Feature veya FeatureCollection (polygon yerine)")
+
+
+class GeofenceQueryRequest(BaseModel):
+    fence_ids: List[str] = Field(..., min_length=1, description="Sorgulanacak kayıtlı çit adları")
+    target_points: Optional[List[CoordinatePoint]] = Field(None, description="Sorgu noktaları (target_set_id verilmezse)")
+    target_set_id: Optional[str] = Field(None, description="Sorgulanacak kayıtlı nokta kümesi (target_points yerine)")
+    include_distance: bool = Field(True, description="Çit sınırına büyük daire mesafelerini de döndür")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Mesafe birimi")
+
+
+class TrackingSubscription(BaseModel):
+    target_points: Optional[List[CoordinatePoint]] = Field(None, description="Sabit hedef noktalar (target_set_id verilmezse)")
+    target_set_id: Optional[str] = Field(None, description="Hedef olarak kullanılacak kayıtlı nokta kümesi (target_points yerine)")
+    method: Literal["haversine", "vincenty"] = Field("haversine", description="Hesaplama yöntemi")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Mesafe ve eşik birimi")
+    thresholds: List[float] = Field(default_factory=list, description="Giriş/çıkış olayı üretilecek eşik mesafeleri (unit cinsinden)")
+    distances: bool = Field(True, description="Değişen mesafeleri gönder; False ise yalnızca en yakın hedef ve olaylar")
+    min_change: float = Field(0.0, ge=0, description="Bir mesafenin yeniden gönderilmesi için gereken en küçük değişim (unit cinsinden)")
+
+
+class PathLengthRequest(BaseModel):
+    points: List[List[float]] = Field(..., min_length=1, description="Sıralı [lat, lon] noktaları (iz veya rota)")
+    method: Literal["haversine", "vincenty", "auto"] = Field("haversine", description="Hesaplama yöntemi (auto: hata bütçesini karşılayan en ucuz yöntem)")
+    max_error_m: float = Field(DEFAULT_MAX_ERROR_M, gt=0, description="auto yönteminde izin verilen en fazla hata (metre)")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+    include_cumulative: bool = Field(True, description="Nokta başına kümülatif mesafeler (ilk nokta 0)")
+    include_segments: bool = Field(False, description="Ardışık nokta çiftlerinin segment mesafeleri")
+
+
+class DistanceMatrixRequest(BaseModel):
+    origins: List[CoordinatePoint] = Field(..., min_length=1, description="Başlangıç noktaları (matris satırları)")
+    destinations: List[CoordinatePoint] = Field(..., min_length=1, description="Varış noktaları (matris sütunları)")
+    method: Literal["haversine", "vincenty"] = Field("haversine", description="Hesaplama yöntemi")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+    max_distance: Optional[float] = Field(None, gt=0, description="Verilirse yalnızca bu mesafe içindeki çiftler seyrek liste olarak döner")
+    max_memory_mb: float = Field(DEFAULT_MATRIX_MEMORY_MB, gt=0, description="Karo hesabı için ara bellek sınırı (MB)")
+
+
+class PointSetRequest(BaseModel):
+    set_id: str = Field(..., min_length=1, max_length=MAX_STORED_NAME_BYTES, description="Nokta kümesi adı (aynı adla tekrar kayıt eskisini değiştirir)")
+    points: List[CoordinatePoint] = Field(..., min_length=1, description="Kümedeki noktalar")
+
+
+class NearestPointsRequest(BaseModel):
+    set_id: str = Field(..., description="Kayıtlı nokta kümesi adı")
+    lat: float = Field(..., ge=-90, le=90, description="Sorgu noktası enlem")
+    lon: float = Field(..., ge=-180, le=180, description="Sorgu noktası boylam")
+    k: int = Field(10, ge=1, description="Döndürülecek nokta sayısı")
+    method: Literal["haversine", "vincenty"] = Field("haversine", description="Sıralama yöntemi")
+    unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
+
+
+class RadiusSearchRequest(BaseModel):
+    center_point: CoordinatePoint
+    radius: float = Field(..., ge=0, description="Yarıçap (unit cinsinden)")
+    target_points: Optional[List[CoordinatePoint]] = Field(None, description="Hedef noktalar (target_set_id verilmezse)")
+    target_set_id: Optional[str] = Field(None, description="Hedef olarak kullanılacak kayıtlı nokta kümesi (target_points yerine)")
     method: Literal["haversine", "vincenty"] = Field("haversine", description="Hesaplama yöntemi")
     unit: Literal["km", "miles", "nautical_miles"] = Field("km", description="Sonuç birimi")
 
@@ -41,6 +184,8 @@ class DistanceResponse(BaseModel):
     unit: str
     method: str
     coordinates: dict
+    method_used: Optional[str] = None
+    max_error_m: Optional[float] = None
 
 
 class BatchDistanceResponse(BaseModel):
@@ -49,6 +194,51 @@ class BatchDistanceResponse(BaseModel):
     unit: str
     method: str
     total_points: int
+    max_error_m: Optional[float] = None
+    method_counts: Optional[dict] = None
+
+
+class NearestPointsResponse(BaseModel):
+    set_id: str
+    query_point: dict
+    neighbors: List[dict]
+    unit: str
+    method: str
+    k: int
+
+
+class RadiusSearchResponse(BaseModel):
+    center_point: dict
+    radius: float
+    points: List[dict]
+    unit: str
+    method: str
+    total_points: int
+    pruned_points: int
+    evaluated_points: int
+    matched_points: int
+
+
+class DistanceMatrixResponse(BaseModel):
+    origins: List[str]
+    destinations: List[str]
+    unit: str
+    method: str
+    shape: List[int]
+    matrix: Optional[List[List[float]]] = None
+    max_distance: Optional[float] = None
+    pairs: Optional[List[dict]] = None
+    total_pairs: Optional[int] = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    distjson ile (orjson yüklüyse orjson) kompakt serileştiren JSON yanıtı;
+    NumPy dizileri tolist() olmadan doğrudan yazılabilir
+    """
+    
+    def render(self, content) -> bytes:
+        return distjson.dumps_bytes(content)
 
 
 # Mesafe hesaplama fonksiyonları
@@ -142,8 +332,11 @@ def vincenty_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
         
         iteration += 1
     
+    distmetrics.VINCENTY_ITERATIONS.observe(iteration)
+    
     if iteration >= iteration_limit:
         # Yakınsama sağlanamazsa Haversine kullan
+        distmetrics.VINCENTY_FALLBACKS.inc()
         return haversine_distance(lat1, lon1, lat2, lon2)
     
     u2 = cos2_alpha * (a ** 2 - b ** 2) / (b ** 2)
@@ -171,13 +364,174 @@ def convert_unit(distance_km: float, unit: str) -> tuple[float, str]:
         return distance_km, "km"
 
 
+class DistanceCoalescer:
+    """
+    Eşzamanlı tekil mesafe isteklerini kısa bir pencerede toplayıp tek vektörel
+    çağrıda hesaplar.
+    
+    İlk istek geldiğinde window_ms sonra (ya da max_batch dolunca hemen) bekleyen
+    tüm istekler yönteme göre gruplanıp distance_array ile hesaplanır ve her
+    isteğin future'ı kendi sonucuyla çözülür. Son toplu işlem tek istekten
+    oluşuyorsa (düşük trafik) pencere beklenmez; yalnızca aynı olay döngüsü
+    turunda gelen istekler birleştirilir.
+    """
+    
+    def __init__(self, window_ms: float = 1.0, max_batch: int = 1024):
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._pending: list = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._idle = True
+        self.batches = 0
+        self.requests = 0
+    
+    async def submit(self, lat1: float, lon1: float, lat2: float, lon2: float, method: str) -> float:
+        """İsteği sıraya ekler ve toplu hesaplama sonucunu bekler (kilometre)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((lat1, lon1, lat2, lon2, method, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self._idle:
+                self._flush_handle = loop.call_soon(self._flush)
+            else:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Bekleyen istekleri yönteme göre gruplayıp tek seferde hesapla"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self._idle = len(batch) == 1
+        self.batches += 1
+        self.requests += len(batch)
+        
+        for method in {item[4] for item in batch}:
+            group = [item for item in batch if item[4] == method]
+            try:
+                coords = np.array([item[:4] for item in group], dtype=np.float64)
+                distances = distance_array(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3], method)
+            except Exception as e:
+                for item in group:
+                    if not item[5].done():
+                        item[5].set_exception(e)
+                continue
+            
+            for item, distance in zip(group, distances.tolist()):
+                if not item[5].done():
+                    item[5].set_result(distance)
+    
+    def stats(self) -> dict:
+        """Toplu işlem sayaçlarını döndür"""
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "requests": self.requests,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0
+        }
+
+
+def coalescer_from_env() -> Optional[DistanceCoalescer]:
+    """
+    DIST_COALESCE=1 ise ortam değişkenlerinden istek birleştirici oluşturur.
+    
+    - DIST_COALESCE_WINDOW_MS: Toplama penceresi (milisaniye)
+    - DIST_COALESCE_MAX_BATCH: Pencere beklenmeden hesaplanacak en fazla istek sayısı
+    """
+    if os.environ.get("DIST_COALESCE", "0").lower() not in ("1", "true", "yes"):
+        return None
+    return DistanceCoalescer(
+        window_ms=float(os.environ.get("DIST_COALESCE_WINDOW_MS", 1.0)),
+        max_batch=int(os.environ.get("DIST_COALESCE_MAX_BATCH", 1024))
+    )
+
+
+# NDJSON akışında her adımda hesaplanan hedef sayısı
+STREAM_CHUNK_SIZE = 8192
+
+# Diskte bellek eşlemeli saklanan, worker'lar ve MCP süreçleriyle paylaşılan nokta kümeleri
+# (DIST_POINT_SETS_DIR)
+point_sets = registry_from_env()
+
+
+def get_point_set(set_id: str) -> PointSet:
+    """Kayıtlı nokta kümesini döndürür; yoksa 404"""
+    try:
+        point_set = point_sets.get(set_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if point_set is None:
+        raise HTTPException(status_code=404, detail=f"Kayıtlı nokta kümesi bulunamadı: {set_id}")
+    return point_set
+
+
+def resolve_targets(target_points: Optional[List[CoordinatePoint]],
+                    target_set_id: Optional[str]) -> tuple[np.ndarray, np.ndarray, Callable[[int], str]]:
+    """
+    İstekteki hedefleri (satır içi noktalar veya kayıtlı küme) enlem/boylam
+    dizilerine ve indeksten nokta adına giden bir fonksiyona çevirir.
+    Kayıtlı kümelerde diziler kopyalanmaz (bellek eşlemeli).
+    """
+    if (target_points is None) == (target_set_id is None):
+        raise HTTPException(status_code=422, detail="target_points veya target_set_id'den yalnızca biri verilmeli")
+    if target_set_id is not None:
+        point_set = get_point_set(target_set_id)
+        return point_set.lats, point_set.lons, point_set.name
+    lats = np.fromiter((t.lat for t in target_points), dtype=np.float64, count=len(target_points))
+    lons = np.fromiter((t.lon for t in target_points), dtype=np.float64, count=len(target_points))
+    return lats, lons, lambda i: target_points[i].name or f"Nokta {i+1}"
+
+# Diskte saklanan, her süreçte bir kez hazırlanan coğrafi çitler (DIST_GEOFENCES_DIR)
+geofences = geofences_from_env()
+
+# /distance sonuçları için LRU önbellek (DIST_CACHE_SIZE / DIST_CACHE_PRECISION)
+distance_cache = cache_from_env()
+
+# CPU yoğun işler için yürütücü (DIST_EXEC_* ortam değişkenleri)
+executor = executor_from_env()
+
+# Tekil /distance istekleri için isteğe bağlı birleştirici (DIST_COALESCE=1)
+coalescer = coalescer_from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Uygulama kapanırken yürütücü havuzlarını kapat"""
+    yield
+    executor.shutdown()
+
+
 # FastAPI uygulaması
 app = FastAPI(
     title="Kuş Uçumu Mesafe Hesaplama API",
     description="İki koordinat noktası arasındaki en kısa mesafeyi hesaplar",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# Vektörel Vincenty çekirdeğinin iterasyon sayılarını metriklere aktar
+distvec.vincenty_observer = distmetrics.observe_vincenty
+distvec.vincenty_scalar_observer = distmetrics.observe_vincenty_scalar
+
+# Büyük JSON/NDJSON yanıtları için gzip/brotli (DIST_COMPRESS_* ortam değişkenleri);
+# metrik ara katmanının içinde olduğundan sıkıştırma süresi 'serialization' aşamasına yazılır
+compression_options = compression_options_from_env()
+if compression_options["min_size"] >= 0:
+    app.add_middleware(CompressionMiddleware, **compression_options)
+
+# İstek süresi ve aşama metrikleri
+app.add_middleware(MetricsMiddleware)
+
 # CORS middleware ekle
 app.add_middleware(
     CORSMiddleware,
@@ -223,6 +577,77 @@ async def root():
         <div class="endpoint">
             <div class="method">POST /batch-distance</div>
             <p>Bir referans noktadan birden fazla noktaya mesafe hesaplar</p>
+            <p><code>"stream": true</code> ile sonuçlar giriş sırasıyla NDJSON akışı olarak döner</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /batch-distance/columnar</div>
+            <p>Paralel <code>lats</code>/<code>lons</code> dizileriyle toplu mesafe; sonuçlar giriş sırasıyla dizi olarak döner</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /batch-distance/binary</div>
+            <p>Ham float64 (little-endian), .npy veya Arrow IPC gövdesiyle toplu mesafe</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /distances</div>
+            <p>Birbirinden bağımsız birçok nokta çiftinin mesafesini tek istekte hesaplar</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /distance-matrix</div>
+            <p>İki nokta listesi arasındaki N×M mesafe matrisini hesaplar (yoğun veya max_distance ile seyrek)</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /proximity-pairs</div>
+            <p>Bir nokta kümesinde eşik mesafesinden (metre) yakın tüm nokta çiftlerini ızgara ile, tüm çiftleri taramadan bulur</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">WebSocket /ws/tracking</div>
+            <p>Canlı takip: hedef kümesine abone olun, araç konumlarını gönderin; değişen mesafeler, en yakın hedef değişimleri ve eşik giriş/çıkış olayları aynı bağlantıdan döner</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /path-length</div>
+            <p>Sıralı bir nokta dizisinin (GPS izi) toplam, kümülatif ve isteğe bağlı segment mesafelerini hesaplar; /path-length/upload GPX veya CSV dosyasını akış halinde okur</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /point-sets</div>
+            <p>Bir nokta kümesini paylaşılan depoya kaydeder; batch-distance, points-within-radius ve nearest-points kümeye adıyla başvurabilir</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /point-sets/upload</div>
+            <p>CSV veya GeoJSON gövdesini nokta kümesi olarak yükler</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /nearest-points</div>
+            <p>Kayıtlı bir kümede verilen konuma en yakın k noktayı bulur</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /points-within-radius</div>
+            <p>Merkez noktaya verilen yarıçap içindeki tüm hedef noktaları bulur</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /optimize-route</div>
+            <p>Başlangıç noktasından tüm durakları ziyaret eden kısa bir sıra bulur (en yakın komşu + 2-opt/Or-opt, süre bütçeli)</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /geofences</div>
+            <p>Bir çokgeni (delikli veya GeoJSON) coğrafi çit olarak kaydeder; GET ile listelenir, DELETE /geofences/{fence_id} ile silinir</p>
+        </div>
+        
+        <div class="endpoint">
+            <div class="method">POST /geofences/query</div>
+            <p>Nokta grubunun her çitin içinde olup olmadığını ve çit sınırına mesafesini hesaplar</p>
         </div>
         
         <div class="endpoint">
@@ -230,6 +655,11 @@ async def root():
             <p>API sağlık durumu kontrolü</p>
         </div>
         
+        <div class="endpoint">
+            <div class="method">GET /metrics</div>
+            <p>Prometheus metin biçiminde gecikme, toplu iş boyutu ve Vincenty iterasyon metrikleri</p>
+        </div>
+        
         <h2>📖 Dokümantasyon</h2>
         <p><a href="/docs">Swagger UI</a> | <a href="/redoc">ReDoc</a></p>
         
@@ -249,25 +679,57 @@ async def root():
 @app.get("/health")
 async def health_check():
     """API sağlık durumu kontrolü"""
-    return {"status": "healthy", "message": "Kuş uçumu mesafe hesaplama API çalışıyor"}
+    return {
+        "status": "healthy",
+        "message": "Kuş uçumu mesafe hesaplama API çalışıyor",
+        "kernel_backend": distvec.kernel_backend(),
+        "cache": distance_cache.stats(),
+        "coalescer": coalescer.stats() if coalescer is not None else None
+    }
+
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metin biçiminde metrikler"""
+    return PlainTextResponse(distmetrics.registry.render(), media_type=distmetrics.CONTENT_TYPE)
 
-@app.post("/distance", response_model=DistanceResponse)
+
+@app.post("/distance", response_model=DistanceResponse, response_model_exclude_none=True)
 async def calculate_distance(request: DistanceRequest):
     """
     İki koordinat noktası arasındaki kuş uçumu mesafesini hesaplar
     
     - **lat1, lon1**: İlk nokta koordinatları
     - **lat2, lon2**: İkinci nokta koordinatları  
-    - **method**: Hesaplama yöntemi (haversine/vincenty)
+    - **method**: Hesaplama yöntemi (haversine/vincenty/auto)
+    - **max_error_m**: auto yönteminde izin verilen en fazla hata (metre)
     - **unit**: Sonuç birimi (km/miles/nautical_miles)
     """
+    mark_phase("validation")
     try:
-        # Mesafe hesapla
-        if request.method == "vincenty":
-            distance_km = vincenty_distance(request.lat1, request.lon1, request.lat2, request.lon2)
+        points = (request.lat1, request.lon1, request.lat2, request.lon2)
+        # auto: bütçeyi karşılayan en ucuz yöntem; düzlem/Haversine yeterliyse mesafe de hesaplanır
+        if request.method == "auto":
+            method_used, distance_km = auto_distance(*points, request.max_error_m)
+        else:
+            method_used, distance_km = request.method, None
+        
+        # Mesafe hesapla (önbellek km cinsinden tutar, birim dönüşümü sonra yapılır)
+        if distance_km is not None:
+            pass  # auto: düzlem/Haversine sonucu zaten hesaplandı
+        elif coalescer is not None:
+            distance_km = distance_cache.lookup(*points, method_used)
+            if distance_km is None:
+                distance_km = await coalescer.submit(*points, method_used)
+                distance_cache.store(*points, method_used, distance_km)
         else:
-            distance_km = haversine_distance(request.lat1, request.lon1, request.lat2, request.lon2)
+            distance_km = distance_cache.get_or_compute(
+                *points, method_used,
+                scalar_kernel(method_used)
+                or (vincenty_distance if method_used == "vincenty" else haversine_distance)
+            )
+        record_batch("/distance", 1, method_used)
+        mark_phase("compute")
         
         # Birim dönüştür
         distance_converted, unit_name = convert_unit(distance_km, request.unit)
@@ -279,49 +741,141 @@ async def calculate_distance(request: DistanceRequest):
             coordinates={
                 "point1": {"lat": request.lat1, "lon": request.lon1},
                 "point2": {"lat": request.lat2, "lon": request.lon2}
-            }
+            },
+            method_used=method_used if request.method == "auto" else None,
+            max_error_m=request.max_error_m if request.method == "auto" else None
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Hesaplama hatası: {str(e)}")
 
 
-@app.post("/batch-distance", response_model=BatchDistanceResponse)
+def stream_batch_distances(request: BatchDistanceRequest, target_lats: np.ndarray, target_lons: np.ndarray,
+                           target_name: Callable[[int], str]):
+    """
+    Toplu mesafe sonuçlarını parça parça NDJSON satırları olarak üretir.
+    
+    İlk satır referans nokta, birim ve yöntem bilgisini; sonraki satırlar giriş
+    sırasıyla her hedefin sonucunu içerir. Her adımda yalnızca STREAM_CHUNK_SIZE
+    hedef hesaplandığından bellek kullanımı hedef sayısından bağımsızdır.
+    """
+    ref_lat = request.reference_point.lat
+    ref_lon = request.reference_point.lon
+    ref_name = request.reference_point.name or f"({ref_lat}, {ref_lon})"
+    total = len(target_lats)
+    unit_factor, unit_name = convert_unit(1.0, request.unit)
+    record_batch("/batch-distance", total, request.method)
+    
+    header = {
+        "reference_point": {
+            "name": ref_name,
+            "coordinates": {"lat": ref_lat, "lon": ref_lon}
+        },
+        "unit": unit_name,
+        "method": request.method,
+        "total_points": total
+    }
+    if request.method == "auto":
+        header["max_error_m"] = request.max_error_m
+    yield distjson.dumps(header) + "\n"
+    
+    for start in range(0, total, STREAM_CHUNK_SIZE):
+        chunk_lats = target_lats[start:start + STREAM_CHUNK_SIZE]
+        chunk_lons = target_lons[start:start + STREAM_CHUNK_SIZE]
+        if request.method == "auto":
+            distances, methods_used = auto_distance_array(ref_lat, ref_lon, chunk_lats, chunk_lons, request.max_error_m)
+        else:
+            distances = distance_array(ref_lat, ref_lon, chunk_lats, chunk_lons, request.method)
+        distances *= unit_factor
+        
+        lines = []
+        for i, (lat, lon, distance) in enumerate(zip(chunk_lats.tolist(), chunk_lons.tolist(), distances.tolist()),
+                                                 start=start):
+            line = {
+                "index": i,
+                "target_name": target_name(i),
+                "distance": round(distance, 3),
+                "coordinates": {"lat": lat, "lon": lon}
+            }
+            if request.method == "auto":
+                line["method"] = AUTO_METHODS[methods_used[i - start]]
+            lines.append(distjson.dumps(line))
+        yield "\n".join(lines) + "\n"
+
+
+@app.post("/batch-distance", response_model=BatchDistanceResponse, response_model_exclude_none=True)
 async def batch_distance_calculation(request: BatchDistanceRequest):
     """
     Bir referans noktadan birden fazla noktaya mesafe hesaplar
     
     - **reference_point**: Referans koordinat noktası
     - **target_points**: Hedef koordinat noktaları listesi
-    - **method**: Hesaplama yöntemi (haversine/vincenty)
+    - **target_set_id**: target_points yerine /point-sets ile kaydedilmiş küme adı
+    - **method**: Hesaplama yöntemi (haversine/vincenty/auto)
+    - **max_error_m**: auto yönteminde izin verilen en fazla hata (metre); her sonuçta kullanılan yöntem döner
     - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    - **stream**: True ise sonuçlar sıralanmadan, giriş sırasıyla NDJSON akışı olarak döner
+    - **format**: compact ise hedef adları ve koordinatları geri gönderilmez; mesafeye göre
+      sıralı `indices` (giriş indeksleri) ve `distances` dizileri döner
     """
+    mark_phase("validation")
+    if request.stream and request.format == "compact":
+        raise HTTPException(status_code=422, detail="stream ve format=compact birlikte kullanılamaz")
+    # Hedef koordinatlarını dizilere al (kayıtlı kümede kopyasız) ve tek seferde hesapla
+    target_lats, target_lons, target_name = resolve_targets(request.target_points, request.target_set_id)
+    if request.stream:
+        return StreamingResponse(
+            stream_batch_distances(request, target_lats, target_lons, target_name),
+            media_type="application/x-ndjson"
+        )
+    
     try:
         ref_lat = request.reference_point.lat
         ref_lon = request.reference_point.lon
         ref_name = request.reference_point.name or f"({ref_lat}, {ref_lon})"
+        total = len(target_lats)
+        
+        if request.method == "auto":
+            distances_km, methods_used = await executor.auto_distance_array(
+                ref_lat, ref_lon, target_lats, target_lons, request.max_error_m
+            )
+        else:
+            distances_km = await executor.distance_array(ref_lat, ref_lon, target_lats, target_lons, request.method)
+        record_batch("/batch-distance", total, request.method)
+        mark_phase("compute")
+        
+        # Birim dönüştür
+        distances_converted, unit_name = convert_unit(distances_km, request.unit)
+        
+        if request.format == "compact":
+            # Nokta başına sözlük kurulmaz; sıralama giriş indeksleriyle ifade edilir
+            rounded = np.round(distances_converted, 3)
+            order = np.argsort(rounded, kind="stable")
+            content = {
+                "unit": unit_name,
+                "method": request.method,
+                "total_points": total,
+                "indices": order,
+                "distances": rounded[order]
+            }
+            if request.method == "auto":
+                content["max_error_m"] = request.max_error_m
+                content["methods"] = np.array(AUTO_METHODS)[methods_used[order]].tolist()
+                content["method_counts"] = auto_method_counts(methods_used)
+            return FastJSONResponse(content=content)
         
         results = []
         
-        for i, target in enumerate(request.target_points):
-            target_lat = target.lat
-            target_lon = target.lon
-            target_name = target.name or f"Nokta {i+1}"
-            
-            # Mesafe hesapla
-            if request.method == "vincenty":
-                distance_km = vincenty_distance(ref_lat, ref_lon, target_lat, target_lon)
-            else:
-                distance_km = haversine_distance(ref_lat, ref_lon, target_lat, target_lon)
-            
-            # Birim dönüştür
-            distance_converted, unit_name = convert_unit(distance_km, request.unit)
-            
+        for i, (lat, lon, distance) in enumerate(zip(target_lats.tolist(), target_lons.tolist(),
+                                                      distances_converted.tolist())):
             results.append({
-                "target_name": target_name,
-                "distance": round(distance_converted, 3),
-                "coordinates": {"lat": target_lat, "lon": target_lon}
+                "target_name": target_name(i),
+                "distance": round(distance, 3),
+                "coordinates": {"lat": lat, "lon": lon}
             })
+        if request.method == "auto":
+            for result, code in zip(results, methods_used.tolist()):
+                result["method"] = AUTO_METHODS[code]
         
         # Mesafeye göre sırala
         results.sort(key=lambda x: x["distance"])
@@ -334,42 +888,1020 @@ async def batch_distance_calculation(request: BatchDistanceRequest):
             distances=results,
             unit=unit_name,
             method=request.method,
-            total_points=len(results)
+            total_points=len(results),
+            max_error_m=request.max_error_m if request.method == "auto" else None,
+            method_counts=auto_method_counts(methods_used) if request.method == "auto" else None
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Toplu hesaplama hatası: {str(e)}")
 
 
-@app.get("/distance")
+@app.get("/distance", response_model=DistanceResponse, response_model_exclude_none=True)
 async def calculate_distance_get(
     lat1: float,
     lon1: float, 
     lat2: float,
     lon2: float,
-    method: Literal["haversine", "vincenty"] = "haversine",
-    unit: Literal["km", "miles", "nautical_miles"] = "km"
+    method: Literal["haversine", "vincenty", "auto"] = "haversine",
+    unit: Literal["km", "miles", "nautical_miles"] = "km",
+    max_error_m: float = DEFAULT_MAX_ERROR_M
 ):
     """
     GET isteği ile mesafe hesaplama (URL parametreleri)
     """
     request = DistanceRequest(
         lat1=lat1, lon1=lon1, lat2=lat2, lon2=lon2,
-        method=method, unit=unit
+        method=method, unit=unit, max_error_m=max_error_m
     )
     return await calculate_distance(request)
 
 
-if __name__ == "__main__":
-    print("🚀 Kuş Uçumu Mesafe Hesaplama Web Server başlatılıyor...")
-    print("📍 API Dokümantasyonu: http://localhost:8000")
-    print("📊 Swagger UI: http://localhost:8000/docs")
-    print("📖 ReDoc: http://localhost:8000/redoc")
+async def columnar_batch_response(route: str, ref_lat: float, ref_lon: float, ref_name: Optional[str],
+                                  lats: np.ndarray, lons: np.ndarray,
+                                  method: str, unit: str, accept: Optional[str],
+                                  max_error_m: float = DEFAULT_MAX_ERROR_M) -> Response:
+    """
+    Sütunsal toplu hesaplamayı yapar ve sonucu sütunsal biçimde döndürür.
+    
+    Accept başlığı application/octet-stream ise mesafeler ham little-endian
+    float64 dizisi olarak, aksi halde JSON dizisi olarak döner. auto yönteminde
+    kullanılan yöntemler JSON'da `methods` dizisi, ham çıktıda X-Method-Counts
+    başlığı olarak döner.
+    """
+    try:
+        validate_coordinate_arrays(lats, lons)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    mark_phase("validation")
+    
+    try:
+        if method == "auto":
+            distances_km, methods_used = await executor.auto_distance_array(ref_lat, ref_lon, lats, lons, max_error_m)
+        else:
+            distances_km = await executor.distance_array(ref_lat, ref_lon, lats, lons, method)
+        distances_converted, unit_name = convert_unit(distances_km, unit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Toplu hesaplama hatası: {str(e)}")
+    record_batch(route, int(lats.size), method)
+    mark_phase("compute")
+    
+    if accept and RAW_CONTENT_TYPE in accept:
+        headers = {
+            "X-Unit": unit_name,
+            "X-Method": method,
+            "X-Total-Points": str(lats.size)
+        }
+        if method == "auto":
+            headers["X-Method-Counts"] = ",".join(
+                f"{name}={count}" for name, count in auto_method_counts(methods_used).items()
+            )
+        return Response(
+            content=distances_converted.astype("<f8", copy=False).tobytes(),
+            media_type=RAW_CONTENT_TYPE,
+            headers=headers
+        )
+    
+    # Büyük listelerde jsonable_encoder maliyetinden kaçınmak için doğrudan FastJSONResponse
+    content = {
+        "reference_point": {
+            "name": ref_name or f"({ref_lat}, {ref_lon})",
+            "coordinates": {"lat": ref_lat, "lon": ref_lon}
+        },
+        "distances": np.round(distances_converted, 3),
+        "unit": unit_name,
+        "method": method,
+        "total_points": int(lats.size)
+    }
+    if method == "auto":
+        content["max_error_m"] = max_error_m
+        content["methods"] = np.array(AUTO_METHODS)[methods_used].tolist()
+        content["method_counts"] = auto_method_counts(methods_used)
+    return FastJSONResponse(content=content)
+
+
+@app.post("/batch-distance/columnar")
+async def batch_distance_columnar(request: ColumnarBatchRequest, http_request: Request):
+    """
+    Paralel enlem/boylam dizileriyle toplu mesafe hesaplar
+    
+    Koordinatlar nokta modelleri yerine iki dizi olarak gelir ve tüm dizi
+    üzerinde tek seferde doğrulanır. Sonuçlar sıralanmadan, giriş sırasıyla
+    `distances` dizisinde döner.
+    
+    - **reference_point**: Referans koordinat noktası
+    - **lats, lons**: Hedef koordinat dizileri
+    - **method**: Hesaplama yöntemi (haversine/vincenty/auto)
+    - **max_error_m**: auto yönteminde izin verilen en fazla hata (metre)
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    """
+    lats = np.array(request.lats, dtype=np.float64)
+    lons = np.array(request.lons, dtype=np.float64)
+    return await columnar_batch_response(
+        "/batch-distance/columnar", request.reference_point.lat, request.reference_point.lon, request.reference_point.name,
+        lats, lons, request.method, request.unit, http_request.headers.get("accept"), request.max_error_m
+    )
+
+
+@app.post("/batch-distance/binary")
+async def batch_distance_binary(
+    http_request: Request,
+    ref_lat: float,
+    ref_lon: float,
+    method: Literal["haversine", "vincenty", "auto"] = "haversine",
+    unit: Literal["km", "miles", "nautical_miles"] = "km",
+    layout: Literal["interleaved", "planar"] = "interleaved",
+    ref_name: Optional[str] = None,
+    max_error_m: float = DEFAULT_MAX_ERROR_M
+):
+    """
+    İkili gövdeyle toplu mesafe hesaplar (referans nokta URL parametrelerinde)
+    
+    Desteklenen Content-Type değerleri:
+    - **application/octet-stream**: Ham little-endian float64; `layout=interleaved`
+      (lat0, lon0, lat1, lon1, ...) veya `layout=planar` (tüm enlemler, sonra tüm boylamlar)
+    - **application/x-npy**: (N, 2) veya (2, N) boyutunda .npy dizisi
+    - **application/vnd.apache.arrow.stream / .file**: `lat` ve `lon` sütunlu Arrow IPC (pyarrow gerekir)
+    
+    `Accept: application/octet-stream` ile sonuçlar ham float64 olarak döner.
+    """
+    if not (-90 <= ref_lat <= 90 and -180 <= ref_lon <= 180):
+        raise HTTPException(status_code=422, detail="Referans nokta geçerli enlem/boylam aralığında olmalı")
+    if not max_error_m > 0:
+        raise HTTPException(status_code=422, detail="max_error_m pozitif olmalı (metre)")
+    
+    body = await http_request.body()
+    try:
+        lats, lons = parse_binary_coordinates(body, http_request.headers.get("content-type"), layout)
+    except LookupError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ImportError:
+        raise HTTPException(status_code=415, detail="Arrow IPC desteği için pyarrow yüklü olmalı")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Gövde çözülemedi: {str(e)}")
+    
+    return await columnar_batch_response(
+        "/batch-distance/binary", ref_lat, ref_lon, ref_name, lats, lons, method, unit,
+        http_request.headers.get("accept"), max_error_m
+    )
+
+
+@app.post("/distance-matrix", response_model=DistanceMatrixResponse, response_model_exclude_none=True)
+async def distance_matrix_calculation(request: DistanceMatrixRequest):
+    """
+    İki nokta listesi arasındaki N×M mesafe matrisini hesaplar
+    
+    - **origins**: Başlangıç noktaları (satırlar)
+    - **destinations**: Varış noktaları (sütunlar)
+    - **method**: Hesaplama yöntemi (haversine/vincenty)
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    - **max_distance**: Verilirse seyrek çıktı (yalnızca eşik içindeki çiftler)
+    - **max_memory_mb**: Karo hesabı için ara bellek sınırı
+    """
+    mark_phase("validation")
+    n_rows, n_cols = len(request.origins), len(request.destinations)
+    if request.max_distance is None and n_rows * n_cols > DENSE_MATRIX_MAX_CELLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Yoğun matris en fazla {DENSE_MATRIX_MAX_CELLS} hücre olabilir; daha büyük matrisler için max_distance kullanın"
+        )
+    
+    try:
+        origin_lats = np.fromiter((p.lat for p in request.origins), dtype=np.float64, count=n_rows)
+        origin_lons = np.fromiter((p.lon for p in request.origins), dtype=np.float64, count=n_rows)
+        dest_lats = np.fromiter((p.lat for p in request.destinations), dtype=np.float64, count=n_cols)
+        dest_lons = np.fromiter((p.lon for p in request.destinations), dtype=np.float64, count=n_cols)
+        
+        # Birim çarpanı (km -> istenen birim)
+        unit_factor, unit_name = convert_unit(1.0, request.unit)
+        
+        response = DistanceMatrixResponse(
+            origins=[p.name or f"Nokta {i+1}" for i, p in enumerate(request.origins)],
+            destinations=[p.name or f"Nokta {i+1}" for i, p in enumerate(request.destinations)],
+            unit=unit_name,
+            method=request.method,
+            shape=[n_rows, n_cols]
+        )
+        
+        if request.max_distance is not None:
+            # Seyrek çıktı: yalnızca eşik içindeki çiftler
+            rows, cols, values = await executor.run(
+                executor.work_size(n_rows * n_cols, request.method), sparse_distance_matrix,
+                origin_lats, origin_lons, dest_lats, dest_lons,
+                request.max_distance / unit_factor, request.method, request.max_memory_mb
+            )
+            response.max_distance = request.max_distance
+            response.pairs = [
+                {"origin": i, "destination": j, "distance": round(d * unit_factor, 3)}
+                for i, j, d in zip(rows.tolist(), cols.tolist(), values.tolist())
+            ]
+            response.total_pairs = len(response.pairs)
+        else:
+            matrix = await executor.run(
+                executor.work_size(n_rows * n_cols, request.method), distance_matrix,
+                origin_lats, origin_lons, dest_lats, dest_lons,
+                request.method, request.max_memory_mb
+            )
+            response.matrix = np.round(matrix * unit_factor, 3).tolist()
+        
+        record_batch("/distance-matrix", n_rows * n_cols, request.method)
+        mark_phase("compute")
+        return response
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Matris hesaplama hatası: {str(e)}")
+
+
+@app.post("/point-sets")
+async def register_point_set(request: PointSetRequest):
+    """
+    Bir nokta kümesini paylaşılan depoya kaydeder
+    
+    Küme diskte bellek eşlemeli dizilere yazılır; tüm worker'lar ve MCP
+    süreçleri aynı kopyayı kullanır. Mekansal indeks her süreçte ilk en yakın
+    nokta sorgusunda kurulur.
+    
+    - **set_id**: Küme adı
+    - **points**: Kümedeki noktalar
+    """
+    points = request.points
+    lats = np.fromiter((p.lat for p in points), dtype=np.float64, count=len(points))
+    lons = np.fromiter((p.lon for p in points), dtype=np.float64, count=len(points))
+    names = [p.name for p in points] if any(p.name for p in points) else None
+    try:
+        point_set = await executor.run(len(points), point_sets.register, request.set_id, lats, lons, names)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"set_id": point_set.set_id, "total_points": len(point_set)}
+
+
+@app.post("/point-sets/upload")
+async def upload_point_set(http_request: Request, set_id: str, format: Optional[Literal["csv", "geojson"]] = None):
+    """
+    CSV veya GeoJSON gövdesini nokta kümesi olarak yükler
+    
+    - **set_id**: Küme adı (aynı adla tekrar yükleme eskisini değiştirir)
+    - **format**: csv veya geojson; verilmezse Content-Type'tan çıkarılır
+      (text/csv, application/geo+json, application/json)
+    
+    CSV'de lat/lon (latitude/longitude, lng) ve isteğe bağlı name sütunları
+    başlıktan bulunur; GeoJSON'da Point/MultiPoint geometrileri ve 'name'
+    özelliği okunur.
+    """
+    mark_phase("validation")
+    file_format = format or detect_format(http_request.headers.get("content-type"))
+    if file_format not in POINT_FILE_FORMATS:
+        raise HTTPException(status_code=415, detail="Gövde CSV veya GeoJSON olmalı (format parametresi veya Content-Type)")
+    body = await http_request.body()
+    try:
+        lats, lons, names = await executor.run(len(body) // 32, parse_point_file, body, file_format)
+        point_set = await executor.run(len(lats), point_sets.register, set_id, lats, lons, names, f"upload:{file_format}")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    mark_phase("compute")
+    return point_set.describe()
+
+
+@app.get("/point-sets")
+async def list_point_sets():
+    """Kayıtlı nokta kümelerini listeler"""
+    return {"point_sets": [point_set.describe() for point_set in point_sets.list()]}
+
+
+@app.delete("/point-sets/{set_id}")
+async def delete_point_set(set_id: str):
+    """Kayıtlı bir nokta kümesini siler"""
+    try:
+        deleted = point_sets.delete(set_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Kayıtlı nokta kümesi bulunamadı: {set_id}")
+    return {"set_id": set_id, "deleted": True}
+
+
+@app.post("/nearest-points", response_model=NearestPointsResponse)
+async def nearest_points(request: NearestPointsRequest):
+    """
+    Kayıtlı bir nokta kümesinde verilen konuma en yakın k noktayı bulur
+    
+    - **set_id**: /point-sets ile kaydedilmiş küme adı
+    - **lat, lon**: Sorgu noktası
+    - **k**: Döndürülecek nokta sayısı
+    - **method**: haversine veya vincenty (Haversine ile budanıp Vincenty ile inceltilir)
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    """
+    mark_phase("validation")
+    point_set = get_point_set(request.set_id)
+    if point_set.index is None:
+        point_set.index = await executor.run(len(point_set), SpatialIndex, point_set.lats, point_set.lons)
+    index = point_set.index
+    
+    try:
+        indices, distances_km = index.nearest(request.lat, request.lon, request.k, request.method)
+        record_batch("/nearest-points", len(indices), request.method)
+        mark_phase("compute")
+        distances_converted, unit_name = convert_unit(distances_km, request.unit)
+        
+        return NearestPointsResponse(
+            set_id=request.set_id,
+            query_point={"lat": request.lat, "lon": request.lon},
+            neighbors=[
+                {
+                    "index": i,
+                    "target_name": point_set.name(i),
+                    "distance": round(d, 3),
+                    "coordinates": {"lat": float(point_set.lats[i]), "lon": float(point_set.lons[i])}
+                }
+                for i, d in zip(indices.tolist(), distances_converted.tolist())
+            ],
+            unit=unit_name,
+            method=request.method,
+            k=len(indices)
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"En yakın nokta hesaplama hatası: {str(e)}")
+
+
+@app.post("/points-within-radius", response_model=RadiusSearchResponse)
+async def points_within_radius_search(request: RadiusSearchRequest):
+    """
+    Merkez noktaya verilen yarıçap içindeki tüm hedef noktaları bulur
+    
+    Noktalar önce enlem/boylam sınırlayıcı kutusuyla elenir; mesafe yalnızca
+    kutu içinde kalanlar için hesaplanır.
+    
+    - **center_point**: Merkez koordinat noktası
+    - **radius**: Yarıçap (unit cinsinden)
+    - **target_points**: Hedef koordinat noktaları listesi
+    - **target_set_id**: target_points yerine /point-sets ile kaydedilmiş küme adı
+    - **method**: Hesaplama yöntemi (haversine/vincenty)
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    """
+    mark_phase("validation")
+    target_lats, target_lons, target_name = resolve_targets(request.target_points, request.target_set_id)
+    try:
+        center_lat = request.center_point.lat
+        center_lon = request.center_point.lon
+        center_name = request.center_point.name or f"({center_lat}, {center_lon})"
+        
+        # Yarıçapı kilometreye çevir, sonuçları istenen birime geri çevir
+        unit_factor, unit_name = convert_unit(1.0, request.unit)
+        
+        total = len(target_lats)
+        indices, distances_km, evaluated = await executor.run(
+            executor.work_size(total, request.method), points_within_radius,
+            center_lat, center_lon, request.radius / unit_factor, target_lats, target_lons, request.method
+        )
+        record_batch("/points-within-radius", evaluated, request.method)
+        mark_phase("compute")
+        
+        results = []
+        
+        for i, distance in zip(indices.tolist(), (distances_km * unit_factor).tolist()):
+            results.append({
+                "index": i,
+                "target_name": target_name(i),
+                "distance": round(distance, 3),
+                "coordinates": {"lat": float(target_lats[i]), "lon": float(target_lons[i])}
+            })
+        
+        # Mesafeye göre sırala
+        results.sort(key=lambda x: x["distance"])
+        
+        return RadiusSearchResponse(
+            center_point={
+                "name": center_name,
+                "coordinates": {"lat": center_lat, "lon": center_lon}
+            },
+            radius=request.radius,
+            points=results,
+            unit=unit_name,
+            method=request.method,
+            total_points=total,
+            pruned_points=total - evaluated,
+            evaluated_points=evaluated,
+            matched_points=len(results)
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Yarıçap arama hatası: {str(e)}")
+
+
+@app.post("/distances")
+async def calculate_distances_bulk(request: PairDistanceRequest):
+    """
+    Birbirinden bağımsız nokta çiftlerinin mesafelerini tek seferde hesaplar
+    
+    Sonuçlar sıralanmadan, giriş sırasıyla `distances` dizisinde döner.
+    
+    - **pairs**: [lat1, lon1, lat2, lon2] dizilerinden oluşan çift listesi
+    - **method**: Hesaplama yöntemi (haversine/vincenty/auto)
+    - **max_error_m**: auto yönteminde izin verilen en fazla hata (metre); çift başına kullanılan yöntem `methods` dizisinde döner
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    """
+    try:
+        lats1, lons1, lats2, lons2 = parse_coordinate_pairs(request.pairs)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    mark_phase("validation")
+    
+    try:
+        if request.method == "auto":
+            distances_km, methods_used = await executor.auto_distance_array(
+                lats1, lons1, lats2, lons2, request.max_error_m
+            )
+        else:
+            distances_km = await executor.distance_array(lats1, lons1, lats2, lons2, request.method)
+        distances_converted, unit_name = convert_unit(distances_km, request.unit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Toplu hesaplama hatası: {str(e)}")
+    record_batch("/distances", int(lats1.size), request.method)
+    mark_phase("compute")
+    
+    # Büyük listelerde jsonable_encoder maliyetinden kaçınmak için doğrudan FastJSONResponse
+    content = {
+        "unit": unit_name,
+        "method": request.method,
+        "total_pairs": int(lats1.size),
+        "distances": np.round(distances_converted, 3)
+    }
+    if request.method == "auto":
+        content["max_error_m"] = request.max_error_m
+        content["methods"] = np.array(AUTO_METHODS)[methods_used].tolist()
+        content["method_counts"] = auto_method_counts(methods_used)
+    return FastJSONResponse(content=content)
+
+
+@app.post("/proximity-pairs")
+async def find_proximity_pairs(request: ProximityPairsRequest):
+    """
+    Bir nokta kümesinde birbirine threshold_m veya daha yakın tüm nokta çiftlerini bulur
+    
+    Noktalar eşik boyutunda hücrelere ayrılır ve yalnızca komşu hücreler
+    karşılaştırılır; tüm çiftleri taramaz.
+    
+    - **target_points**: Koordinat noktaları listesi
+    - **target_set_id**: target_points yerine /point-sets ile kaydedilmiş küme adı
+    - **threshold_m**: Eşik mesafesi (metre)
+    - **method**: Doğrulama yöntemi (haversine/vincenty)
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    - **max_pairs**: En fazla çift sayısı; sınıra ulaşılırsa `truncated` true olur
+    - **format**: compact ise `first`, `second` (giriş indeksleri, first < second) ve
+      `distances` dizileri döner; full ise her çift adları ve koordinatlarıyla döner
+    """
+    mark_phase("validation")
+    lats, lons, point_name = resolve_targets(request.target_points, request.target_set_id)
+    try:
+        first, second, distances_km, stats = await executor.run(
+            executor.work_size(len(lats), request.method), proximity_pairs,
+            lats, lons, request.threshold_m / 1000, request.method, request.max_pairs
+        )
+        record_batch("/proximity-pairs", stats["candidate_pairs"], request.method)
+        mark_phase("compute")
+        
+        distances_converted, unit_name = convert_unit(distances_km, request.unit)
+        content = {
+            "threshold_m": request.threshold_m,
+            "unit": unit_name,
+            "method": request.method,
+            "total_points": len(lats),
+            "compared_pairs": stats["compared_pairs"],
+            "candidate_pairs": stats["candidate_pairs"],
+            "matched_pairs": len(first),
+            "truncated": stats["truncated"]
+        }
+        if request.format == "compact":
+            content["first"] = first
+            content["second"] = second
+            content["distances"] = np.round(distances_converted, 3)
+        else:
+            def point(i: int) -> dict:
+                return {
+                    "index": i,
+                    "name": point_name(i),
+                    "coordinates": {"lat": float(lats[i]), "lon": float(lons[i])}
+                }
+            content["pairs"] = [
+                {"a": point(i), "b": point(j), "distance": round(d, 3)}
+                for i, j, d in zip(first.tolist(), second.tolist(), distances_converted.tolist())
+            ]
+        return FastJSONResponse(content=content)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Yakınlık eşleştirme hatası: {str(e)}")
+
+
+# Bağlantı başına en fazla (varlık x hedef) hücresi (DIST_TRACK_MAX_CELLS)
+TRACK_MAX_CELLS = max_tracked_cells_from_env()
+
+
+async def tracking_reply(session: Optional[TrackingSession], message: dict) -> tuple[Optional[TrackingSession], dict]:
+    """Tek bir istemci mesajını işler; (güncel oturum, yanıt) döndürür"""
+    message_type = message.get("type")
+    if message_type == "subscribe":
+        subscription = TrackingSubscription.model_validate(message)
+        lats, lons, dest_name = resolve_targets(subscription.target_points, subscription.target_set_id)
+        unit_factor, unit_name = convert_unit(1.0, subscription.unit)
+        session = TrackingSession(
+            lats, lons, method=subscription.method,
+            thresholds_km=[t / unit_factor for t in subscription.thresholds],
+            report_distances=subscription.distances, min_change_km=subscription.min_change / unit_factor,
+            unit_factor=unit_factor, dest_name=dest_name, max_cells=TRACK_MAX_CELLS
+        )
+        return session, {
+            "type": "subscribed",
+            "destinations": len(lats),
+            "method": subscription.method,
+            "unit": unit_name,
+            "thresholds": sorted(set(subscription.thresholds)),
+            "distances": subscription.distances,
+            "max_entities": session.max_entities
+        }
+    if session is None:
+        raise ValueError("Önce subscribe mesajı gönderilmeli")
+    if message_type == "positions":
+        ids, lats, lons = parse_positions(message.get("positions"))
+        result = await executor.run(executor.work_size(len(ids) * len(session.dest_lats), session.method),
+                                    session.update, ids, lats, lons)
+        record_batch("/ws/tracking", result["computed"], session.method)
+        return session, {"type": "update", "tracked": len(session), **result}
+    if message_type == "remove":
+        ids = message.get("ids")
+        if not isinstance(ids, list):
+            raise ValueError("ids bir liste olmalı")
+        return session, {"type": "removed", "count": session.remove(ids), "tracked": len(session)}
+    raise ValueError(f"Bilinmeyen mesaj türü: {message_type} (subscribe, positions, remove)")
+
+
+@app.websocket("/ws/tracking")
+async def live_tracking(websocket: WebSocket):
+    """
+    Canlı takip: sabit bir hedef kümesine karşı hareket eden varlıkların
+    mesafelerini tek bağlantı üzerinden artımlı olarak bildirir
+    
+    İstemci mesajları (JSON metin):
+    - **subscribe**: `target_points` veya `target_set_id`, `method`, `unit`, `thresholds`,
+      `distances`, `min_change`; yeniden gönderilirse oturum sıfırlanır
+    - **positions**: `[{id, lat, lon}]`; yalnızca hareket eden varlıklar hesaplanır.
+      Yanıt (`update`): varlık başına en yakın hedef, `distances` açıksa değişen
+      mesafeler (`changed` indeksleri ve `distances`), ve `events`
+      (`nearest` en yakın hedef değişimi, `enter`/`exit` eşik geçişleri)
+    - **remove**: `ids` listesindeki varlıkları takipten çıkarır
+    
+    Hatalı mesajlar bağlantıyı kapatmaz; `{"type": "error", "detail": ...}` döner.
+    """
+    await websocket.accept()
+    session = None
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                try:
+                    message = json.loads(text)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Geçersiz JSON: {e}")
+                if not isinstance(message, dict):
+                    raise ValueError("Mesaj bir JSON nesnesi olmalı")
+                session, reply = await tracking_reply(session, message)
+            except ValidationError as e:
+                reply = {"type": "error", "detail": jsonable_encoder(e.errors(include_url=False))}
+            except HTTPException as e:
+                reply = {"type": "error", "detail": e.detail}
+            except ValueError as e:
+                reply = {"type": "error", "detail": str(e)}
+            await websocket.send_text(distjson.dumps(reply))
+    except WebSocketDisconnect:
+        pass
+
+
+@app.post("/optimize-route")
+async def optimize_route_order(request: RouteRequest):
+    """
+    Başlangıç noktasından tüm durakları ziyaret eden kısa bir sıra bulur
+    
+    /batch-distance'ın mesafeye göre sıralaması bir ziyaret sırası değildir;
+    bu uç nokta mesafe matrisi üzerinde en yakın komşu rotasını kurar ve süre
+    bütçesi içinde 2-opt ve Or-opt hamleleriyle iyileştirir. Sonuç, başlangıca
+    uzaklığa göre sıralı rotayla karşılaştırılır.
+    
+    - **start_point**: Başlangıç noktası
+    - **target_points**: Duraklar
+    - **target_set_id**: target_points yerine /point-sets ile kaydedilmiş küme adı
+    - **method**: Mesafe matrisi yöntemi (haversine/vincenty); vincenty matrisi
+      binlerce durakta süre bütçesinin büyük kısmını kullanır
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    - **return_to_start**: Rota başlangıç noktasına dönerek biter
+    - **time_limit_s**: Süre bütçesi (saniye); `converged` false ise bütçe dolmuştur
+    - **format**: compact ise `order` (durak indeksleri, ziyaret sırasıyla) ve
+      `legs` dizileri döner; full ise her durak adı, koordinatları ve kümülatif mesafesiyle döner
+    """
+    mark_phase("validation")
+    lats, lons, stop_name = resolve_targets(request.target_points, request.target_set_id)
+    if not len(lats):
+        raise HTTPException(status_code=422, detail="En az bir durak gerekli")
+    if len(lats) > MAX_ROUTE_STOPS:
+        raise HTTPException(status_code=422, detail=f"Rota en fazla {MAX_ROUTE_STOPS} durak içerebilir")
+    start = request.start_point
+    try:
+        result = await executor.run(
+            executor.work_size(len(lats) ** 2, request.method), optimize_route,
+            start.lat, start.lon, lats, lons, request.method, request.return_to_start, request.time_limit_s
+        )
+        record_batch("/optimize-route", len(lats) ** 2, request.method)
+        mark_phase("compute")
+        
+        unit_factor, unit_name = convert_unit(1.0, request.unit)
+        legs = result["legs_km"] * unit_factor
+        content = {
+            "start_point": {
+                "name": start.name or f"({start.lat}, {start.lon})",
+                "coordinates": {"lat": start.lat, "lon": start.lon}
+            },
+            "unit": unit_name,
+            "method": request.method,
+            "total_stops": len(lats),
+            "return_to_start": request.return_to_start,
+            "total_distance": round(result["total_km"] * unit_factor, 3),
+            "naive_distance": round(result["naive_km"] * unit_factor, 3),
+            "nearest_neighbor_distance": round(result["nearest_neighbor_km"] * unit_factor, 3),
+            "improvement_pct": result["improvement_pct"],
+            "nearest_neighbor_improvement_pct": result["nearest_neighbor_improvement_pct"],
+            "converged": result["converged"],
+            "search": {
+                "passes": result["passes"],
+                "two_opt_moves": result["two_opt_moves"],
+                "or_opt_moves": result["or_opt_moves"],
+                "elapsed_s": round(result["elapsed_s"], 3)
+            }
+        }
+        if request.format == "compact":
+            content["order"] = result["order"]
+            content["legs"] = np.round(legs, 3)
+        else:
+            cumulative = np.cumsum(legs)
+            content["route"] = [
+                {
+                    "index": i,
+                    "name": stop_name(i),
+                    "coordinates": {"lat": float(lats[i]), "lon": float(lons[i])},
+                    "distance": round(leg, 3),
+                    "cumulative_distance": round(total, 3)
+                }
+                for i, leg, total in zip(result["order"].tolist(), legs.tolist(), cumulative.tolist())
+            ]
+            if request.return_to_start:
+                content["return_distance"] = round(float(legs[-1]), 3)
+        return FastJSONResponse(content=content)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rota optimizasyonu hatası: {str(e)}")
+
+
+@app.post("/geofences")
+async def register_geofence(request: GeofenceRequest):
+    """
+    Bir çokgeni coğrafi çit olarak kaydeder
+    
+    Çit diske yazılır ve her süreçte bir kez hazırlanır (sınırlayıcı kutu,
+    içerme için boylam dilimleri, sınır mesafesi için kenar ağacı); sorgular
+    hazırlanmış yapıyı kullanır.
+    
+    - **fence_id**: Çit adı
+    - **polygon**: Dış halka, [lat, lon] köşeleri (kapanış noktası isteğe bağlı)
+    - **holes**: Delik halkaları
+    - **geojson**: polygon yerine GeoJSON Polygon/MultiPolygon, Feature veya FeatureCollection
+    """
+    mark_phase("validation")
+    if (request.polygon is None) == (request.geojson is None):
+        raise HTTPException(status_code=422, detail="polygon veya geojson'dan yalnızca biri verilmeli")
+    try:
+        if request.geojson is not None:
+            rings, source = geojson_rings(request.geojson), "geojson"
+        else:
+            rings, source = polygon_rings(request.polygon, request.holes), "polygon"
+        vertices = sum(len(lats) for lats, _ in rings)
+        fence = await executor.run(vertices, geofences.register, request.fence_id, rings, source)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    mark_phase("compute")
+    return fence.describe()
+
+
+@app.get("/geofences")
+async def list_geofences():
+    """Kayıtlı coğrafi çitleri listeler"""
+    return {"geofences": [fence.describe() for fence in geofences.list()]}
+
+
+@app.delete("/geofences/{fence_id}")
+async def delete_geofence(fence_id: str):
+    """Kayıtlı bir coğrafi çiti siler"""
+    try:
+        deleted = geofences.delete(fence_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Kayıtlı çit bulunamadı: {fence_id}")
+    return {"fence_id": fence_id, "deleted": True}
+
+
+@app.post("/geofences/query")
+async def query_geofences(request: GeofenceQueryRequest):
+    """
+    Noktaların kayıtlı çitlerin içinde olup olmadığını ve çit sınırına mesafesini hesaplar
+    
+    Sonuçlar çit başına sütun dizileri olarak döner; `inside[i]` ve
+    `distances[i]` i. sorgu noktasına aittir. Mesafe, noktadan çit sınırındaki
+    en yakın noktaya büyük daire (Haversine) mesafesidir.
+    
+    - **fence_ids**: Kayıtlı çit adları
+    - **target_points**: Sorgu noktaları
+    - **target_set_id**: target_points yerine /point-sets ile kaydedilmiş küme adı
+    - **include_distance**: Sınır mesafelerini de hesapla (içerme testinden belirgin şekilde pahalı)
+    - **unit**: Mesafe birimi (km/miles/nautical_miles)
+    """
+    mark_phase("validation")
+    lats, lons, _ = resolve_targets(request.target_points, request.target_set_id)
+    fences = []
+    for fence_id in request.fence_ids:
+        try:
+            fence = geofences.get(fence_id)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if fence is None:
+            raise HTTPException(status_code=404, detail=f"Kayıtlı çit bulunamadı: {fence_id}")
+        fences.append(fence)
+    try:
+        results = []
+        for fence in fences:
+            inside, distances_km = await executor.run(
+                executor.work_size(len(lats), "haversine"), fence.query, lats, lons, request.include_distance
+            )
+            result = {"fence_id": fence.fence_id, "inside_count": int(inside.sum()), "inside": inside}
+            if distances_km is not None:
+                result["distances"] = np.round(convert_unit(distances_km, request.unit)[0], 3)
+            results.append(result)
+        record_batch("/geofences/query", len(lats) * len(fences), "haversine")
+        mark_phase("compute")
+        
+        return FastJSONResponse(content={
+            "total_points": len(lats),
+            "unit": convert_unit(1.0, request.unit)[1],
+            "fences": results
+        })
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Çit sorgulama hatası: {str(e)}")
+
+
+def path_length_content(result: dict, method: str, unit: str, max_error_m: float) -> dict:
+    """PathAccumulator sonucunu istenen birimde yanıt gövdesine çevirir"""
+    unit_factor, unit_name = convert_unit(1.0, unit)
+    content = {
+        "unit": unit_name,
+        "method": method,
+        "total_points": result["points"],
+        "total_segments": result["segments"],
+        "breaks": result["breaks"],
+        "total_distance": round(result["total_km"] * unit_factor, 3)
+    }
+    if "cumulative_km" in result:
+        content["cumulative"] = np.round(result["cumulative_km"] * unit_factor, 3)
+    if "segments_km" in result:
+        content["segments"] = np.round(result["segments_km"] * unit_factor, 3)
+    if method == "auto":
+        content["max_error_m"] = max_error_m
+        content["method_counts"] = result["method_counts"]
+    return content
+
+
+@app.post("/path-length")
+async def calculate_path_length(request: PathLengthRequest):
+    """
+    Sıralı bir nokta dizisinin (GPS izi, rota) toplam uzunluğunu hesaplar
+    
+    Ardışık nokta çiftleri parça parça tek vektörel geçişte hesaplanır.
+    
+    - **points**: Sıralı [lat, lon] noktaları
+    - **method**: Hesaplama yöntemi (haversine/vincenty/auto)
+    - **unit**: Sonuç birimi (km/miles/nautical_miles)
+    - **include_cumulative**: Nokta başına kümülatif mesafeler (`cumulative`, ilk nokta 0)
+    - **include_segments**: Segment mesafeleri (`segments`, n - 1 eleman)
+    """
+    try:
+        lats, lons = parse_point_sequence(request.points)
+        mark_phase("validation")
+        result = await executor.run(
+            executor.work_size(len(lats), request.method), path_length, lats, lons,
+            method=request.method, max_error_m=request.max_error_m,
+            keep_cumulative=request.include_cumulative, keep_segments=request.include_segments
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    record_batch("/path-length", result["points"], request.method)
+    mark_phase("compute")
+    return FastJSONResponse(content=path_length_content(result, request.method, request.unit, request.max_error_m))
+
+
+@app.post("/path-length/upload")
+async def upload_path_length(
+    http_request: Request,
+    format: Optional[Literal["gpx", "csv"]] = None,
+    method: Literal["haversine", "vincenty", "auto"] = "haversine",
+    unit: Literal["km", "miles", "nautical_miles"] = "km",
+    max_error_m: float = DEFAULT_MAX_ERROR_M,
+    include_cumulative: bool = True,
+    include_segments: bool = False
+):
+    """
+    GPX veya CSV iz dosyasının uzunluğunu gövdeyi akış halinde okuyarak hesaplar
+    
+    Gövde belleğe alınmaz; gelen her parça çözülüp hesaba eklenir.
+    
+    - **format**: gpx veya csv; verilmezse Content-Type'tan çıkarılır
+      (application/gpx+xml, application/xml, text/csv)
+    - GPX'te trkpt/rtept noktaları okunur; her yeni trkseg/trk/rte yolu böler
+      (parçalar arası boşluk toplama eklenmez, `breaks` sayısı döner)
+    - CSV'de lat/lon (latitude/longitude, lng) sütunları başlıktan bulunur;
+      başlık yoksa ilk iki sütun lat, lon sayılır
+    - Diğer parametreler /path-length ile aynıdır (URL parametreleri)
+    """
+    file_format = format or detect_path_format(http_request.headers.get("content-type"))
+    if file_format not in PATH_FILE_FORMATS:
+        raise HTTPException(status_code=415, detail="Gövde GPX veya CSV olmalı (format parametresi veya Content-Type)")
+    if not max_error_m > 0:
+        raise HTTPException(status_code=422, detail="max_error_m pozitif olmalı (metre)")
+    
+    parser = stream_parser(file_format)
+    accumulator = PathAccumulator(method=method, max_error_m=max_error_m,
+                                  keep_cumulative=include_cumulative, keep_segments=include_segments)
     
+    def consume(chunk: bytes) -> None:
+        accumulator.add(*parser.feed(chunk))
+    
+    def finish() -> dict:
+        accumulator.add(*parser.close())
+        return accumulator.finish()
+    
+    # Çözümleme ve mesafe hesabı parça başına yürütücüde çalışır; parçalar sırayla
+    # beklendiğinden ayrıştırıcı ve toplayıcıya aynı anda tek iş parçacığı erişir.
+    # Küçük bir parça bile biriken DEFAULT_CHUNK_SIZE noktalık bloğun hesabını tetikleyebilir
+    work = executor.work_size(DEFAULT_CHUNK_SIZE, method)
+    try:
+        async for chunk in http_request.stream():
+            if chunk:
+                await executor.run(work, consume, chunk)
+        result = await executor.run(work, finish)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not result["points"]:
+        raise HTTPException(status_code=422, detail="Dosyada nokta bulunamadı")
+    record_batch("/path-length/upload", result["points"], method)
+    mark_phase("compute")
+    return FastJSONResponse(content=path_length_content(result, method, unit, max_error_m))
+
+
+# Çalıştırma modları: dev (tek süreç, otomatik yeniden yükleme) ve production
+RUN_MODES = ("dev", "production")
+DEFAULT_HTTP_HOST = "0.0.0.0"
+DEFAULT_HTTP_PORT = 8000
+DEFAULT_KEEP_ALIVE = 5
+DEFAULT_BACKLOG = 2048
+DEFAULT_GRACEFUL_TIMEOUT = 30
+
+
+def _installed(module: str) -> bool:
+    import importlib.util
+    return importlib.util.find_spec(module) is not None
+
+
+def run_options_from_env() -> dict:
+    """
+    Ortam değişkenlerinden sunucu çalıştırma ayarları (komut satırı bunları ezer).
+
+    - DIST_HTTP_MODE: dev (varsayılan) veya production
+    - DIST_HTTP_HOST / DIST_HTTP_PORT: Dinlenecek adres ve port
+    - DIST_HTTP_WORKERS: Worker süreç sayısı (production varsayılanı çekirdek sayısı)
+    - DIST_HTTP_LOOP: auto, asyncio veya uvloop
+    - DIST_HTTP_PARSER: auto, h11 veya httptools
+    - DIST_HTTP_KEEP_ALIVE: Boştaki keep-alive bağlantılarının kapatılma süresi (s)
+    - DIST_HTTP_BACKLOG: Bekleyen bağlantı kuyruğu uzunluğu
+    - DIST_HTTP_LIMIT_CONCURRENCY: Worker başına eşzamanlı bağlantı sınırı (aşılınca 503)
+    - DIST_HTTP_MAX_REQUESTS: Worker bu kadar istekten sonra yeniden başlatılır
+    - DIST_HTTP_GRACEFUL_TIMEOUT: Kapanışta süren isteklerin beklenme süresi (s)
+    - DIST_HTTP_ACCESS_LOG: Erişim günlüğü (production'da varsayılan kapalı)
+    """
+    env = os.environ
+    mode = env.get("DIST_HTTP_MODE", "dev")
+    production = mode == "production"
+
+    def optional_int(name: str) -> Optional[int]:
+        return int(env[name]) if env.get(name) else None
+
+    return {
+        "mode": mode,
+        "host": env.get("DIST_HTTP_HOST", DEFAULT_HTTP_HOST),
+        "port": int(env.get("DIST_HTTP_PORT", DEFAULT_HTTP_PORT)),
+        "workers": optional_int("DIST_HTTP_WORKERS") or ((os.cpu_count() or 1) if production else 1),
+        "loop": env.get("DIST_HTTP_LOOP", "auto"),
+        "http": env.get("DIST_HTTP_PARSER", "auto"),
+        "keep_alive": int(env.get("DIST_HTTP_KEEP_ALIVE", DEFAULT_KEEP_ALIVE)),
+        "backlog": int(env.get("DIST_HTTP_BACKLOG", DEFAULT_BACKLOG)),
+        "limit_concurrency": optional_int("DIST_HTTP_LIMIT_CONCURRENCY"),
+        "max_requests": optional_int("DIST_HTTP_MAX_REQUESTS"),
+        "graceful_timeout": int(env.get("DIST_HTTP_GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT)),
+        "access_log": env.get("DIST_HTTP_ACCESS_LOG", "0" if production else "1").lower() in ("1", "true", "yes")
+    }
+
+
+def resolve_loop(loop: str) -> str:
+    """auto: uvloop yüklüyse uvloop, değilse asyncio"""
+    if loop == "auto":
+        return "uvloop" if _installed("uvloop") else "asyncio"
+    return loop
+
+
+def resolve_http(http: str) -> str:
+    """auto: httptools yüklüyse httptools, değilse h11"""
+    if http == "auto":
+        return "httptools" if _installed("httptools") else "h11"
+    return http
+
+
+def main():
+    import argparse
+
+    defaults = run_options_from_env()
+    parser = argparse.ArgumentParser(description="Kuş uçumu mesafe hesaplama web sunucusu")
+    parser.add_argument("--mode", choices=RUN_MODES, default=defaults["mode"],
+                        help="dev: tek süreç ve otomatik yeniden yükleme; production: çok worker (DIST_HTTP_MODE)")
+    parser.add_argument("--host", default=defaults["host"], help="Dinlenecek adres (DIST_HTTP_HOST)")
+    parser.add_argument("--port", type=int, default=defaults["port"], help="Dinlenecek port (DIST_HTTP_PORT)")
+    parser.add_argument("--workers", type=int, default=defaults["workers"],
+                        help="Worker süreç sayısı; production'da varsayılan çekirdek sayısı (DIST_HTTP_WORKERS)")
+    parser.add_argument("--loop", choices=("auto", "asyncio", "uvloop"), default=defaults["loop"],
+                        help="Olay döngüsü (DIST_HTTP_LOOP)")
+    parser.add_argument("--http", choices=("auto", "h11", "httptools"), default=defaults["http"],
+                        help="HTTP ayrıştırıcı (DIST_HTTP_PARSER)")
+    parser.add_argument("--keep-alive", type=int, default=defaults["keep_alive"],
+                        help="Keep-alive zaman aşımı, saniye (DIST_HTTP_KEEP_ALIVE)")
+    parser.add_argument("--backlog", type=int, default=defaults["backlog"],
+                        help="Bekleyen bağlantı kuyruğu (DIST_HTTP_BACKLOG)")
+    parser.add_argument("--limit-concurrency", type=int, default=defaults["limit_concurrency"],
+                        help="Worker başına eşzamanlı bağlantı sınırı (DIST_HTTP_LIMIT_CONCURRENCY)")
+    parser.add_argument("--max-requests", type=int, default=defaults["max_requests"],
+                        help="Worker'ı bu kadar istekten sonra yeniden başlat (DIST_HTTP_MAX_REQUESTS)")
+    parser.add_argument("--graceful-timeout", type=int, default=defaults["graceful_timeout"],
+                        help="Kapanışta süren istekler için bekleme süresi, saniye (DIST_HTTP_GRACEFUL_TIMEOUT)")
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=defaults["access_log"],
+                        help="Erişim günlüğü (DIST_HTTP_ACCESS_LOG)")
+    args = parser.parse_args()
+
+    loop = resolve_loop(args.loop)
+    http = resolve_http(args.http)
+    url = f"http://localhost:{args.port}"
+
+    print("🚀 Kuş Uçumu Mesafe Hesaplama Web Server başlatılıyor...")
+    print(f"📍 API Dokümantasyonu: {url}")
+    print(f"📊 Swagger UI: {url}/docs")
+    print(f"📖 ReDoc: {url}/redoc")
+
+    if args.mode == "dev":
+        uvicorn.run(
+            "distser:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
+        return
+
+    workers = max(1, args.workers)
+    if workers > 1:
+        # Her worker kendi süreç havuzunu açar; çekirdekleri worker'lar arasında paylaştır
+        os.environ.setdefault("DIST_EXEC_PROCESSES", str(max(0, (os.cpu_count() or 1) // workers)))
+    print(f"⚙️  production: {workers} worker, loop={loop}, http={http}, "
+          f"keep-alive={args.keep_alive}s, backlog={args.backlog}")
+
     uvicorn.run(
         "distser:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        limit_concurrency=args.limit_concurrency,
+        limit_max_requests=args.max_requests,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=args.access_log,
+        server_header=False,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
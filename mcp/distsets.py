@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Paylaşılan Nokta Kümeleri
+Adlandırılmış nokta kümelerini diskte .npy dosyaları olarak saklar ve her
+süreçte salt okunur bellek eşlemesiyle (mmap) açar. Aynı dizini kullanan tüm
+uvicorn worker'ları ve MCP süreçleri koordinatları sayfa önbelleğindeki tek
+kopyadan okur; kümeyi bir kez yükleyip istekte yalnızca adıyla anmak yeterlidir.
+
+Dizin düzeni (kök: DIST_POINT_SETS_DIR):
+
+    <küme>/CURRENT              etkin sürümün adı (atomik olarak değiştirilir)
+    <küme>/.lock                etkinleştirme ve eski sürüm temizliği için dosya kilidi
+    <küme>/<sürüm>/meta.json    küme adı, nokta sayısı, kaynak, oluşturulma zamanı
+    <küme>/<sürüm>/lats.npy     enlemler (float64)
+    <küme>/<sürüm>/lons.npy     boylamlar (float64)
+    <küme>/<sürüm>/names.bin    UTF-8 nokta adları art arda (opsiyonel yan tablo)
+    <küme>/<sürüm>/name_offsets.npy  adların names.bin içindeki sınırları (n + 1)
+
+Yeniden kayıt yeni bir sürüm dizini yazıp CURRENT'ı değiştirir; eski sürümü
+açık tutan süreçler onu kullanmaya devam eder, sonraki istekte yeni sürümü açar.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import quote
+
+import numpy as np
+
+from distconst import MAX_STORED_NAME_BYTES
+from distio import validate_coordinate_arrays
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok, süreç içi kilit yeterli
+    fcntl = None
+
+
+DEFAULT_ROOT = Path(__file__).resolve().parent / "point_sets"
+POINT_FILE_FORMATS = ("csv", "geojson")
+
+# CSV başlıklarında tanınan sütun adları
+LAT_COLUMNS = ("lat", "latitude", "enlem", "y")
+LON_COLUMNS = ("lon", "lng", "long", "longitude", "boylam", "x")
+NAME_COLUMNS = ("name", "ad", "isim", "title", "id")
+
+
+def default_name(index: int) -> str:
+    """Adı olmayan noktalar için varsayılan ad"""
+    return f"Nokta {index + 1}"
+
+
+def _column(header: list[str], candidates: Sequence[str]) -> Optional[int]:
+    for i, column in enumerate(header):
+        if column in candidates:
+            return i
+    return None
+
+
+def csv_columns(first_row: list[str]) -> tuple[int, int, Optional[int], bool]:
+    """
+    CSV'nin ilk satırından enlem, boylam ve ad sütunlarını bulur.
+
+    Returns:
+        (enlem sütunu, boylam sütunu, ad sütunu veya None, ilk satır başlık mı)
+
+    Raises:
+        ValueError: Başlıkta enlem veya boylam sütunlarından yalnızca biri varsa
+    """
+    header = [column.strip().lower() for column in first_row]
+    lat_col = _column(header, LAT_COLUMNS)
+    lon_col = _column(header, LON_COLUMNS)
+    if lat_col is None and lon_col is None:
+        return 0, 1, (2 if len(header) > 2 else None), False
+    if lat_col is None or lon_col is None:
+        raise ValueError("CSV başlığında hem enlem (lat) hem boylam (lon) sütunu olmalı")
+    return lat_col, lon_col, _column(header, NAME_COLUMNS), True
+
+
+def csv_dialect(sample: str):
+    """Örnek metnin ilk satırından ayırıcıyı (virgül, noktalı virgül, sekme) tahmin eder"""
+    try:
+        return csv.Sniffer().sniff(sample.splitlines()[0] if sample else "", delimiters=",;\t")
+    except csv.Error:
+        return csv.excel
+
+
+def parse_csv(text: str) -> tuple[np.ndarray, np.ndarray, Optional[list[str]]]:
+    """
+    CSV metnini enlem/boylam dizilerine ve ad listesine çevirir.
+
+    İlk satır lat/lon (veya latitude/longitude, lng, ...) ve isteğe bağlı name
+    sütunlarını içeren bir başlık olabilir; başlık yoksa sütunlar lat, lon[, name]
+    kabul edilir. Ayırıcı virgül, noktalı virgül veya sekme olabilir.
+
+    Raises:
+        ValueError: Başlık veya satırlar çözülemezse
+    """
+    rows = csv.reader(io.StringIO(text), csv_dialect(text[:4096]))
+
+    first = next(rows, None)
+    if first is None:
+        raise ValueError("CSV boş")
+    lat_col, lon_col, name_col, has_header = csv_columns(first)
+    pending = [] if has_header else [first]
+
+    lats, lons, names = [], [], []
+    for line, row in enumerate((*pending, *rows), start=1 if pending else 2):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        try:
+            lats.append(float(row[lat_col]))
+            lons.append(float(row[lon_col]))
+        except (IndexError, ValueError):
+            raise ValueError(f"CSV satırı {line} çözülemedi: enlem/boylam sütunu eksik veya sayı değil")
+        names.append(row[name_col].strip() if name_col is not None and name_col < len(row) else "")
+
+    return (np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64),
+            names if any(names) else None)
+
+
+def parse_geojson(data) -> tuple[np.ndarray, np.ndarray, Optional[list[str]]]:
+    """
+    GeoJSON nesnesindeki (FeatureCollection, Feature, Point, MultiPoint) noktaları
+    dizilere çevirir. Koordinatlar GeoJSON sırasıyla [boylam, enlem] okunur; ad
+    özelliklerdeki 'name' alanından, yoksa feature 'id'sinden alınır.
+
+    Raises:
+        ValueError: Nokta olmayan geometri veya geçersiz yapı varsa
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+
+    lats, lons, names = [], [], []
+
+    def add(geometry, name):
+        kind = (geometry or {}).get("type")
+        if kind == "Point":
+            positions = [geometry["coordinates"]]
+        elif kind == "MultiPoint":
+            positions = geometry["coordinates"]
+        else:
+            raise ValueError(f"Yalnızca Point ve MultiPoint geometrileri desteklenir: {kind}")
+        for position in positions:
+            if len(position) < 2:
+                raise ValueError(f"Geçersiz GeoJSON koordinatı: {position}")
+            lons.append(float(position[0]))
+            lats.append(float(position[1]))
+            names.append(name)
+
+    def add_feature(feature):
+        properties = feature.get("properties") or {}
+        name = properties.get("name", feature.get("id"))
+        add(feature.get("geometry"), "" if name is None else str(name))
+
+    kind = data.get("type") if isinstance(data, dict) else None
+    if kind == "FeatureCollection":
+        for feature in data.get("features", []):
+            add_feature(feature)
+    elif kind == "Feature":
+        add_feature(data)
+    elif kind in ("Point", "MultiPoint"):
+        add(data, "")
+    else:
+        raise ValueError(f"Desteklenmeyen GeoJSON türü: {kind}")
+
+    return (np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64),
+            names if any(names) else None)
+
+
+def detect_format(name: Optional[str]) -> Optional[str]:
+    """Dosya adından veya içerik türünden biçimi çıkarır (csv/geojson)"""
+    name = (name or "").split(";")[0].strip().lower()
+    if name.endswith(("csv", "/tab-separated-values")) or name.endswith(".tsv"):
+        return "csv"
+    if name.endswith(("geojson", "json", "geo+json")):
+        return "geojson"
+    return None
+
+
+def parse_point_file(data: bytes, file_format: str) -> tuple[np.ndarray, np.ndarray, Optional[list[str]]]:
+    """
+    CSV veya GeoJSON içeriğini dizilere çevirir.
+
+    Raises:
+        ValueError: Biçim desteklenmiyorsa veya içerik çözülemezse
+    """
+    if file_format not in POINT_FILE_FORMATS:
+        raise ValueError(f"Desteklenmeyen nokta dosyası biçimi: {file_format} (csv veya geojson)")
+    text = data.decode("utf-8-sig")
+    if file_format == "csv":
+        return parse_csv(text)
+    try:
+        return parse_geojson(json.loads(text))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"GeoJSON çözülemedi: {e}")
+
+
+class PointSet:
+    """
+    Diskteki bir küme sürümünün salt okunur görünümü. lats/lons bellek
+    eşlemeli dizilerdir; adlar yalnızca istendiğinde yan tablodan okunur.
+    index, ilk en yakın nokta sorgusunda süreç içinde kurulan mekansal indekstir.
+    """
+
+    def __init__(self, set_id: str, directory: Path):
+        with open(directory / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.set_id = set_id
+        self.version = meta["version"]
+        self.source = meta.get("source")
+        self.created = meta.get("created")
+        self.lats = np.load(directory / "lats.npy", mmap_mode="r")
+        self.lons = np.load(directory / "lons.npy", mmap_mode="r")
+        self._names = None
+        self._name_offsets = None
+        if (directory / "names.bin").exists():
+            self._names = np.memmap(directory / "names.bin", dtype=np.uint8, mode="r")
+            self._name_offsets = np.load(directory / "name_offsets.npy", mmap_mode="r")
+        self.index = None
+
+    def __len__(self) -> int:
+        return int(self.lats.size)
+
+    def name(self, index: int) -> str:
+        """Noktanın adı (yan tabloda yoksa 'Nokta i+1')"""
+        if self._name_offsets is not None:
+            start, end = int(self._name_offsets[index]), int(self._name_offsets[index + 1])
+            if end > start:
+                return bytes(self._names[start:end]).decode()
+        return default_name(index)
+
+    def names(self, indices: Optional[Sequence[int]] = None) -> list[str]:
+        """Verilen indekslerin (varsayılan tüm noktaların) adları"""
+        if indices is None:
+            indices = range(len(self))
+        return [self.name(i) for i in indices]
+
+    def describe(self) -> dict:
+        return {
+            "set_id": self.set_id,
+            "total_points": len(self),
+            "named": self._name_offsets is not None,
+            "source": self.source,
+            "created": self.created,
+            "version": self.version
+        }
+
+
+class PointSetRegistry:
+    """
+    Nokta kümesi deposu. Her süreç açtığı kümeleri önbellekte tutar; get()
+    her çağrıda CURRENT dosyasını stat ile denetler, başka bir süreç kümeyi
+    değiştirmiş veya silmişse yeni sürümü açar.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = Path(root)
+        self._open: dict[str, tuple[tuple[int, int], PointSet]] = {}
+        self._lock = threading.Lock()
+
+    def _directory(self, set_id: str) -> Path:
+        if not isinstance(set_id, str) or not set_id:
+            raise ValueError("Küme adı boş olmayan bir metin olmalı")
+        name = quote(set_id, safe="")
+        if name.startswith("."):
+            name = "%2E" + name[1:]
+        if len(name) > MAX_STORED_NAME_BYTES:
+            raise ValueError(f"Küme adı çok uzun (kodlanmış hali en fazla {MAX_STORED_NAME_BYTES} bayt)")
+        return self.root / name
+
+    @contextlib.contextmanager
+    def _locked(self, directory: Path):
+        """Kümenin .lock dosyası üzerinde özel kilit (aynı kümeyi yazan süreç ve thread'ler arasında)"""
+        with open(directory / ".lock", "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                yield
+            else:
+                with self._lock:
+                    yield
+
+    def register(self, set_id: str, lats, lons, names: Optional[Sequence[Optional[str]]] = None,
+                 source: Optional[str] = None) -> PointSet:
+        """
+        Kümeyi yeni bir sürüm olarak diske yazar ve etkinleştirir.
+        Aynı adla tekrar kayıt eskisini değiştirir.
+
+        Raises:
+            ValueError: Küme boşsa, koordinatlar geçersizse veya ad sayısı tutmuyorsa
+        """
+        lats = np.ascontiguousarray(lats, dtype=np.float64)
+        lons = np.ascontiguousarray(lons, dtype=np.float64)
+        validate_coordinate_arrays(lats, lons)
+        if not lats.size:
+            raise ValueError("Nokta kümesi en az bir nokta içermeli")
+        if names is not None and len(names) != lats.size:
+            raise ValueError("Ad sayısı nokta sayısıyla aynı olmalı")
+
+        directory = self._directory(set_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        version = f"{time.time_ns():x}-{os.getpid()}-{threading.get_ident():x}"
+        staging = directory / f".{version}.tmp"
+        staging.mkdir()
+        try:
+            np.save(staging / "lats.npy", lats)
+            np.save(staging / "lons.npy", lons)
+            if names is not None:
+                encoded = [(name or "").encode() for name in names]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                np.cumsum([len(name) for name in encoded], out=offsets[1:])
+                if offsets[-1]:
+                    with open(staging / "names.bin", "wb") as f:
+                        f.write(b"".join(encoded))
+                    np.save(staging / "name_offsets.npy", offsets)
+            meta = {
+                "set_id": set_id,
+                "total_points": int(lats.size),
+                "version": version,
+                "source": source,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            }
+            with open(staging / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            # Yerleştirme, etkinleştirme ve temizlik kilit altında: eşzamanlı bir kayıt,
+            # diğerinin az önce yerleştirdiği veya etkinleştirdiği sürümü silemez
+            with self._locked(directory):
+                os.replace(staging, directory / version)
+                pointer = directory / f".CURRENT.{version}.tmp"
+                pointer.write_text(version)
+                os.replace(pointer, directory / "CURRENT")
+                # Sürüm silinmeden önce eşlenir; silinse de bu görünüm okunmaya devam eder
+                point_set = PointSet(set_id, directory / version)
+                current = (directory / "CURRENT").read_text().strip()
+                # Eski sürümler: onları eşlemiş süreçler dosyalar silinse de okumaya devam eder
+                for entry in directory.iterdir():
+                    if entry.is_dir() and entry.name != current and not entry.name.startswith("."):
+                        shutil.rmtree(entry, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        return point_set
+
+    def register_file(self, set_id: str, path, file_format: Optional[str] = None) -> PointSet:
+        """Sunucu tarafındaki bir CSV veya GeoJSON dosyasını kümeye yükler"""
+        path = Path(path)
+        file_format = file_format or detect_format(path.name)
+        if file_format is None:
+            raise ValueError(f"Dosya biçimi anlaşılamadı: {path.name} (csv veya geojson)")
+        lats, lons, names = parse_point_file(path.read_bytes(), file_format)
+        return self.register(set_id, lats, lons, names, source=str(path))
+
+    def get(self, set_id: str) -> Optional[PointSet]:
+        """Kümenin etkin sürümü; kayıtlı değilse None"""
+        directory = self._directory(set_id)
+        pointer = directory / "CURRENT"
+        for _ in range(2):
+            try:
+                stat = os.stat(pointer)
+            except FileNotFoundError:
+                with self._lock:
+                    self._open.pop(set_id, None)
+                return None
+            stamp = (stat.st_ino, stat.st_mtime_ns)
+            cached = self._open.get(set_id)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            try:
+                point_set = PointSet(set_id, directory / pointer.read_text().strip())
+            except FileNotFoundError:
+                continue  # Sürüm okunurken başka bir süreç kümeyi değiştirdi
+            with self._lock:
+                self._open[set_id] = (stamp, point_set)
+            return point_set
+        return None
+
+    def list(self) -> list[PointSet]:
+        """Kayıtlı tüm kümeler (ada göre sıralı)"""
+        if not self.root.is_dir():
+            return []
+        point_sets = []
+        for directory in self.root.iterdir():
+            try:
+                version = (directory / "CURRENT").read_text().strip()
+                with open(directory / version / "meta.json", encoding="utf-8") as f:
+                    set_id = json.load(f)["set_id"]
+            except (OSError, ValueError, KeyError):
+                continue
+            point_set = self.get(set_id)
+            if point_set is not None:
+                point_sets.append(point_set)
+        return sorted(point_sets, key=lambda point_set: point_set.set_id)
+
+    def delete(self, set_id: str) -> bool:
+        """Kümeyi siler; kayıtlı değilse False"""
+        directory = self._directory(set_id)
+        try:
+            os.remove(directory / "CURRENT")
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self._open.pop(set_id, None)
+        shutil.rmtree(directory, ignore_errors=True)
+        return True
+
+
+def registry_from_env() -> PointSetRegistry:
+    """
+    Ortam değişkenlerinden nokta kümesi deposu.
+
+    - DIST_POINT_SETS_DIR: Kümelerin saklandığı dizin (varsayılan mcp/point_sets);
+      REST worker'ları ve MCP süreçleri aynı dizini kullanarak kümeleri paylaşır
+    """
+    return PointSetRegistry(os.environ.get("DIST_POINT_SETS_DIR", DEFAULT_ROOT))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Paylaşılan nokta kümelerini yönet")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="CSV veya GeoJSON dosyasını kümeye yükle")
+    load.add_argument("set_id")
+    load.add_argument("path")
+    load.add_argument("--format", choices=POINT_FILE_FORMATS, help="Dosya biçimi (varsayılan uzantıdan)")
+    commands.add_parser("list", help="Kayıtlı kümeleri listele")
+    delete = commands.add_parser("delete", help="Kümeyi sil")
+    delete.add_argument("set_id")
+    args = parser.parse_args()
+
+    registry = registry_from_env()
+    if args.command == "load":
+        start = time.perf_counter()
+        point_set = registry.register_file(args.set_id, args.path, args.format)
+        print(f"{point_set.set_id}: {len(point_set)} nokta yüklendi ({time.perf_counter() - start:.2f} s)")
+    elif args.command == "list":
+        for point_set in registry.list():
+            print(json.dumps(point_set.describe(), ensure_ascii=False))
+    elif args.command == "delete":
+        if not registry.delete(args.set_id):
+            raise SystemExit(f"Kayıtlı nokta kümesi bulunamadı: {args.set_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Canlı Takip Oturumu
+Bir WebSocket bağlantısının durumu: sabit bir hedef kümesi ve hareket eden
+varlıkların (araç, kurye) son konumları, en yakın hedefleri ve eşik bantları.
+
+Her konum güncellemesinde yalnızca hareket eden varlıklar hesaplanır. Mesafe
+akışı kapalıysa (yalnızca en yakın hedef ve eşik olayları) her varlık için
+son tam hesabın yapıldığı konum (çapa) saklanır: varlık çapadan en fazla R km
+uzaklaştıysa her hedefin mesafesi de en fazla R km değişmiştir (üçgen
+eşitsizliği). Böylece yalnızca en yakın olabilecek veya bir eşiğe R'den yakın
+hedefler yeniden hesaplanır; aday oranı büyüyünce çapa yenilenir.
+"""
+
+import os
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from distvec import coordinate_arrays, distance_array
+
+
+# Bağlantı başına en fazla (varlık x hedef) hücresi
+MAX_TRACKED_CELLS = 2_000_000
+# Aday hedef oranı bunu aşınca varlığın tüm satırı yeniden hesaplanır ve çapa yenilenir
+FULL_RECOMPUTE_RATIO = 0.25
+# Kayan nokta hatasına karşı sürüklenme yarıçapına eklenen pay (km)
+DRIFT_MARGIN_KM = 1e-9
+
+
+def max_tracked_cells_from_env() -> int:
+    """DIST_TRACK_MAX_CELLS ortam değişkeninden bağlantı başına hücre sınırı"""
+    return int(os.environ.get("DIST_TRACK_MAX_CELLS", MAX_TRACKED_CELLS))
+
+
+def parse_positions(positions) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """
+    [{"id", "lat", "lon"}] listesini kimliklere ve koordinat dizilerine çevirir.
+    Aynı kimlik birden fazla kez geçerse son konum kullanılır.
+    """
+    if not isinstance(positions, list):
+        raise ValueError("positions bir liste olmalı")
+    latest = {}
+    for position in positions:
+        if not isinstance(position, dict) or "id" not in position:
+            raise ValueError("Her konum id, lat ve lon alanları içermeli")
+        lat, lon = position.get("lat"), position.get("lon")
+        if not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in (lat, lon)):
+            raise ValueError(f"Konum koordinatları sayısal olmalı (id={position['id']})")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Geçersiz koordinat (id={position['id']}): lat=-90..90, lon=-180..180 olmalı")
+        latest[str(position["id"])] = (float(lat), float(lon))
+    ids = list(latest)
+    coords = np.array(list(latest.values()), dtype=np.float64).reshape(-1, 2)
+    return ids, coords[:, 0].copy(), coords[:, 1].copy()
+
+
+class TrackingSession:
+    """
+    Sabit hedef kümesine karşı hareket eden varlıkları izler.
+
+    update() her varlık için en yakın hedefi, istenirse değişen mesafeleri ve
+    en yakın hedef değişimi / eşik geçişi olaylarını döndürür. Mesafeler ve
+    eşikler içeride kilometre, yanıtlarda unit_factor ile çevrilmiş birimdedir.
+    """
+
+    def __init__(self, dest_lats, dest_lons, method: str = "haversine",
+                 thresholds_km: Sequence[float] = (), report_distances: bool = True,
+                 min_change_km: float = 0.0, unit_factor: float = 1.0,
+                 dest_name: Optional[Callable[[int], str]] = None,
+                 max_cells: int = MAX_TRACKED_CELLS):
+        self.dest_lats, self.dest_lons = coordinate_arrays(dest_lats, dest_lons)
+        if self.dest_lats.ndim != 1 or not self.dest_lats.size:
+            raise ValueError("En az bir hedef nokta gerekli")
+        if not (np.all(np.abs(self.dest_lats) <= 90) and np.all(np.abs(self.dest_lons) <= 180)):
+            raise ValueError("Hedef koordinatları geçerli enlem/boylam aralığında olmalı")
+        thresholds = np.unique(np.asarray(thresholds_km, dtype=np.float64))
+        if thresholds.size and not thresholds[0] > 0:
+            raise ValueError("Eşikler pozitif olmalı")
+        if min_change_km < 0:
+            raise ValueError("min_change negatif olamaz")
+        if self.dest_lats.size > max_cells:
+            raise ValueError(f"Hedef sayısı bağlantı başına sınırı ({max_cells}) aşıyor")
+
+        self.method = method
+        self.thresholds = thresholds
+        self.report_distances = report_distances
+        self.min_change_km = float(min_change_km)
+        self.unit_factor = float(unit_factor)
+        self.dest_name = dest_name or (lambda i: f"Hedef {i+1}")
+        self.max_entities = max_cells // self.dest_lats.size
+        self.sequence = 0
+
+        n_dest = self.dest_lats.size
+        self._rows: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._lats = np.empty(0)
+        self._lons = np.empty(0)
+        self._anchor_lats = np.empty(0)
+        self._anchor_lons = np.empty(0)
+        self._drift = np.empty(0)
+        self._nearest = np.empty(0, dtype=np.int64)
+        self._anchor_distances = np.empty((0, n_dest))
+        self._bands = np.empty((0, n_dest), dtype=np.int16)
+        # Son gönderilen mesafeler (yanıt biriminde, 3 basamak)
+        self._reported = np.empty((0, n_dest)) if report_distances else None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _bands_of(self, distances: np.ndarray) -> np.ndarray:
+        """Mesafenin kaç eşiğin dışında kaldığı (0: tüm eşiklerin içinde)"""
+        return np.searchsorted(self.thresholds, distances, side="left").astype(np.int16)
+
+    def _add_rows(self, count: int) -> None:
+        """Yeni varlıklar için satır ekler (konumlar update'te yazılır)"""
+        n_dest = self.dest_lats.size
+        self._lats = np.concatenate((self._lats, np.zeros(count)))
+        self._lons = np.concatenate((self._lons, np.zeros(count)))
+        self._anchor_lats = np.concatenate((self._anchor_lats, np.zeros(count)))
+        self._anchor_lons = np.concatenate((self._anchor_lons, np.zeros(count)))
+        self._drift = np.concatenate((self._drift, np.zeros(count)))
+        self._nearest = np.concatenate((self._nearest, np.full(count, -1, dtype=np.int64)))
+        self._anchor_distances = np.vstack((self._anchor_distances, np.zeros((count, n_dest))))
+        # Yeni varlık tüm eşiklerin dışında başlar; ilk konumdaki girişler olay olarak bildirilir
+        self._bands = np.vstack((self._bands, np.full((count, n_dest), self.thresholds.size, dtype=np.int16)))
+        if self._reported is not None:
+            self._reported = np.vstack((self._reported, np.full((count, n_dest), np.nan)))
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """Varlıkları takipten çıkarır; çıkarılan varlık sayısını döndürür"""
+        drop = sorted({self._rows[str(i)] for i in ids if str(i) in self._rows})
+        if not drop:
+            return 0
+        keep = np.setdiff1d(np.arange(len(self._ids)), drop)
+        for name in ("_lats", "_lons", "_anchor_lats", "_anchor_lons", "_drift", "_nearest",
+                     "_anchor_distances", "_bands", "_reported"):
+            array = getattr(self, name)
+            if array is not None:
+                setattr(self, name, array[keep])
+        self._ids = [self._ids[row] for row in keep.tolist()]
+        self._rows = {entity: row for row, entity in enumerate(self._ids)}
+        return len(drop)
+
+    def update(self, ids: Sequence[str], lats: np.ndarray, lons: np.ndarray) -> dict:
+        """
+        Varlık konumlarını günceller ve değişiklikleri döndürür.
+
+        Returns:
+            {"seq", "computed" (hesaplanan mesafe sayısı), "entities" (hareket eden
+            varlıkların en yakın hedefi ve değişen mesafeleri), "events"}
+        """
+        new_ids = [entity for entity in dict.fromkeys(ids) if entity not in self._rows]
+        if len(self._ids) + len(new_ids) > self.max_entities:
+            raise ValueError(f"Bağlantı başına en fazla {self.max_entities} varlık izlenebilir "
+                             f"({self.dest_lats.size} hedef)")
+        if new_ids:
+            self._add_rows(len(new_ids))
+            for entity in new_ids:
+                self._rows[entity] = len(self._ids)
+                self._ids.append(entity)
+
+        rows = np.fromiter((self._rows[entity] for entity in ids), dtype=np.int64, count=len(ids))
+        new = self._nearest[rows] < 0
+        moved = new | (self._lats[rows] != lats) | (self._lons[rows] != lons)
+        rows, lats, lons, new = rows[moved], lats[moved], lons[moved], new[moved]
+        self._lats[rows] = lats
+        self._lons[rows] = lons
+        self.sequence += 1
+        result = {"seq": self.sequence, "computed": 0, "entities": [], "events": []}
+        if not rows.size:
+            return result
+
+        # Mesafe akışında tüm satırlar gerekir; aksi halde çapadan sürüklenmeye göre budanır
+        if self.report_distances:
+            full = np.ones(rows.size, dtype=bool)
+        else:
+            drift = distance_array(self._anchor_lats[rows], self._anchor_lons[rows], lats, lons, self.method)
+            drift = np.maximum(self._drift[rows], drift) * (1 + 1e-9) + DRIFT_MARGIN_KM
+            drift[new] = 0.0
+            self._drift[rows] = drift
+            anchor = self._anchor_distances[rows]
+            radius = drift[:, None]
+            candidates = anchor <= anchor.min(axis=1, keepdims=True) + 2 * radius
+            if self.thresholds.size:
+                candidates |= self._bands_of(anchor - radius) != self._bands_of(anchor + radius)
+            full = new | (candidates.sum(axis=1) > FULL_RECOMPUTE_RATIO * self.dest_lats.size)
+
+        n_dest = self.dest_lats.size
+        current = np.full((rows.size, n_dest), np.inf)
+        changed_cells = np.zeros((rows.size, n_dest), dtype=bool)
+
+        full_rows = np.nonzero(full)[0]
+        if full_rows.size:
+            exact = distance_array(lats[full_rows, None], lons[full_rows, None],
+                                   self.dest_lats[None, :], self.dest_lons[None, :], self.method)
+            current[full_rows] = exact
+            changed_cells[full_rows] = True
+            target = rows[full_rows]
+            self._anchor_distances[target] = exact
+            self._anchor_lats[target] = lats[full_rows]
+            self._anchor_lons[target] = lons[full_rows]
+            self._drift[target] = 0.0
+            result["computed"] += exact.size
+
+        if not self.report_distances:
+            partial = np.nonzero(~full)[0]
+            if partial.size:
+                cell_rows, cell_cols = np.nonzero(candidates[partial])
+                cell_rows = partial[cell_rows]
+                current[cell_rows, cell_cols] = distance_array(lats[cell_rows], lons[cell_rows],
+                                                               self.dest_lats[cell_cols], self.dest_lons[cell_cols],
+                                                               self.method)
+                changed_cells[cell_rows, cell_cols] = True
+                result["computed"] += cell_rows.size
+
+        self._track_events(rows, current, changed_cells, result)
+        return result
+
+    def _track_events(self, rows: np.ndarray, current: np.ndarray, changed_cells: np.ndarray,
+                      result: dict) -> None:
+        """En yakın hedef, eşik bandı ve mesafe değişikliklerini sonuca ekler"""
+        factor = self.unit_factor
+        nearest = np.argmin(current, axis=1)
+        nearest_distance = current[np.arange(rows.size), nearest]
+        previous_nearest = self._nearest[rows]
+        self._nearest[rows] = nearest
+
+        # Eşik geçişleri: yalnızca yeniden hesaplanan hücrelerde bant değişebilir
+        crossings = {}
+        if self.thresholds.size:
+            cell_rows, cell_cols = np.nonzero(changed_cells)
+            bands = self._bands_of(current[cell_rows, cell_cols])
+            old_bands = self._bands[rows[cell_rows], cell_cols]
+            self._bands[rows[cell_rows], cell_cols] = bands
+            moved = np.nonzero(bands != old_bands)[0]
+            for i, j, old, new, distance in zip(cell_rows[moved].tolist(), cell_cols[moved].tolist(),
+                                                old_bands[moved].tolist(), bands[moved].tolist(),
+                                                current[cell_rows[moved], cell_cols[moved]].tolist()):
+                direction = "enter" if new < old else "exit"
+                for band in range(min(old, new), max(old, new)):
+                    crossings.setdefault(i, []).append({
+                        "type": direction,
+                        "destination": j,
+                        "destination_name": self.dest_name(j),
+                        "threshold": round(float(self.thresholds[band]) * factor, 6),
+                        "distance": round(distance * factor, 3)
+                    })
+
+        if self._reported is not None:
+            converted = np.round(current * factor, 3)
+            reported = self._reported[rows]
+            changed = np.abs(converted - reported) >= self.min_change_km * factor
+            changed &= converted != reported
+            changed |= np.isnan(reported)
+            self._reported[rows] = np.where(changed, converted, reported)
+
+        for i, row in enumerate(rows.tolist()):
+            entity = self._ids[row]
+            best = int(nearest[i])
+            entry = {
+                "id": entity,
+                "lat": float(self._lats[row]),
+                "lon": float(self._lons[row]),
+                "nearest": best,
+                "nearest_name": self.dest_name(best),
+                "nearest_distance": round(float(nearest_distance[i]) * factor, 3)
+            }
+            if self._reported is not None:
+                columns = np.nonzero(changed[i])[0]
+                entry["changed"] = columns
+                entry["distances"] = converted[i, columns]
+            result["entities"].append(entry)
+
+            if best != previous_nearest[i]:
+                result["events"].append({
+                    "type": "nearest",
+                    "id": entity,
+                    "destination": best,
+                    "destination_name": self.dest_name(best),
+                    "previous": int(previous_nearest[i]) if previous_nearest[i] >= 0 else None,
+                    "distance": entry["nearest_distance"]
+                })
+            for event in crossings.get(i, []):
+                result["events"].append({"id": entity, **event})
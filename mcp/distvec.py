@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Vektörel Mesafe Hesaplama Çekirdekleri
+Haversine ve Vincenty formüllerini NumPy dizileri üzerinde toplu olarak hesaplar.
+dist.py ve distser.py içindeki skaler fonksiyonlarla aynı sonuçları üretir.
+"""
+
+import math
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+from distconst import AUTO_METHODS, DEFAULT_MATRIX_MEMORY_MB, DEFAULT_MAX_ERROR_M
+
+
+# Dünya yarıçapı (kilometre)
+EARTH_RADIUS_KM = 6371.0
+
+# WGS-84 elipsoid parametreleri
+WGS84_A = 6378137.0  # büyük eksen (metre)
+WGS84_F = 1 / 298.257223563  # düzleşme
+WGS84_B = (1 - WGS84_F) * WGS84_A  # küçük eksen
+
+VINCENTY_ITERATION_LIMIT = 100
+VINCENTY_TOLERANCE = 1e-12
+
+# Vincenty (WGS-84) / Haversine (R=6371 km) mesafe oranının güvenli alt sınırı.
+# Gerçek oran yaklaşık 0.995 - 1.004 aralığındadır; Haversine ile yapılan
+# budamalarda Vincenty sonuçları kaçırılmasın diye yarıçap bu oranla genişletilir.
+VINCENTY_HAVERSINE_MIN_RATIO = 0.99
+
+# Birinci eksantrikliğin karesi
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+# "auto" yönteminin hata modelleri (Vincenty'ye göre, küre üzerinde rastgele
+# 400 bin çift ve 1 m - 20 000 km mesafelerle ölçülmüştür):
+# - flat: hata <= 0.046 · d³ / a² · (1 + tan² φmax); katsayı güvenlik payıyla 0.1
+# - haversine: hata <= 0.00561 · d
+FLAT_ERROR_COEFF = 0.1
+FLAT_ERROR_FLOOR_KM = 1e-6  # Vincenty'nin kendi yakınsama toleransı mertebesi
+HAVERSINE_RELATIVE_ERROR = 0.0057
+
+# İsteğe bağlı gözlemci: vincenty_array her çağrıda iterasyon sayıları dizisi ve
+# Haversine'e düşen eleman sayısıyla çağırır (ör. distmetrics.observe_vincenty)
+vincenty_observer = None
+# Skaler derlenmiş Vincenty için gözlemci: (iterasyon sayısı, Haversine'e düştü mü)
+vincenty_scalar_observer = None
+
+KERNEL_BACKENDS = ("numpy", "numba", "auto")
+
+# numba arka ucu etkinse distjit modülü (bkz. use_kernel_backend)
+_jit = None
+
+
+def use_kernel_backend(name: str) -> str:
+    """
+    Çekirdek arka ucunu çalışma zamanında seçer.
+
+    - numpy: NumPy dizi çekirdekleri ve saf Python skaler fonksiyonlar
+    - numba: distjit'teki derlenmiş skaler ve paralel döngülü çekirdekler
+    - auto: numba yüklüyse numba, değilse numpy
+
+    numba yüklü değilse numba da numpy'ye düşer. Süreç havuzu işçileri arka ucu
+    kendi başlangıçlarında DIST_KERNEL_BACKEND'den okur.
+
+    Returns:
+        Etkin arka uç ("numpy" veya "numba")
+    """
+    global _jit
+    if name not in KERNEL_BACKENDS:
+        raise ValueError(f"Bilinmeyen çekirdek arka ucu: {name} ({', '.join(KERNEL_BACKENDS)})")
+    if name == "numpy":
+        _jit = None
+    else:
+        import distjit
+        _jit = distjit if distjit.AVAILABLE else None
+    return kernel_backend()
+
+
+def kernel_backend() -> str:
+    """Etkin çekirdek arka ucu"""
+    return "numba" if _jit is not None else "numpy"
+
+
+def scalar_kernel(method: str) -> Optional[Callable[[float, float, float, float], float]]:
+    """
+    numba arka ucu etkinse yöntemin derlenmiş skaler fonksiyonu, değilse None
+    (çağıran kendi saf Python fonksiyonunu kullanır)
+    """
+    if _jit is None:
+        return None
+    if method == "vincenty":
+        return _jit.vincenty_distance
+    if method == "haversine":
+        return _jit.haversine_distance
+    return None
+
+
+def coordinate_arrays(lats, lons) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Enlem/boylam dizilerini bitişik (contiguous) float64 NumPy dizilerine çevirir.
+    Girdi zaten uygun bir dizi ise kopyalama yapılmaz.
+    """
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lons = np.ascontiguousarray(lons, dtype=np.float64)
+    if lats.shape != lons.shape:
+        raise ValueError("Enlem ve boylam dizileri aynı uzunlukta olmalı")
+    return lats, lons
+
+
+def haversine_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Haversine formülünün vektörel sürümü.
+
+    Argümanlar NumPy yayınlama (broadcasting) kurallarına uyar; tipik kullanım
+    skaler bir referans nokta ile hedef dizileridir. Referans noktanın radyan ve
+    kosinüs değerleri yalnızca bir kez hesaplanır. numba arka ucu etkinse
+    (use_kernel_backend) derlenmiş paralel döngü kullanılır.
+
+    Args:
+        lat1, lon1: İlk nokta(lar) koordinatları (derece)
+        lat2, lon2: İkinci nokta(lar) koordinatları (derece)
+
+    Returns:
+        Mesafe dizisi (kilometre)
+    """
+    if _jit is not None:
+        return _jit.haversine_array(lat1, lon1, lat2, lon2)
+
+    lat1_rad = np.radians(lat1)
+    lon1_rad = np.radians(lon1)
+    lat2_rad = np.radians(lat2)
+    lon2_rad = np.radians(lon2)
+
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+
+    a = (np.sin(dlat / 2) ** 2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) *
+         np.sin(dlon / 2) ** 2)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def vincenty_array(lat1, lon1, lat2, lon2,
+                   iteration_limit: int = VINCENTY_ITERATION_LIMIT) -> np.ndarray:
+    """
+    Vincenty formülünün vektörel sürümü.
+
+    Her eleman için ayrı bir yakınsama maskesi tutulur; yakınsayan elemanlar
+    sonraki iterasyonlara katılmaz. Skaler sürümde olduğu gibi aynı noktalar için
+    0, iterasyon sınırına ulaşan elemanlar için Haversine sonucu döndürülür.
+    numba arka ucu etkinse (use_kernel_backend) eleman başına derlenmiş döngü kullanılır.
+
+    Args:
+        lat1, lon1: İlk nokta(lar) koordinatları (derece)
+        lat2, lon2: İkinci nokta(lar) koordinatları (derece)
+        iteration_limit: Eleman başına en fazla iterasyon sayısı
+
+    Returns:
+        Mesafe dizisi (kilometre)
+    """
+    if _jit is not None:
+        s, iterations = _jit.vincenty_array(lat1, lon1, lat2, lon2, iteration_limit)
+        if vincenty_observer is not None:
+            counted = iterations[iterations > 0]  # aynı noktalar (0) sayılmaz
+            vincenty_observer(counted, int(np.count_nonzero(counted >= iteration_limit)))
+        return s
+
+    a = WGS84_A
+    f = WGS84_F
+    b = WGS84_B
+
+    lat1 = np.asarray(lat1, dtype=np.float64)
+    lon1 = np.asarray(lon1, dtype=np.float64)
+    lat2 = np.asarray(lat2, dtype=np.float64)
+    lon2 = np.asarray(lon2, dtype=np.float64)
+    shape = np.broadcast_shapes(lat1.shape, lon1.shape, lat2.shape, lon2.shape)
+
+    # Nokta başına sabitler yayınlamadan önce hesaplanır (skaler referans için tek sefer)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+
+    sin_U1 = np.broadcast_to(np.sin(U1), shape).ravel()
+    cos_U1 = np.broadcast_to(np.cos(U1), shape).ravel()
+    sin_U2 = np.broadcast_to(np.sin(U2), shape).ravel()
+    cos_U2 = np.broadcast_to(np.cos(U2), shape).ravel()
+
+    lon_diff = np.broadcast_to(np.radians(lon2 - lon1), shape).ravel()
+    n = lon_diff.size
+
+    lambda_val = lon_diff.copy()
+    sin_sigma = np.zeros(n)
+    cos_sigma = np.zeros(n)
+    sigma = np.zeros(n)
+    cos2_alpha = np.zeros(n)
+    cos_2sigma_m = np.zeros(n)
+    iterations = np.zeros(n, dtype=np.int64)
+    coincident = np.zeros(n, dtype=bool)
+
+    # İteratif hesaplama: yalnızca henüz yakınsamamış elemanlar işlenir
+    active = np.arange(n)
+    while active.size:
+        lam = lambda_val[active]
+        sU1, cU1 = sin_U1[active], cos_U1[active]
+        sU2, cU2 = sin_U2[active], cos_U2[active]
+
+        sin_lambda = np.sin(lam)
+        cos_lambda = np.cos(lam)
+
+        s_sigma = np.sqrt(
+            (cU2 * sin_lambda) ** 2 +
+            (cU1 * sU2 - sU1 * cU2 * cos_lambda) ** 2
+        )
+
+        # Aynı nokta: skaler sürümdeki gibi 0 döner
+        same = s_sigma == 0
+        if same.any():
+            coincident[active[same]] = True
+            keep = ~same
+            active, lam = active[keep], lam[keep]
+            sU1, cU1, sU2, cU2 = sU1[keep], cU1[keep], sU2[keep], cU2[keep]
+            sin_lambda, cos_lambda = sin_lambda[keep], cos_lambda[keep]
+            s_sigma = s_sigma[keep]
+            if not active.size:
+                break
+
+        c_sigma = sU1 * sU2 + cU1 * cU2 * cos_lambda
+        sig = np.arctan2(s_sigma, c_sigma)
+
+        sin_alpha = cU1 * cU2 * sin_lambda / s_sigma
+        c2_alpha = 1 - sin_alpha ** 2
+
+        c_2sigma_m = np.zeros_like(c_sigma)
+        np.divide(2 * sU1 * sU2, c2_alpha, out=c_2sigma_m, where=c2_alpha != 0)
+        c_2sigma_m = np.where(c2_alpha != 0, c_sigma - c_2sigma_m, 0.0)
+
+        C = f / 16 * c2_alpha * (4 + f * (4 - 3 * c2_alpha))
+
+        new_lambda = (lon_diff[active] + (1 - C) * f * sin_alpha *
+                      (sig + C * s_sigma *
+                       (c_2sigma_m + C * c_sigma *
+                        (-1 + 2 * c_2sigma_m ** 2))))
+
+        sin_sigma[active] = s_sigma
+        cos_sigma[active] = c_sigma
+        sigma[active] = sig
+        cos2_alpha[active] = c2_alpha
+        cos_2sigma_m[active] = c_2sigma_m
+        lambda_val[active] = new_lambda
+        iterations[active] += 1
+
+        # Skaler döngü koşulunun tersi: |λ - λ_önceki| > tolerans değilse yakınsamış sayılır
+        pending = (np.abs(new_lambda - lam) > VINCENTY_TOLERANCE) & (iterations[active] < iteration_limit)
+        active = active[pending]
+
+    u2 = cos2_alpha * (a ** 2 - b ** 2) / (b ** 2)
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+
+    delta_sigma = (B * sin_sigma *
+                   (cos_2sigma_m + B / 4 *
+                    (cos_sigma * (-1 + 2 * cos_2sigma_m ** 2) -
+                     B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) *
+                     (-3 + 4 * cos_2sigma_m ** 2))))
+
+    s = b * A * (sigma - delta_sigma) / 1000  # metreyi kilometreye çevir
+    s[coincident] = 0.0
+
+    # Yakınsama sağlanamayan elemanlar için Haversine kullan
+    fallback = (iterations >= iteration_limit) & ~coincident
+    if vincenty_observer is not None:
+        vincenty_observer(iterations[~coincident], int(fallback.sum()))
+    if fallback.any():
+        lat1_f = np.broadcast_to(lat1, shape).ravel()[fallback]
+        lon1_f = np.broadcast_to(lon1, shape).ravel()[fallback]
+        lat2_f = np.broadcast_to(lat2, shape).ravel()[fallback]
+        lon2_f = np.broadcast_to(lon2, shape).ravel()[fallback]
+        s[fallback] = haversine_array(lat1_f, lon1_f, lat2_f, lon2_f)
+
+    return s.reshape(shape)
+
+
+def flat_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Elipsoid üzerinde düzlem (eşdikdörtgen) yaklaşımının vektörel sürümü.
+
+    Orta enlemdeki meridyen (M) ve birinci dikey (N) eğrilik yarıçaplarıyla
+    yerel düzlemde Pisagor uygular. Kısa mesafelerde Haversine'den hem daha
+    ucuz hem daha doğrudur; hata mesafenin küpüyle ve kutuplara yaklaştıkça
+    büyür (bkz. flat_error_bound).
+
+    Returns:
+        Mesafe dizisi (kilometre)
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    mean_lat = (lat1_rad + lat2_rad) / 2
+    dlat = lat2_rad - lat1_rad
+    # Boylam farkı -180..180 aralığına katlanır (antimeridyen)
+    dlon = np.radians((np.asarray(lon2) - lon1 + 180) % 360 - 180)
+
+    w = 1 - WGS84_E2 * np.sin(mean_lat) ** 2
+    meridional = WGS84_A * (1 - WGS84_E2) / (w * np.sqrt(w))
+    prime_vertical = WGS84_A / np.sqrt(w)
+
+    return np.hypot(meridional * dlat, prime_vertical * np.cos(mean_lat) * dlon) / 1000.0
+
+
+def flat_error_bound(distance_km, lat1, lat2) -> np.ndarray:
+    """Düzlem yaklaşımının Vincenty'ye göre hata üst sınırı (kilometre)"""
+    max_lat = np.radians(np.maximum(np.abs(lat1), np.abs(lat2)))
+    # tan 90°'de taşmasın diye üst sınır; kutup çevresinde düzlem hiç seçilmez
+    slope = np.tan(np.minimum(max_lat, math.radians(89.999)))
+    distance_km = np.asarray(distance_km)
+    return FLAT_ERROR_COEFF * distance_km ** 3 / (WGS84_A / 1000.0) ** 2 * (1 + slope ** 2) + FLAT_ERROR_FLOOR_KM
+
+
+def distance_array(lat1, lon1, lat2, lon2, method: str = "haversine") -> np.ndarray:
+    """Seçilen yönteme göre vektörel mesafe hesaplar (kilometre)"""
+    if method == "vincenty":
+        return vincenty_array(lat1, lon1, lat2, lon2)
+    if method == "flat":
+        return flat_array(lat1, lon1, lat2, lon2)
+    return haversine_array(lat1, lon1, lat2, lon2)
+
+
+def auto_distance_array(lat1, lon1, lat2, lon2,
+                        max_error_m: float = DEFAULT_MAX_ERROR_M) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Her çift için hata bütçesini karşılayan en ucuz yöntemle mesafe hesaplar.
+
+    Önce tüm çiftler düzlem yaklaşımıyla hesaplanır; hata sınırı max_error_m'yi
+    aşanlar Haversine ile, Haversine sınırını da aşanlar Vincenty ile yeniden
+    hesaplanır. Böylece pahalı yöntem yalnızca gereken elemanlara uygulanır.
+
+    Returns:
+        (mesafe dizisi (km), kullanılan yöntemin AUTO_METHODS içindeki indeksi)
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (lat1, lon1, lat2, lon2))
+    )
+    budget_km = max_error_m / 1000.0
+
+    distances = flat_array(lat1, lon1, lat2, lon2)
+    methods = np.zeros(distances.shape, dtype=np.uint8)
+
+    pending = flat_error_bound(distances, lat1, lat2) > budget_km
+    if pending.any():
+        distances[pending] = haversine_array(lat1[pending], lon1[pending], lat2[pending], lon2[pending])
+        methods[pending] = 1
+
+        pending &= distances * HAVERSINE_RELATIVE_ERROR > budget_km
+        if pending.any():
+            distances[pending] = vincenty_array(lat1[pending], lon1[pending], lat2[pending], lon2[pending])
+            methods[pending] = 2
+
+    return distances, methods
+
+
+def auto_method_counts(methods: np.ndarray) -> dict[str, int]:
+    """auto_distance_array yöntem indekslerini {yöntem adı: eleman sayısı} özetine çevirir"""
+    counts = np.bincount(methods, minlength=len(AUTO_METHODS))
+    return {name: int(count) for name, count in zip(AUTO_METHODS, counts.tolist()) if count}
+
+
+def auto_distance(lat1: float, lon1: float, lat2: float, lon2: float,
+                  max_error_m: float = DEFAULT_MAX_ERROR_M) -> tuple[str, Optional[float]]:
+    """
+    Tek bir çift için hata bütçesini karşılayan en ucuz yöntemi seçer.
+
+    Skaler yollarda (önbellek, tekil istekler) NumPy yükü olmadan karar verir.
+    Düzlem veya Haversine yeterliyse mesafe de hesaplanmış olur; Vincenty
+    gerekiyorsa hesap çağırana (önbellek, birleştirici) bırakılır.
+
+    Returns:
+        (yöntem adı, mesafe (km) veya Vincenty seçildiyse None)
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    mean_lat = (lat1_rad + lat2_rad) / 2
+    dlon = math.radians((lon2 - lon1 + 180) % 360 - 180)
+    budget_km = max_error_m / 1000.0
+
+    w = 1 - WGS84_E2 * math.sin(mean_lat) ** 2
+    meridional = WGS84_A * (1 - WGS84_E2) / (w * math.sqrt(w))
+    prime_vertical = WGS84_A / math.sqrt(w)
+    flat_km = math.hypot(meridional * dlat, prime_vertical * math.cos(mean_lat) * dlon) / 1000.0
+
+    slope = math.tan(min(max(abs(lat1_rad), abs(lat2_rad)), math.radians(89.999)))
+    if FLAT_ERROR_COEFF * flat_km ** 3 / (WGS84_A / 1000.0) ** 2 * (1 + slope ** 2) + FLAT_ERROR_FLOOR_KM <= budget_km:
+        return "flat", flat_km
+
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    haversine_km = EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    if haversine_km * HAVERSINE_RELATIVE_ERROR <= budget_km:
+        return "haversine", haversine_km
+
+    return "vincenty", None
+
+
+# Matris hesabında hücre başına tahmini geçici bellek (bayt). Vincenty iterasyonu
+# maske ve ara diziler nedeniyle Haversine'den çok daha fazla bellek kullanır.
+MATRIX_BYTES_PER_CELL = {"haversine": 64, "vincenty": 320}
+
+
+def matrix_tile_shape(n_rows: int, n_cols: int, method: str = "haversine",
+                      max_memory_mb: float = DEFAULT_MATRIX_MEMORY_MB) -> tuple[int, int]:
+    """
+    Bellek sınırına sığacak karo (tile) boyutunu hesaplar.
+
+    Returns:
+        (satır sayısı, sütun sayısı) - her ikisi de en az 1
+    """
+    bytes_per_cell = MATRIX_BYTES_PER_CELL.get(method, MATRIX_BYTES_PER_CELL["vincenty"])
+    max_cells = max(1, int(max_memory_mb * 1024 * 1024 // bytes_per_cell))
+    tile_cols = max(1, min(n_cols, max_cells))
+    tile_rows = max(1, min(n_rows, max_cells // tile_cols))
+    return tile_rows, tile_cols
+
+
+def iter_distance_tiles(origin_lats, origin_lons, dest_lats, dest_lons,
+                        method: str = "haversine",
+                        max_memory_mb: float = DEFAULT_MATRIX_MEMORY_MB):
+    """
+    N×M mesafe matrisini karolar halinde üretir.
+
+    Her adımda yalnızca bir karo hesaplanır; böylece ara bellek kullanımı
+    matris boyutundan bağımsız olarak max_memory_mb ile sınırlı kalır.
+
+    Yields:
+        (satır başlangıcı, sütun başlangıcı, mesafe karosu (kilometre))
+    """
+    origin_lats, origin_lons = coordinate_arrays(origin_lats, origin_lons)
+    dest_lats, dest_lons = coordinate_arrays(dest_lats, dest_lons)
+    n_rows, n_cols = origin_lats.size, dest_lats.size
+    tile_rows, tile_cols = matrix_tile_shape(n_rows, n_cols, method, max_memory_mb)
+
+    for row in range(0, n_rows, tile_rows):
+        row_end = min(row + tile_rows, n_rows)
+        o_lat = origin_lats[row:row_end, np.newaxis]
+        o_lon = origin_lons[row:row_end, np.newaxis]
+        for col in range(0, n_cols, tile_cols):
+            col_end = min(col + tile_cols, n_cols)
+            tile = distance_array(o_lat, o_lon,
+                                  dest_lats[np.newaxis, col:col_end],
+                                  dest_lons[np.newaxis, col:col_end],
+                                  method)
+            yield row, col, tile
+
+
+def distance_matrix(origin_lats, origin_lons, dest_lats, dest_lons,
+                    method: str = "haversine",
+                    max_memory_mb: float = DEFAULT_MATRIX_MEMORY_MB) -> np.ndarray:
+    """Tam (yoğun) N×M mesafe matrisini karolar halinde doldurur (kilometre)"""
+    matrix = np.empty((np.size(origin_lats), np.size(dest_lats)), dtype=np.float64)
+    for row, col, tile in iter_distance_tiles(origin_lats, origin_lons, dest_lats, dest_lons,
+                                              method, max_memory_mb):
+        matrix[row:row + tile.shape[0], col:col + tile.shape[1]] = tile
+    return matrix
+
+
+def sparse_distance_matrix(origin_lats, origin_lons, dest_lats, dest_lons,
+                           max_distance_km: float, method: str = "haversine",
+                           max_memory_mb: float = DEFAULT_MATRIX_MEMORY_MB
+                           ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Yalnızca max_distance_km içindeki çiftleri döndüren seyrek mesafe matrisi.
+
+    Returns:
+        (satır indeksleri, sütun indeksleri, mesafeler (kilometre))
+    """
+    rows, cols, values = [], [], []
+    for row, col, tile in iter_distance_tiles(origin_lats, origin_lons, dest_lats, dest_lons,
+                                              method, max_memory_mb):
+        tile_rows, tile_cols = np.nonzero(tile <= max_distance_km)
+        rows.append(tile_rows + row)
+        cols.append(tile_cols + col)
+        values.append(tile[tile_rows, tile_cols])
+
+    if not values:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float64)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(values)
+
+
+def bounding_box_mask(lat: float, lon: float, radius_km: float, lats, lons) -> np.ndarray:
+    """
+    Merkez etrafındaki radius_km yarıçaplı dairenin enlem/boylam sınırlayıcı
+    kutusu içinde kalan noktaları işaretler.
+
+    Daire bir kutbu içeriyorsa tüm boylamlar kabul edilir; ±180° boylamını aşan
+    kutular iki aralığa bölünür. Kutu daireyi tamamen kapsadığı için kutu dışında
+    kalan noktalar kesinlikle yarıçap dışındadır.
+
+    Returns:
+        Kutu içindeki noktalar için True olan maske
+    """
+    # Kayan nokta hatalarına karşı küçük pay
+    angular = radius_km / EARTH_RADIUS_KM * (1 + 1e-9)
+    if angular >= math.pi:
+        return np.ones(np.shape(lats), dtype=bool)
+
+    angular_deg = math.degrees(angular)
+    lat_min = lat - angular_deg
+    lat_max = lat + angular_deg
+    mask = (lats >= lat_min) & (lats <= lat_max)
+
+    # Kutup daire içindeyse boylam sınırı yoktur
+    if lat_max >= 90 or lat_min <= -90:
+        return mask
+
+    lon_delta = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(lat)))))
+    lon_min = lon - lon_delta
+    lon_max = lon + lon_delta
+
+    # Antimeridyen (±180°) geçişi
+    if lon_min < -180:
+        mask &= (lons >= lon_min + 360) | (lons <= lon_max)
+    elif lon_max > 180:
+        mask &= (lons >= lon_min) | (lons <= lon_max - 360)
+    else:
+        mask &= (lons >= lon_min) & (lons <= lon_max)
+
+    return mask
+
+
+def points_within_radius(lat: float, lon: float, radius_km: float, lats, lons,
+                         method: str = "haversine") -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    radius_km içindeki noktaları sınırlayıcı kutu ön filtresiyle bulur.
+
+    Kutu dışındaki noktalar mesafe hesabına girmez; yalnızca kutu içindekiler
+    seçilen yöntemle hesaplanır. Vincenty için kutu, elipsoid/küre farkını
+    karşılayacak şekilde genişletilir.
+
+    Returns:
+        (yarıçap içindeki nokta indeksleri, mesafeleri (km), hesaplanan nokta sayısı)
+    """
+    lats, lons = coordinate_arrays(lats, lons)
+    box_radius = radius_km / VINCENTY_HAVERSINE_MIN_RATIO if method == "vincenty" else radius_km
+    candidates = np.nonzero(bounding_box_mask(lat, lon, box_radius, lats, lons))[0]
+
+    distances = distance_array(lat, lon, lats[candidates], lons[candidates], method)
+    inside = distances <= radius_km
+    return candidates[inside], distances[inside], int(candidates.size)
+
+
+# Çekirdek arka ucu (DIST_KERNEL_BACKEND=numpy|numba|auto; varsayılan numpy)
+use_kernel_backend(os.environ.get("DIST_KERNEL_BACKEND", "numpy"))
@@ -1,6 +1,9 @@
 import asyncio
+import os
 from fastmcp import FastMCP, Client
 
+from distclient import PooledMCPClient
+
 mcp = FastMCP("distance_calculator")
 
 @mcp.tool
@@ -8,12 +11,24 @@ def calcthedistance(loc1: float, loc2:float) -> float:
     """Calculate the distance between two locations."""
     return f"iki nokta arası mesafe: {abs(loc1 - loc2)}"
 
-client = Client(mcp)
+# Oturum ilk çağrıda açılır ve açık kalır; eşzamanlı çağrılar aynı oturumu
+# paylaşır, oturum koparsa yeniden bağlanılır. client.stats() gecikmeleri verir.
+client = PooledMCPClient(lambda: Client(mcp))
 
-async def call_tool(name: str):
-    async with client:
-        result = await client.call_tool("distance_calculator", {"loc1": 10.0, "loc2": 20.0})
-        print(result)
+async def call_tool(name: str = "calcthedistance", arguments: dict | None = None):
+    result = await client.call_tool(name, arguments or {"loc1": 10.0, "loc2": 20.0})
+    print(result)
+    return result
 
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    # DIST_MCP_TRANSPORT=streamable-http veya sse ile tek bir uzun ömürlü süreç
+    # birden çok istemciye hizmet verir (dist.py ile aynı ortam değişkenleri)
+    transport = os.environ.get("DIST_MCP_TRANSPORT", "stdio")
+    if transport == "stdio":
+        mcp.run()
+    else:
+        mcp.run(
+            transport=transport,
+            host=os.environ.get("DIST_MCP_HOST", "127.0.0.1"),
+            port=int(os.environ.get("DIST_MCP_PORT", 8001))
+        )
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+MCP sunucusu (dist.py): `path` argümanlarının DIST_IMPORT_DIR ile sınırlanması.
+mcp SDK'sı yüklü değilse atlanır (çalıştırma: README, "Testler").
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp.server")
+
+import dist  # noqa: E402
+from distfence import GeofenceRegistry  # noqa: E402
+
+GEOJSON = {
+    "type": "Polygon",
+    "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]]]
+}
+
+
+@pytest.fixture
+def import_dir(tmp_path, monkeypatch):
+    root = tmp_path / "imports"
+    root.mkdir()
+    (root / "zone.geojson").write_text(json.dumps(GEOJSON))
+    (root / "nested").mkdir()
+    (root / "nested" / "zone.geojson").write_text(json.dumps(GEOJSON))
+    outside = tmp_path / "secret.geojson"
+    outside.write_text(json.dumps(GEOJSON))
+    (root / "escape.geojson").symlink_to(outside)
+    monkeypatch.setattr(dist, "IMPORT_DIR", root.resolve())
+    monkeypatch.setattr(dist, "geofences", GeofenceRegistry(tmp_path / "fences"))
+    return root
+
+
+def _call(name, arguments):
+    return json.loads(asyncio.run(dist.handle_call_tool(name, arguments))[0].text)
+
+
+def test_paths_are_disabled_without_import_dir(monkeypatch):
+    monkeypatch.setattr(dist, "IMPORT_DIR", None)
+    with pytest.raises(ValueError, match="DIST_IMPORT_DIR"):
+        dist.resolve_import_path("zone.geojson")
+
+
+def test_resolves_files_inside_import_dir(import_dir):
+    assert dist.resolve_import_path("zone.geojson") == (import_dir / "zone.geojson").resolve()
+    assert dist.resolve_import_path("nested/../nested/zone.geojson") == (import_dir / "nested" / "zone.geojson").resolve()
+
+
+@pytest.mark.parametrize("path", [
+    "/etc/passwd",
+    "../secret.geojson",
+    "nested/../../secret.geojson",
+    "escape.geojson",  # dizin dışına işaret eden sembolik bağ
+    "missing.geojson",
+    "nested",
+    "",
+])
+def test_rejects_paths_outside_import_dir(import_dir, path):
+    with pytest.raises(ValueError):
+        dist.resolve_import_path(path)
+
+
+def test_register_geofence_reads_only_import_dir(import_dir):
+    fence = _call("register_geofence", {"fence_id": "zone", "path": "zone.geojson"})
+    assert fence["fence_id"] == "zone"
+    assert fence["vertices"] == 4
+    with pytest.raises(ValueError, match="bulunamadı"):
+        _call("register_geofence", {"fence_id": "secret", "path": str(import_dir.parent / "secret.geojson")})
+    with pytest.raises(ValueError, match="bulunamadı"):
+        _call("register_geofence", {"fence_id": "secret", "path": "escape.geojson"})
+    assert dist.geofences.get("secret") is None
@@ -0,0 +1,152 @@
+"""
+Geofence içerme ve sınır mesafesi ile GeofenceRegistry doğrulaması.
+"""
+
+import numpy as np
+import pytest
+
+from distconst import MAX_STORED_NAME_BYTES
+from distfence import DEFAULT_LEAF_SIZE, Geofence, GeofenceRegistry, geojson_rings, polygon_rings
+
+SQUARE = [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]
+
+
+def test_long_fence_id_is_rejected(tmp_path):
+    registry = GeofenceRegistry(tmp_path)
+    rings = polygon_rings(SQUARE, [])
+    for fence_id in ("x" * 300, "ş" * 100):
+        with pytest.raises(ValueError, match="çok uzun"):
+            registry.register(fence_id, rings)
+    fence = registry.register("x" * MAX_STORED_NAME_BYTES, rings)
+    assert fence.contains(np.array([0.5]), np.array([0.5]))[0]
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _unit(lats, lons):
+    lat, lon = np.radians(lats), np.radians(lons)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _reference_contains(rings, lats, lons):
+    """
+    Gnomonik izdüşümle çift-tek kuralı: izdüşüm büyük daireleri doğruya çevirir,
+    böylece her nokta için düzlemde kesin ışın testi yapılır (köşeler noktanın
+    yarım küresinde olmalı).
+    """
+    inside = np.zeros(len(lats), dtype=bool)
+    for k, point in enumerate(_unit(lats, lons)):
+        east = np.cross([0.0, 0.0, 1.0], point)
+        east /= np.linalg.norm(east)
+        north = np.cross(point, east)
+        crossings = 0
+        for ring_lats, ring_lons in rings:
+            vertices = _unit(ring_lats, ring_lons)
+            depth = vertices @ point
+            assert np.all(depth > 0)
+            projected = vertices / depth[:, None]
+            x, y = projected @ east, projected @ north
+            x2, y2 = np.roll(x, -1), np.roll(y, -1)
+            straddles = (y > 0) != (y2 > 0)
+            at = x[straddles] - y[straddles] * (x2[straddles] - x[straddles]) / (y2[straddles] - y[straddles])
+            crossings += int(np.count_nonzero(at > 0))
+        inside[k] = crossings % 2 == 1
+    return inside
+
+
+def _reference_distance(rings, lats, lons):
+    """Her kenar yayına kesin açısal mesafenin kaba kuvvet en küçüğü (km)"""
+    starts = np.concatenate([_unit(ring_lats, ring_lons) for ring_lats, ring_lons in rings])
+    ends = np.concatenate([np.roll(_unit(ring_lats, ring_lons), -1, axis=0) for ring_lats, ring_lons in rings])
+    normals = np.cross(starts, ends)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    result = np.empty(len(lats))
+    for k, point in enumerate(_unit(lats, lons)):
+        sine = normals @ point
+        foot = point - sine[:, None] * normals
+        within = (np.einsum("ij,ij->i", np.cross(starts, foot), normals) >= 0) & \
+                 (np.einsum("ij,ij->i", np.cross(foot, ends), normals) >= 0)
+        across = np.arcsin(np.clip(np.abs(sine), 0, 1))
+        to_start = np.arccos(np.clip(starts @ point, -1, 1))
+        to_end = np.arccos(np.clip(ends @ point, -1, 1))
+        result[k] = np.where(within, across, np.minimum(to_start, to_end)).min()
+    return result * EARTH_RADIUS_KM
+
+
+def _star(center_lat, center_lon, n, inner, outer, phase=0.0):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False) + phase
+    radii = np.where(np.arange(n) % 2 == 0, outer, inner)
+    lats = center_lat + radii * np.sin(angles)
+    lons = center_lon + radii * np.cos(angles) / np.cos(np.radians(center_lat))
+    return [[lat, (lon + 180.0) % 360.0 - 180.0] for lat, lon in zip(lats, lons)]
+
+
+def _fences():
+    yield "square_with_hole", polygon_rings(
+        [[0.0, 0.0], [0.0, 10.0], [10.0, 10.0], [10.0, 0.0]],
+        [[[3.0, 3.0], [7.0, 3.0], [7.0, 7.0], [3.0, 7.0]]])
+    # Kenar sayısı dilim ve yaprak sayısını büyütür
+    yield "star", polygon_rings(_star(41.0, 29.0, 600, 2.0, 5.0))
+    # Yaylar kuzeye şişer: sınırlayıcı kutu köşelerin enleminden yüksek olmalı
+    yield "high_latitude", polygon_rings([[70.0, -40.0], [70.0, 40.0], [60.0, 40.0], [60.0, -40.0]])
+    yield "antimeridian", polygon_rings(
+        _star(-15.0, 180.0, 40, 3.0, 6.0),
+        [_star(-15.0, 180.0, 12, 1.0, 1.5, phase=0.3)])
+    yield "multipolygon", geojson_rings({
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[10.0, 40.0], [20.0, 40.0], [20.0, 48.0], [10.0, 48.0], [10.0, 40.0]],
+             [[13.0, 42.0], [17.0, 42.0], [17.0, 46.0], [13.0, 46.0], [13.0, 42.0]]],
+            [[[22.0, 41.0], [30.0, 41.0], [26.0, 47.0], [22.0, 41.0]]],
+            [[[14.0, 43.0], [16.0, 43.0], [16.0, 45.0], [14.0, 45.0], [14.0, 43.0]]],
+        ]
+    })
+
+
+FENCES = dict(_fences())
+
+
+def _sample(fence, n=1500, seed=3):
+    """Sınırlayıcı kutunun biraz dışına taşan rastgele noktalar"""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(fence.lat_min - 2, min(fence.lat_max + 2, 89.0), n)
+    rel = rng.uniform(fence.rel_lon_min - 2, fence.rel_lon_max + 2, n)
+    lons = (fence.ref_lon + rel + 180.0) % 360.0 - 180.0
+    return lats, lons
+
+
+@pytest.mark.parametrize("name", FENCES)
+def test_contains_matches_reference(name):
+    fence = Geofence(name, FENCES[name])
+    lats, lons = _sample(fence)
+    distances = _reference_distance(fence.rings, lats, lons)
+    # Sınıra çok yakın noktalar kayan nokta yuvarlamasıyla iki tarafa düşebilir
+    clear = distances > 1e-6
+    expected = _reference_contains(fence.rings, lats[clear], lons[clear])
+    assert 0 < expected.sum() < expected.size
+    np.testing.assert_array_equal(fence.contains(lats[clear], lons[clear]), expected)
+
+
+@pytest.mark.parametrize("leaf_size", [1, DEFAULT_LEAF_SIZE, 10_000])
+@pytest.mark.parametrize("name", FENCES)
+def test_boundary_distance_matches_brute_force(name, leaf_size):
+    fence = Geofence(name, FENCES[name], leaf_size=leaf_size)
+    lats, lons = _sample(fence, n=1000, seed=4)
+    np.testing.assert_allclose(fence.boundary_distance(lats, lons),
+                               _reference_distance(fence.rings, lats, lons), rtol=0, atol=1e-6)
+
+
+def test_boundary_distance_on_vertices_is_zero():
+    fence = Geofence("star", FENCES["star"])
+    lats = np.concatenate([lats for lats, _ in fence.rings])
+    lons = np.concatenate([lons for _, lons in fence.rings])
+    np.testing.assert_allclose(fence.boundary_distance(lats, lons), 0, atol=1e-9)
+
+
+def test_bounds_include_arc_bulge():
+    fence = Geofence("high_latitude", FENCES["high_latitude"])
+    assert fence.lat_max > 72.0
+    # 70° enleminde köşelerin arasındaki nokta kuzeye şişen yayın altında, yani içeride
+    assert fence.contains([71.0], [0.0])[0]
+    assert not fence.contains([75.0], [0.0])[0]
@@ -0,0 +1,85 @@
+"""
+proximity_pairs ızgara birleştirmesinin O(n²) kaba kuvvet sonucuyla aynı
+çiftleri ve mesafeleri bulduğunu doğrular.
+"""
+
+import numpy as np
+import pytest
+
+from distindex import proximity_pairs
+from distvec import distance_array
+
+
+def _brute_force(lats, lons, threshold_km, method):
+    distances = distance_array(lats[:, None], lons[:, None], lats[None, :], lons[None, :], method)
+    first, second = np.nonzero(np.triu(distances <= threshold_km, k=1))
+    return first, second, distances[first, second]
+
+
+def _cluster(rng, n, lat_range, lon_range):
+    lats = rng.uniform(*lat_range, n)
+    lons = (rng.uniform(*lon_range, n) + 180.0) % 360.0 - 180.0
+    return lats, lons
+
+
+def _datasets():
+    rng = np.random.default_rng(5)
+    yield "north_pole", *_cluster(rng, 400, (89.0, 90.0), (-180.0, 180.0)), 15.0
+    yield "south_pole", *_cluster(rng, 400, (-90.0, -89.2), (-180.0, 180.0)), 10.0
+    yield "antimeridian", *_cluster(rng, 400, (-5.0, 5.0), (175.0, 185.0)), 60.0
+    lats, lons = _cluster(rng, 300, (-90.0, 90.0), (-180.0, 180.0))
+    yield "global", lats, lons, 1500.0
+    # Kutup noktası farklı boylamlarla ve yinelenen noktalar (mesafe 0)
+    lats = np.concatenate([np.full(5, 90.0), np.full(3, 10.0), rng.uniform(89.9, 90.0, 50)])
+    lons = np.concatenate([[-180.0, -90.0, 0.0, 90.0, 180.0], np.full(3, -179.99), rng.uniform(-180.0, 180.0, 50)])
+    yield "duplicates", lats, lons, 5.0
+
+
+DATASETS = {name: (lats, lons, threshold) for name, lats, lons, threshold in _datasets()}
+
+
+@pytest.mark.parametrize("method", ["haversine", "vincenty"])
+@pytest.mark.parametrize("chunk_size", [64, 1 << 21])
+@pytest.mark.parametrize("name", DATASETS)
+def test_matches_brute_force(name, chunk_size, method):
+    lats, lons, threshold = DATASETS[name]
+    first, second, distances, stats = proximity_pairs(lats, lons, threshold, method, chunk_size=chunk_size)
+    expected_first, expected_second, expected_distances = _brute_force(lats, lons, threshold, method)
+
+    assert expected_first.size > 0
+    np.testing.assert_array_equal(first, expected_first)
+    np.testing.assert_array_equal(second, expected_second)
+    np.testing.assert_allclose(distances, expected_distances, rtol=0, atol=1e-9)
+    assert stats["truncated"] is False
+    assert stats["candidate_pairs"] >= first.size
+
+
+@pytest.mark.parametrize("method", ["haversine", "vincenty"])
+def test_max_pairs_truncates(method):
+    lats, lons, threshold = DATASETS["antimeridian"]
+    expected_first, expected_second, expected_distances = _brute_force(lats, lons, threshold, method)
+    expected = dict(zip(zip(expected_first.tolist(), expected_second.tolist()), expected_distances))
+    max_pairs = expected_first.size // 3
+
+    first, second, distances, stats = proximity_pairs(lats, lons, threshold, method,
+                                                      max_pairs=max_pairs, chunk_size=64)
+    assert stats["truncated"] is True
+    assert first.size == max_pairs
+    assert np.all(first < second)
+    # Sonuç sıralı ve her çift kaba kuvvet sonucunda aynı mesafeyle bulunuyor
+    assert np.all(np.diff(first * len(lats) + second) > 0)
+    for i, j, distance in zip(first.tolist(), second.tolist(), distances):
+        assert distance == pytest.approx(expected[(i, j)], abs=1e-9)
+
+    everything = proximity_pairs(lats, lons, threshold, method, max_pairs=expected_first.size)
+    assert everything[0].size == expected_first.size
+
+
+def test_no_pairs_and_invalid_arguments():
+    first, second, distances, stats = proximity_pairs([0.0, 10.0], [0.0, 10.0], 1.0)
+    assert first.size == second.size == distances.size == 0
+    assert stats["truncated"] is False
+    with pytest.raises(ValueError):
+        proximity_pairs([0.0], [0.0], 0.0)
+    with pytest.raises(ValueError):
+        proximity_pairs([0.0], [0.0], 1.0, max_pairs=0)
@@ -0,0 +1,112 @@
+"""
+distjit derlenmiş çekirdeklerinin saf Python (distser) ve NumPy (distvec)
+sürümleriyle aynı sonuçları verdiğini doğrular. numba yüklü değilse atlanır
+(`uv sync --extra jit`).
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+import distjit  # noqa: E402
+import distvec  # noqa: E402
+from distser import haversine_distance, vincenty_distance  # noqa: E402
+
+# Derlenmiş ve yorumlanmış kod aynı işlemleri izler (fastmath kapalı); fark yalnızca
+# libm/LLVM trigonometri fonksiyonlarının son bitlerinden gelebilir
+RELATIVE_TOLERANCE = 1e-12
+ABSOLUTE_TOLERANCE_KM = 1e-9
+
+
+def _random_pairs(n: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(-90, 90, n), rng.uniform(-180, 180, n),
+        rng.uniform(-90, 90, n), rng.uniform(-180, 180, n),
+    ])
+
+
+COINCIDENT = [(0.0, 0.0, 0.0, 0.0), (41.0082, 28.9784, 41.0082, 28.9784),
+              (-33.8688, 151.2093, -33.8688, 151.2093), (90.0, 0.0, 90.0, 0.0)]
+POLAR = [(90.0, 0.0, -90.0, 0.0), (90.0, 0.0, 89.0, 45.0), (-90.0, 0.0, -89.5, 170.0),
+         (89.9999, -120.0, 89.9999, 60.0), (-89.9, 10.0, 0.0, 10.0)]
+# Vincenty'nin yavaş yakınsadığı veya yakınsamayıp Haversine'e düştüğü bölge
+NEAR_ANTIPODAL = [(0.0, 0.0, 1.0, 179.0), (0.0, 0.0, 1.0, 179.5), (0.0, 0.0, 0.5, 179.7), (0.0, 0.0, 0.0, 179.5), (0.0, 0.0, 0.0, 180.0),
+                  (10.0, 20.0, -10.0, -160.0), (45.0, 0.0, -44.9, 179.9), (1e-6, 0.0, -1e-6, 179.99)]
+
+CASES = {
+    "random": _random_pairs(500),
+    "coincident": np.array(COINCIDENT),
+    "polar": np.array(POLAR),
+    "near_antipodal": np.array(NEAR_ANTIPODAL),
+}
+
+
+@pytest.fixture(autouse=True)
+def numpy_backend():
+    """Karşılaştırılan distvec çekirdekleri NumPy arka ucunda çalışmalı"""
+    previous = distvec.kernel_backend()
+    distvec.use_kernel_backend("numpy")
+    yield
+    distvec.use_kernel_backend(previous)
+
+
+def _assert_close(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE_KM)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_scalar_haversine_matches_python(case):
+    pairs = CASES[case]
+    _assert_close([distjit.haversine_distance(*p) for p in pairs],
+                  [haversine_distance(*p) for p in pairs])
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_scalar_vincenty_matches_python(case):
+    pairs = CASES[case]
+    _assert_close([distjit.vincenty_distance(*p) for p in pairs],
+                  [vincenty_distance(*p) for p in pairs])
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_parallel_haversine_matches_numpy(case):
+    lat1, lon1, lat2, lon2 = CASES[case].T
+    _assert_close(distjit.haversine_array(lat1, lon1, lat2, lon2),
+                  distvec.haversine_array(lat1, lon1, lat2, lon2))
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_parallel_vincenty_matches_numpy(case):
+    lat1, lon1, lat2, lon2 = CASES[case].T
+    distances, iterations = distjit.vincenty_array(lat1, lon1, lat2, lon2)
+    _assert_close(distances, distvec.vincenty_array(lat1, lon1, lat2, lon2))
+    assert iterations.min() >= 0
+    assert iterations.max() <= distvec.VINCENTY_ITERATION_LIMIT
+
+
+def test_parallel_kernels_broadcast_reference_point():
+    lat, lon = 41.0082, 28.9784
+    _, _, lats, lons = _random_pairs(200, seed=11).T
+    _assert_close(distjit.haversine_array(lat, lon, lats, lons),
+                  distvec.haversine_array(lat, lon, lats, lons))
+    _assert_close(distjit.vincenty_array(lat, lon, lats, lons)[0],
+                  distvec.vincenty_array(lat, lon, lats, lons))
+
+
+def test_parallel_kernels_broadcast_matrix():
+    lat1, lon1, lat2, lon2 = _random_pairs(40, seed=13).T
+    rows, cols = (lat1[:, None], lon1[:, None]), (lat2[None, :30], lon2[None, :30])
+    expected = distvec.vincenty_array(*rows, *cols)
+    actual, _ = distjit.vincenty_array(*rows, *cols)
+    assert actual.shape == expected.shape == (40, 30)
+    _assert_close(actual, expected)
+
+
+def test_coincident_points_are_zero():
+    lat1, lon1, lat2, lon2 = CASES["coincident"].T
+    assert np.all(distjit.haversine_array(lat1, lon1, lat2, lon2) == 0)
+    distances, iterations = distjit.vincenty_array(lat1, lon1, lat2, lon2)
+    assert np.all(distances == 0)
+    assert np.all(iterations <= 1)
@@ -0,0 +1,115 @@
+"""
+GPX/CSV akış ayrıştırıcılarının gövde hangi noktalardan bölünürse bölünsün
+(\\r\\n ortası dahil) tüm dizi üzerinde path_length ile aynı sonucu verdiği ve
+karışık [lat, lon] / {lat, lon} nokta listeleri.
+"""
+
+import numpy as np
+import pytest
+
+from distpath import PathAccumulator, parse_point_sequence, path_length, stream_parser
+
+
+def _track(seed, n):
+    rng = np.random.default_rng(seed)
+    lats = np.round(41.0 + np.cumsum(rng.normal(0, 0.001, n)), 7)
+    lons = np.round(29.0 + np.cumsum(rng.normal(0, 0.001, n)), 7)
+    return lats, lons
+
+
+def _csv_body(lats, lons, seed):
+    rng = np.random.default_rng(seed)
+    lines = ["\r\n", "lat,lon,name\r\n"]
+    for i, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist())):
+        lines.append(f"{lat!r},{lon!r},Nokta ş{i}\r\n")
+        if rng.random() < 0.1:
+            lines.append("\r\n" if rng.random() < 0.5 else "  \r\n")
+    return "\ufeff" + "".join(lines)
+
+
+def _gpx_body(segments):
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\r\n<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">\r\n<trk>']
+    for lats, lons in segments:
+        parts.append("<trkseg>\r\n")
+        parts.extend(f'<trkpt lat="{lat!r}" lon="{lon!r}"><name>ş</name></trkpt>\r\n' for lat, lon in zip(lats.tolist(), lons.tolist()))
+        parts.append("</trkseg>\r\n")
+    parts.append("</trk>\r\n</gpx>\r\n")
+    return "".join(parts)
+
+
+def _split_points(body, seed):
+    """Rastgele bölme noktaları ile her \\r\\n'nin ortası"""
+    rng = np.random.default_rng(seed)
+    crlf = [i + 1 for i in range(len(body) - 1) if body[i:i + 2] == b"\r\n"]
+    cuts = set(rng.integers(1, len(body), 40).tolist()) | set(crlf[::3])
+    return sorted(cuts)
+
+
+def _stream(file_format, body, cuts, chunk_size):
+    parser = stream_parser(file_format)
+    accumulator = PathAccumulator(keep_cumulative=False, chunk_size=chunk_size)
+    bounds = [0, *cuts, len(body)]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        accumulator.add(*parser.feed(body[start:end]))
+    accumulator.add(*parser.close())
+    return accumulator.finish()
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize("chunk_size", [7, 65_536])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_csv_split_reads_match_whole_array(seed, chunk_size):
+    lats, lons = _track(seed, 150)
+    body = _csv_body(lats, lons, seed).encode("utf-8")
+    expected = path_length(lats, lons, keep_cumulative=False)
+
+    for cuts in (_split_points(body, seed), list(range(1, len(body)))):
+        result = _stream("csv", body, cuts, chunk_size)
+        assert result["points"] == expected["points"] == lats.size
+        assert result["segments"] == expected["segments"]
+        assert result["breaks"] == 0
+        assert result["total_km"] == pytest.approx(expected["total_km"], rel=1e-12)
+
+
+def test_csv_error_line_number_is_stable_across_splits():
+    # Bölünmüş \r\n fazladan satır sayılırsa hatalı satırın numarası kayar
+    body = b"lat,lon\r\n41.0,29.0\r\n\r\n41.1,29.1\r\n41.2,abc\r\n41.3,29.3\r\n"
+    for cut in range(1, len(body)):
+        with pytest.raises(ValueError, match="CSV satırı 5 "):
+            _stream("csv", body, [cut], 65_536)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 65_536])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_gpx_split_reads_match_whole_array(seed, chunk_size):
+    segments = [_track(seed * 10 + i, n) for i, n in enumerate((40, 1, 75, 30))]
+    body = _gpx_body(segments).encode("utf-8")
+    # trkseg sınırları arasında segment yoktur: sonuç parçaların ayrı ayrı toplamıdır
+    expected = [path_length(lats, lons, keep_cumulative=False) for lats, lons in segments]
+
+    for cuts in (_split_points(body, seed), list(range(1, len(body), 5))):
+        result = _stream("gpx", body, cuts, chunk_size)
+        assert result["points"] == sum(part["points"] for part in expected)
+        assert result["segments"] == sum(part["segments"] for part in expected)
+        assert result["breaks"] == len(segments) - 1
+        assert result["total_km"] == pytest.approx(sum(part["total_km"] for part in expected), rel=1e-12)
+
+
+def test_parse_mixed_point_list():
+    lats, lons = parse_point_sequence([[41.0, 29.0], {"lat": 41.1, "lon": 29.1}, (41.2, 29.2)])
+    np.testing.assert_array_equal(lats, [41.0, 41.1, 41.2])
+    np.testing.assert_array_equal(lons, [29.0, 29.1, 29.2])
+    lats, lons = parse_point_sequence([{"lat": 41.0, "lon": 29.0}, [41.1, 29.1]])
+    np.testing.assert_array_equal(lats, [41.0, 41.1])
+
+
+@pytest.mark.parametrize("points", [
+    [],
+    [[41.0, 29.0], {"lat": 41.1}],
+    [{"lat": 41.0, "lon": 29.0}, [41.1]],
+    [[41.0, 29.0, 1.0]],
+    [{"lat": "x", "lon": 29.0}],
+])
+def test_parse_invalid_point_list(points):
+    with pytest.raises(ValueError):
+        parse_point_sequence(points)
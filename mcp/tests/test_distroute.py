@@ -0,0 +1,103 @@
+"""
+optimize_route: geçerli sıra, ayak toplamı, kaba kuvvet alt sınırı ve
+yerel en iyilik (2-opt / Or-opt hamlesi kalmaması).
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from distroute import OR_OPT_MAX_SEGMENT, optimize_route
+from distvec import distance_array
+
+START = (41.0, 29.0)
+
+
+def _stops(n, seed):
+    rng = np.random.default_rng(seed)
+    return START[0] + rng.uniform(-0.5, 0.5, n), START[1] + rng.uniform(-0.5, 0.5, n)
+
+
+def _length(lats, lons, order, return_to_start, method="haversine"):
+    path_lats = np.concatenate(([START[0]], lats[order], [START[0]] if return_to_start else []))
+    path_lons = np.concatenate(([START[1]], lons[order], [START[1]] if return_to_start else []))
+    return float(distance_array(path_lats[:-1], path_lons[:-1], path_lats[1:], path_lons[1:], method).sum())
+
+
+def _check_result(result, lats, lons, return_to_start, method="haversine"):
+    order = np.asarray(result["order"])
+    assert sorted(order.tolist()) == list(range(lats.size))
+    assert len(result["legs_km"]) == lats.size + (1 if return_to_start else 0)
+    assert result["total_km"] == pytest.approx(float(np.sum(result["legs_km"])), abs=1e-9)
+    assert result["total_km"] == pytest.approx(_length(lats, lons, order, return_to_start, method), abs=1e-9)
+    assert result["total_km"] <= result["nearest_neighbor_km"] + 1e-9
+    return order
+
+
+@pytest.mark.parametrize("return_to_start", [False, True])
+@pytest.mark.parametrize("n", range(1, 8))
+def test_small_routes_against_brute_force(n, return_to_start):
+    for seed in range(5):
+        lats, lons = _stops(n, seed)
+        result = optimize_route(*START, lats, lons, return_to_start=return_to_start)
+        _check_result(result, lats, lons, return_to_start)
+        best = min(_length(lats, lons, list(order), return_to_start)
+                   for order in itertools.permutations(range(n)))
+        assert result["total_km"] >= best - 1e-9
+        assert result["converged"]
+
+
+def _improving_moves(lats, lons, order, return_to_start):
+    """Sonuç rotasında uçları sabit tutan iyileştirici 2-opt veya Or-opt hamlesi var mı"""
+    current = _length(lats, lons, order, return_to_start)
+    order = list(order)
+    n = len(order)
+    for i in range(n):
+        for j in range(i + 1, n):
+            candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+            if _length(lats, lons, candidate, return_to_start) < current - 1e-6:
+                return "2-opt", i, j
+    for size in range(1, OR_OPT_MAX_SEGMENT + 1):
+        for i in range(n - size + 1):
+            segment, rest = order[i:i + size], order[:i] + order[i + size:]
+            for k in range(len(rest) + 1):
+                for piece in (segment, segment[::-1]):
+                    candidate = rest[:k] + piece + rest[k:]
+                    if _length(lats, lons, candidate, return_to_start) < current - 1e-6:
+                        return "or-opt", i, size, k
+    return None
+
+
+@pytest.mark.parametrize("return_to_start", [False, True])
+@pytest.mark.parametrize("method", ["haversine", "vincenty"])
+def test_converged_route_is_local_optimum(method, return_to_start):
+    lats, lons = _stops(30, seed=8)
+    result = optimize_route(*START, lats, lons, method=method, return_to_start=return_to_start, time_limit_s=30)
+    order = _check_result(result, lats, lons, return_to_start, method)
+    assert result["converged"]
+    assert result["total_km"] <= result["naive_km"] + 1e-9
+    if method == "haversine":
+        assert _improving_moves(lats, lons, order, return_to_start) is None
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        optimize_route(*START, [], [])
+    with pytest.raises(ValueError):
+        optimize_route(*START, [41.0], [29.0], time_limit_s=0)
+
+
+def test_empty_stops_returns_422():
+    from fastapi.testclient import TestClient
+
+    import distser
+
+    client = TestClient(distser.app)
+    response = client.post("/optimize-route", json={"start_point": {"lat": 41.0, "lon": 29.0}, "target_points": []})
+    assert response.status_code == 422
+    response = client.post("/optimize-route", json={"start_point": {"lat": 41.0, "lon": 29.0},
+                                                    "target_points": [{"lat": 41.1, "lon": 29.1}],
+                                                    "format": "compact"})
+    assert response.status_code == 200
+    assert response.json()["order"] == [0]
@@ -0,0 +1,55 @@
+"""
+PointSetRegistry: eşzamanlı yeniden kayıt ve küme adı doğrulaması.
+"""
+
+import threading
+
+import pytest
+
+from distconst import MAX_STORED_NAME_BYTES
+from distsets import PointSetRegistry
+
+
+def test_concurrent_register_keeps_current_version(tmp_path):
+    for run in range(30):
+        registry = PointSetRegistry(tmp_path / str(run))
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def register(i):
+            barrier.wait()
+            results[i] = registry.register("shared", [float(i)], [float(run)])
+
+        threads = [threading.Thread(target=register, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Her çağrı kendi yazdığı sürümü döndürür
+        assert sorted(float(point_set.lats[0]) for point_set in results.values()) == [0.0, 1.0, 2.0, 3.0]
+        current = PointSetRegistry(registry.root).get("shared")
+        assert current is not None
+        assert current.version in {point_set.version for point_set in results.values()}
+        versions = [entry for entry in (registry.root / "shared").iterdir()
+                    if entry.is_dir() and not entry.name.startswith(".")]
+        assert [entry.name for entry in versions] == [current.version]
+
+
+def test_register_returns_written_version(tmp_path):
+    registry = PointSetRegistry(tmp_path)
+    first = registry.register("a", [1.0, 2.0], [3.0, 4.0], ["x", None])
+    second = registry.register("a", [5.0], [6.0])
+    assert first.names() == ["x", "Nokta 2"]
+    assert list(first.lats) == [1.0, 2.0]  # silinmiş sürümün eşlemesi okunmaya devam eder
+    assert registry.get("a").version == second.version
+    assert len(registry.get("a")) == 1
+
+
+def test_long_set_id_is_rejected(tmp_path):
+    registry = PointSetRegistry(tmp_path)
+    with pytest.raises(ValueError, match="çok uzun"):
+        registry.register("ş" * 100, [1.0], [2.0])
+    with pytest.raises(ValueError, match="çok uzun"):
+        registry.get("x" * (MAX_STORED_NAME_BYTES + 1))
+    assert registry.register("x" * MAX_STORED_NAME_BYTES, [1.0], [2.0]) is not None
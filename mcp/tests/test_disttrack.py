@@ -0,0 +1,97 @@
+"""
+TrackingSession sürüklenme budaması ve /ws/tracking WebSocket akışı.
+"""
+
+import numpy as np
+import pytest
+
+from disttrack import TrackingSession
+
+
+def _summary(result):
+    """Budamadan etkilenmemesi gereken alanlar: en yakın hedefler ve olaylar"""
+    entities = [(entry["id"], entry["nearest"], entry["nearest_distance"]) for entry in result["entities"]]
+    return entities, result["events"]
+
+
+@pytest.mark.parametrize("method", ["haversine", "vincenty"])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_pruned_session_matches_full_recompute(method, seed):
+    rng = np.random.default_rng(seed)
+    dest_lats = 41.0 + rng.uniform(-0.05, 0.05, 80)
+    dest_lons = 29.0 + rng.uniform(-0.05, 0.05, 80)
+    thresholds = [0.3, 0.8, 2.0]
+    pruned = TrackingSession(dest_lats, dest_lons, method, thresholds, report_distances=False)
+    full = TrackingSession(dest_lats, dest_lons, method, thresholds, report_distances=True)
+
+    n = 25
+    ids = [f"v{i}" for i in range(n)]
+    lats = 41.0 + rng.uniform(-0.06, 0.06, n)
+    lons = 29.0 + rng.uniform(-0.06, 0.06, n)
+    pruned_cells = full_cells = 0
+    for step in range(300):
+        # Çoğu adımda birkaç varlık ~10-60 m hareket eder; arada büyük sıçramalar olur
+        movers = rng.random(n) < 0.4
+        lats = lats + movers * rng.normal(0, 0.0004, n)
+        lons = lons + movers * rng.normal(0, 0.0004, n)
+        if step % 50 == 49:
+            jump = rng.integers(n)
+            lats[jump], lons[jump] = 41.0 + rng.uniform(-0.06, 0.06), 29.0 + rng.uniform(-0.06, 0.06)
+        batch = rng.permutation(n)[:rng.integers(1, n + 1)]
+        batch_ids = [ids[i] for i in batch]
+
+        expected = full.update(batch_ids, lats[batch], lons[batch])
+        actual = pruned.update(batch_ids, lats[batch], lons[batch])
+        assert _summary(actual) == _summary(expected), f"adım {step}"
+        pruned_cells += actual["computed"]
+        full_cells += expected["computed"]
+
+    # Budama gerçekten devrede olmalı
+    assert pruned_cells < full_cells / 2
+
+
+def test_remove_and_readd_starts_fresh():
+    session = TrackingSession([41.0, 41.1], [29.0, 29.1], thresholds_km=[5.0], report_distances=False)
+    first = session.update(["a"], np.array([41.0]), np.array([29.0]))
+    assert [event["type"] for event in first["events"]] == ["nearest", "enter"]
+    assert session.remove(["a", "unknown"]) == 1
+    assert len(session) == 0
+    again = session.update(["a"], np.array([41.0]), np.array([29.0]))
+    assert [event["type"] for event in again["events"]] == ["nearest", "enter"]
+
+
+def test_websocket_round_trip():
+    from fastapi.testclient import TestClient
+
+    import distser
+
+    with TestClient(distser.app) as client, client.websocket_connect("/ws/tracking") as websocket:
+        websocket.send_text('{"type": "positions", "positions": []}')
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({
+            "type": "subscribe",
+            "target_points": [{"lat": 41.0, "lon": 29.0, "name": "Depo"}, {"lat": 41.1, "lon": 29.1}],
+            "thresholds": [1.0],
+            "distances": False
+        })
+        subscribed = websocket.receive_json()
+        assert subscribed["type"] == "subscribed"
+        assert subscribed["destinations"] == 2
+
+        websocket.send_json({"type": "positions", "positions": [{"id": "car", "lat": 41.001, "lon": 29.0}]})
+        update = websocket.receive_json()
+        assert update["type"] == "update"
+        assert update["tracked"] == 1
+        assert update["entities"][0]["nearest_name"] == "Depo"
+        assert {(event["type"], event["destination"]) for event in update["events"]} == {("nearest", 0), ("enter", 0)}
+
+        websocket.send_json({"type": "positions", "positions": [{"id": "car", "lat": 41.05, "lon": 29.0}]})
+        events = websocket.receive_json()["events"]
+        assert [(event["type"], event["destination"]) for event in events] == [("exit", 0)]
+
+        websocket.send_text("not json")
+        assert websocket.receive_json()["type"] == "error"
+
+        websocket.send_json({"type": "remove", "ids": ["car"]})
+        assert websocket.receive_json() == {"type": "removed", "count": 1, "tracked": 0}
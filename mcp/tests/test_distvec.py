@@ -0,0 +1,102 @@
+"""
+distvec NumPy çekirdeklerinin (numba gerekmez) skaler haversine_distance /
+vincenty_distance fonksiyonlarıyla aynı sonuçları verdiğini doğrular. Skaler
+referans distser'den, mcp SDK'sı yüklüyse dist.py'den de alınır.
+"""
+
+import importlib
+
+import numpy as np
+import pytest
+
+import distvec
+
+# Skaler ve vektörel sürümler aynı işlemleri izler; fark yalnızca NumPy ve libm
+# trigonometri fonksiyonlarının son bitlerinden gelebilir
+RELATIVE_TOLERANCE = 1e-12
+ABSOLUTE_TOLERANCE_KM = 1e-9
+
+
+def _random_pairs(n: int, seed: int = 17) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(-90, 90, n), rng.uniform(-180, 180, n),
+        rng.uniform(-90, 90, n), rng.uniform(-180, 180, n),
+    ])
+
+
+IDENTICAL = [(0.0, 0.0, 0.0, 0.0), (41.0082, 28.9784, 41.0082, 28.9784),
+             (-33.8688, 151.2093, -33.8688, 151.2093), (90.0, 0.0, 90.0, 0.0), (0.0, -180.0, 0.0, -180.0)]
+POLAR = [(90.0, 0.0, -90.0, 0.0), (90.0, 0.0, 89.0, 45.0), (-90.0, 0.0, -89.5, 170.0),
+         (89.9999, -120.0, 89.9999, 60.0), (-89.9, 10.0, 0.0, 10.0)]
+# İterasyon sınırında yakınsamayıp Haversine'e düşen karşıt (antipodal) çiftler
+NON_CONVERGING = [(0.0, 0.0, 0.5, 179.7), (0.0, 0.0, 0.0, 179.5), (0.0, 0.0, 0.0, 180.0),
+                  (1e-6, 0.0, -1e-6, 179.99), (10.0, 20.0, -10.0, -160.0), (45.0, 0.0, -44.9, 179.9)]
+# Yavaş da olsa yakınsayan, karşıta yakın çiftler
+NEAR_ANTIPODAL = [(0.0, 0.0, 1.0, 179.0), (0.0, 0.0, 1.0, 179.5), (0.0, 0.0, 5.0, 175.0)]
+
+CASES = {
+    "random": _random_pairs(500),
+    "identical": np.array(IDENTICAL),
+    "polar": np.array(POLAR),
+    "non_converging": np.array(NON_CONVERGING),
+    "near_antipodal": np.array(NEAR_ANTIPODAL),
+}
+
+
+@pytest.fixture(params=["distser", "dist"])
+def scalar(request):
+    """Skaler referans fonksiyonların modülü"""
+    if request.param == "dist":
+        pytest.importorskip("mcp.server")
+    return importlib.import_module(request.param)
+
+
+@pytest.fixture(autouse=True)
+def numpy_backend():
+    """Karşılaştırılan distvec çekirdekleri NumPy arka ucunda çalışmalı"""
+    previous = distvec.kernel_backend()
+    distvec.use_kernel_backend("numpy")
+    yield
+    distvec.use_kernel_backend(previous)
+
+
+def _assert_close(actual, expected):
+    np.testing.assert_allclose(actual, expected, rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE_KM)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_haversine_array_matches_scalar(scalar, case):
+    pairs = CASES[case]
+    _assert_close(distvec.haversine_array(*pairs.T), [scalar.haversine_distance(*p) for p in pairs])
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_vincenty_array_matches_scalar(scalar, case):
+    pairs = CASES[case]
+    _assert_close(distvec.vincenty_array(*pairs.T), [scalar.vincenty_distance(*p) for p in pairs])
+
+
+def test_identical_points_are_zero():
+    pairs = CASES["identical"].T
+    assert np.all(distvec.haversine_array(*pairs) == 0)
+    assert np.all(distvec.vincenty_array(*pairs) == 0)
+
+
+def test_non_converging_pairs_fall_back_to_haversine(monkeypatch):
+    observed = []
+    monkeypatch.setattr(distvec, "vincenty_observer", lambda iterations, fallbacks: observed.append(fallbacks))
+    pairs = np.concatenate([CASES["non_converging"], CASES["near_antipodal"]]).T
+    distances = distvec.vincenty_array(*pairs)
+    count = len(NON_CONVERGING)
+    assert observed == [count]
+    np.testing.assert_array_equal(distances[:count], distvec.haversine_array(*pairs[:, :count]))
+
+
+def test_broadcast_reference_point_matches_scalar(scalar):
+    lat, lon = 41.0082, 28.9784
+    _, _, lats, lons = _random_pairs(200, seed=19).T
+    _assert_close(distvec.haversine_array(lat, lon, lats, lons),
+                  [scalar.haversine_distance(lat, lon, *p) for p in zip(lats, lons)])
+    _assert_close(distvec.vincenty_array(lat, lon, lats, lons),
+                  [scalar.vincenty_distance(lat, lon, *p) for p in zip(lats, lons)])
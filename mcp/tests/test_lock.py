@@ -0,0 +1,19 @@
+"""
+uv.lock'un pyproject.toml bağımlılıklarıyla güncel olduğunu doğrular: bağımlılık
+değiştiren her commit kilidi de yeniden üretmeli (`uv lock`). uv yoksa atlanır.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.skipif(shutil.which("uv") is None, reason="uv yüklü değil")
+def test_lockfile_matches_pyproject():
+    result = subprocess.run(["uv", "lock", "--check", "--offline"], cwd=PROJECT_DIR,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr